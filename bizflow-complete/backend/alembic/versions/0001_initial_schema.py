@@ -0,0 +1,180 @@
+"""Initial schema, as previously created by Base.metadata.create_all
+
+Databases created by init_db before migrations existed already have these
+tables: run `alembic stamp 0001` on them once, then `alembic upgrade head`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # businesses.owner_id <-> users.business_id form a cycle; the owner FK is
+    # added once both tables exist (SQLite can't add it afterwards, skip it)
+    op.create_table(
+        "businesses",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("owner_id", sa.String(36)),
+        sa.Column("phone", sa.String(20)),
+        sa.Column("email", sa.String(100)),
+        sa.Column("address", sa.String(255)),
+        sa.Column("city", sa.String(100)),
+        sa.Column("province", sa.String(100)),
+        sa.Column("business_type", sa.String(100)),
+        sa.Column("tax_id", sa.String(50)),
+        sa.Column("is_active", sa.Boolean),
+        sa.Column("subscription_plan", sa.String(50)),
+        sa.Column("subscription_expires_at", sa.DateTime),
+        sa.Column("created_at", sa.DateTime),
+        sa.Column("updated_at", sa.DateTime),
+    )
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("username", sa.String(50), nullable=False, unique=True),
+        sa.Column("email", sa.String(100), nullable=False, unique=True),
+        sa.Column("password_hash", sa.String(255), nullable=False),
+        sa.Column("full_name", sa.String(200)),
+        sa.Column("role", sa.String(20)),
+        sa.Column("business_id", sa.String(36), sa.ForeignKey("businesses.id")),
+        sa.Column("is_active", sa.Boolean),
+        sa.Column("last_login", sa.DateTime),
+        sa.Column("created_at", sa.DateTime),
+        sa.Column("updated_at", sa.DateTime),
+    )
+    if op.get_bind().dialect.name != "sqlite":
+        op.create_foreign_key("fk_businesses_owner_id", "businesses", "users", ["owner_id"], ["id"])
+
+    op.create_table(
+        "products",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("business_id", sa.String(36), sa.ForeignKey("businesses.id"), nullable=False),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("description", sa.Text),
+        sa.Column("sku", sa.String(50), nullable=False),
+        sa.Column("barcode", sa.String(50)),
+        sa.Column("price", sa.Float, nullable=False),
+        sa.Column("cost", sa.Float),
+        sa.Column("category", sa.String(100)),
+        sa.Column("units", sa.JSON),
+        sa.Column("images", sa.JSON),
+        sa.Column("is_active", sa.Boolean),
+        sa.Column("created_at", sa.DateTime),
+        sa.Column("updated_at", sa.DateTime),
+    )
+    op.create_table(
+        "inventory",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("product_id", sa.String(36), sa.ForeignKey("products.id"), nullable=False),
+        sa.Column("business_id", sa.String(36), sa.ForeignKey("businesses.id"), nullable=False),
+        sa.Column("quantity", sa.Float),
+        sa.Column("unit", sa.String(50)),
+        sa.Column("warning_level", sa.Float),
+        sa.Column("last_updated", sa.DateTime),
+    )
+    op.create_table(
+        "customers",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("business_id", sa.String(36), sa.ForeignKey("businesses.id"), nullable=False),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("phone", sa.String(20)),
+        sa.Column("email", sa.String(100)),
+        sa.Column("address", sa.String(255)),
+        sa.Column("outstanding_debt", sa.Float),
+        sa.Column("total_purchases", sa.Float),
+        sa.Column("total_transactions", sa.Integer),
+        sa.Column("is_active", sa.Boolean),
+        sa.Column("created_at", sa.DateTime),
+        sa.Column("updated_at", sa.DateTime),
+    )
+    op.create_table(
+        "orders",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("business_id", sa.String(36), sa.ForeignKey("businesses.id"), nullable=False),
+        sa.Column("customer_id", sa.String(36), sa.ForeignKey("customers.id")),
+        sa.Column("customer_name", sa.String(200)),
+        sa.Column("employee_id", sa.String(36), sa.ForeignKey("users.id")),
+        sa.Column("order_type", sa.String(50)),
+        sa.Column("status", sa.String(50)),
+        sa.Column("total_amount", sa.Float),
+        sa.Column("discount", sa.Float),
+        sa.Column("is_credit", sa.Boolean),
+        sa.Column("payment_method", sa.String(50)),
+        sa.Column("payment_status", sa.String(50)),
+        sa.Column("notes", sa.Text),
+        sa.Column("created_at", sa.DateTime),
+        sa.Column("updated_at", sa.DateTime),
+    )
+    op.create_table(
+        "order_items",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("order_id", sa.String(36), sa.ForeignKey("orders.id"), nullable=False),
+        sa.Column("product_id", sa.String(36), sa.ForeignKey("products.id")),
+        sa.Column("product_name", sa.String(200)),
+        sa.Column("quantity", sa.Float, nullable=False),
+        sa.Column("unit", sa.String(50)),
+        sa.Column("unit_price", sa.Float),
+        sa.Column("subtotal", sa.Float),
+        sa.Column("created_at", sa.DateTime),
+    )
+    op.create_table(
+        "debts",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("business_id", sa.String(36), sa.ForeignKey("businesses.id"), nullable=False),
+        sa.Column("customer_id", sa.String(36), sa.ForeignKey("customers.id"), nullable=False),
+        sa.Column("order_id", sa.String(36), sa.ForeignKey("orders.id")),
+        sa.Column("amount", sa.Float, nullable=False),
+        sa.Column("remaining_debt", sa.Float, nullable=False),
+        sa.Column("due_date", sa.DateTime),
+        sa.Column("paid_date", sa.DateTime),
+        sa.Column("is_paid", sa.Boolean),
+        sa.Column("created_at", sa.DateTime),
+        sa.Column("updated_at", sa.DateTime),
+    )
+    op.create_table(
+        "draft_orders",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("business_id", sa.String(36), sa.ForeignKey("businesses.id"), nullable=False),
+        sa.Column("customer_name", sa.String(200)),
+        sa.Column("items", sa.JSON),
+        sa.Column("total_amount", sa.Float),
+        sa.Column("raw_input", sa.Text),
+        sa.Column("confidence", sa.Float),
+        sa.Column("is_confirmed", sa.Boolean),
+        sa.Column("is_rejected", sa.Boolean),
+        sa.Column("created_at", sa.DateTime),
+        sa.Column("confirmed_at", sa.DateTime),
+    )
+    op.create_table(
+        "accounting_records",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("business_id", sa.String(36), sa.ForeignKey("businesses.id"), nullable=False),
+        sa.Column("record_type", sa.String(50)),
+        sa.Column("transaction_id", sa.String(36)),
+        sa.Column("amount", sa.Float),
+        sa.Column("description", sa.Text),
+        sa.Column("recorded_date", sa.DateTime),
+        sa.Column("created_at", sa.DateTime),
+    )
+
+
+def downgrade() -> None:
+    for table in (
+        "accounting_records", "draft_orders", "debts", "order_items", "orders",
+        "customers", "inventory", "products",
+    ):
+        op.drop_table(table)
+    if op.get_bind().dialect.name != "sqlite":
+        op.drop_constraint("fk_businesses_owner_id", "businesses", type_="foreignkey")
+    op.drop_table("users")
+    op.drop_table("businesses")
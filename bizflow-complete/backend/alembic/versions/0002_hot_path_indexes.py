@@ -0,0 +1,59 @@
+"""Composite indexes for the repository hot paths
+
+Each index leads with the equality columns of the query it serves and ends
+with the range/sort column, so lookups and keyset pages become index seeks:
+
+- products: get_by_sku, barcode lookup, get_by_category, keyset pages
+- customers: get_by_phone, get_by_email, keyset pages, top debtors/spenders
+- orders: keyset pages and get_by_date_range, get_by_status and
+  get_daily_revenue, payment-status filters, get_by_customer
+- order_items: batched item loading by order_id, sales by product
+- debts: unpaid debts per business/customer, keyset pages
+- inventory: per-product lookup, get_low_stock per business
+- users: keyset pages
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_users_business_created", "users", ["business_id", "created_at", "id"]),
+    ("ix_products_business_sku", "products", ["business_id", "sku"]),
+    ("ix_products_business_barcode", "products", ["business_id", "barcode"]),
+    ("ix_products_business_category", "products", ["business_id", "category"]),
+    ("ix_products_business_created", "products", ["business_id", "created_at", "id"]),
+    ("ix_inventory_product", "inventory", ["product_id"]),
+    ("ix_inventory_business", "inventory", ["business_id"]),
+    ("ix_customers_business_phone", "customers", ["business_id", "phone"]),
+    ("ix_customers_business_email", "customers", ["business_id", "email"]),
+    ("ix_customers_business_created", "customers", ["business_id", "created_at", "id"]),
+    ("ix_customers_business_debt", "customers", ["business_id", "outstanding_debt"]),
+    ("ix_customers_business_purchases", "customers", ["business_id", "total_purchases"]),
+    ("ix_orders_business_created", "orders", ["business_id", "created_at", "id"]),
+    ("ix_orders_business_status_created", "orders", ["business_id", "status", "created_at"]),
+    ("ix_orders_business_payment_created", "orders", ["business_id", "payment_status", "created_at"]),
+    ("ix_orders_customer_created", "orders", ["customer_id", "created_at"]),
+    ("ix_order_items_order", "order_items", ["order_id"]),
+    ("ix_order_items_product", "order_items", ["product_id"]),
+    ("ix_debts_business_paid", "debts", ["business_id", "is_paid"]),
+    ("ix_debts_customer_paid", "debts", ["customer_id", "is_paid"]),
+    ("ix_debts_business_created", "debts", ["business_id", "created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
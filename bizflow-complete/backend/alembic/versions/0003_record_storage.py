@@ -0,0 +1,44 @@
+"""Record tables for the SQL storage backend
+
+The api_routes services keep JSON records per collection and store
+(STORAGE_BACKEND=sql). Listings seek ix_records_scope_order in
+(created_at, id) order; record_scopes holds each store's id sequence and
+data version.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "records",
+        sa.Column("collection", sa.String(32), primary_key=True),
+        sa.Column("store_id", sa.String(64), primary_key=True),
+        sa.Column("id", sa.String(255), primary_key=True),
+        sa.Column("sort_key", sa.String(64), nullable=False, server_default=""),
+        sa.Column("data", sa.JSON, nullable=False),
+    )
+    op.create_index("ix_records_scope_order", "records", ["collection", "store_id", "sort_key", "id"])
+    op.create_table(
+        "record_scopes",
+        sa.Column("collection", sa.String(32), primary_key=True),
+        sa.Column("store_id", sa.String(64), primary_key=True),
+        sa.Column("sequence", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("version", sa.Integer, nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("record_scopes")
+    op.drop_index("ix_records_scope_order", table_name="records")
+    op.drop_table("records")
@@ -0,0 +1,28 @@
+"""Growth counters on record_scopes
+
+The sales projection appends orders added since its last read instead of
+rebuilding; inserted counts added records and rewritten changes whenever
+an existing record is changed or removed.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("record_scopes", sa.Column("inserted", sa.Integer, nullable=False, server_default="0"))
+    op.add_column("record_scopes", sa.Column("rewritten", sa.Integer, nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    op.drop_column("record_scopes", "rewritten")
+    op.drop_column("record_scopes", "inserted")
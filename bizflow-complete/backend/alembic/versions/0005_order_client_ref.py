@@ -0,0 +1,33 @@
+"""Unique client_ref of batch-created orders
+
+POST /orders/batch stores each order's client_ref and skips refs it has
+already created, so an offline client replaying a batch gets the orders
+back instead of duplicates. The unique index makes the lookup a seek and
+stops two concurrent replays from both inserting.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+records = sa.table("records", sa.column("collection"), sa.column("store_id"), sa.column("data", sa.JSON))
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ux_records_client_ref", "records",
+        [records.c.collection, records.c.store_id, records.c.data["client_ref"].as_string()],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_records_client_ref", table_name="records")
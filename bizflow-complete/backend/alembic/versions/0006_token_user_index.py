@@ -0,0 +1,35 @@
+"""Index password reset tokens by user
+
+Issuing a reset token and revoking a user's tokens look the user's
+pending tokens up by user_id; without the index both scanned every
+pending token.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+records = sa.table(
+    "records", sa.column("collection"), sa.column("store_id"), sa.column("data", sa.JSON),
+    sa.column("sort_key"), sa.column("id"),
+)
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_records_user_id", "records",
+        [records.c.collection, records.c.store_id, records.c.data["user_id"].as_string(),
+         records.c.sort_key, records.c.id],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_records_user_id", table_name="records")
@@ -0,0 +1,190 @@
+"""Benchmark: report queries on the columnar projection vs. loops over order dicts
+
+Builds an OrderColumns projection of 10M line items (appended in chunks, as
+SalesAnalytics does), then times a range revenue sum, the average order
+value, group-bys by product and customer and a product x hour pivot. The dict-loop baseline runs
+on a 1M-item subset and its time is scaled up to the full size.
+
+Run from the backend directory:
+    python scripts/bench_columnar.py
+"""
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.infrastructure.columnar import OrderColumns, SECONDS_PER_DAY, cross_tab  # noqa: E402
+
+ITEMS = 10_000_000
+ITEMS_PER_ORDER = 4
+CHUNK_ORDERS = 250_000
+BASELINE_ITEMS = 1_000_000
+PRODUCTS = 5_000
+CUSTOMERS = 50_000
+DAYS = 365
+START = 1_767_225_600  # 2026-01-01 UTC
+RUNS = 5
+
+
+def make_chunk(rng: np.random.Generator, first_order: int, orders: int):
+    """One chunk of synthetic orders in created_at order, with their items"""
+    created = START + (first_order + np.arange(orders, dtype=np.int64)) * (DAYS * SECONDS_PER_DAY) // (
+        ITEMS // ITEMS_PER_ORDER)
+    quantity = rng.integers(1, 5, orders * ITEMS_PER_ORDER).astype(np.float64)
+    amount = quantity * rng.integers(5, 200, orders * ITEMS_PER_ORDER) * 1000
+    order_arrays = {
+        "created": created,
+        "total": amount.reshape(orders, ITEMS_PER_ORDER).sum(axis=1),
+        "discount": np.zeros(orders),
+        "paid": rng.random(orders) < 0.8,
+        "active": rng.random(orders) < 0.98,
+        "customer": rng.integers(0, CUSTOMERS, orders, dtype=np.int32),
+        "employee": rng.integers(0, 5, orders, dtype=np.int32),
+        "order_type": rng.integers(0, 2, orders, dtype=np.int32),
+        "payment_method": rng.integers(0, 3, orders, dtype=np.int32),
+    }
+    item_arrays = {
+        "order": np.repeat(np.arange(orders, dtype=np.int64), ITEMS_PER_ORDER),
+        "product": rng.integers(0, PRODUCTS, orders * ITEMS_PER_ORDER, dtype=np.int32),
+        "quantity": quantity,
+        "amount": amount,
+    }
+    return order_arrays, item_arrays
+
+
+def build(items: int) -> OrderColumns:
+    rng = np.random.default_rng(7)
+    columns = OrderColumns()
+    orders = items // ITEMS_PER_ORDER
+    for first in range(0, orders, CHUNK_ORDERS):
+        columns.extend(*make_chunk(rng, first, min(CHUNK_ORDERS, orders - first)))
+    # Dictionaries as if PRODUCTS/CUSTOMERS distinct ids had been seen
+    for i in range(PRODUCTS):
+        columns.products.code(f"prod_{i}")
+    for i in range(CUSTOMERS):
+        columns.customers.code(f"cust_{i}")
+    return columns
+
+
+def to_dicts(columns: OrderColumns, orders: int) -> list:
+    """The first orders of a projection as the order dicts the services store"""
+    created = columns.order_column("created")
+    total = columns.order_column("total")
+    paid = columns.order_column("paid")
+    active = columns.order_column("active")
+    customer = columns.order_column("customer")
+    product = columns.item_column("product")
+    quantity = columns.item_column("quantity")
+    amount = columns.item_column("amount")
+    records = []
+    for row in range(orders):
+        items = range(row * ITEMS_PER_ORDER, (row + 1) * ITEMS_PER_ORDER)
+        records.append({
+            "created": int(created[row]), "total_amount": float(total[row]),
+            "payment_status": "paid" if paid[row] else "pending",
+            "status": "delivered" if active[row] else "cancelled",
+            "customer_id": int(customer[row]),
+            "items": [{"product_id": int(product[i]), "quantity": float(quantity[i]),
+                       "subtotal": float(amount[i])} for i in items],
+        })
+    return records
+
+
+def timed(fn) -> float:
+    """Best wall time of RUNS calls, in ms"""
+    best = float("inf")
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def loop_queries(orders: list, start: int, end: int) -> dict:
+    def counted(o):
+        return o["status"] != "cancelled" and o["payment_status"] == "paid"
+
+    def revenue():
+        return sum(o["total_amount"] for o in orders if counted(o) and start <= o["created"] < end)
+
+    def aov():
+        paid = [o["total_amount"] for o in orders if counted(o)]
+        return sum(paid) / len(paid)
+
+    def by_product():
+        sold = defaultdict(float)
+        for o in orders:
+            if counted(o) and start <= o["created"] < end:
+                for item in o["items"]:
+                    sold[item["product_id"]] += item["quantity"]
+        return sold
+
+    def by_customer():
+        spent = defaultdict(float)
+        for o in orders:
+            if counted(o):
+                spent[o["customer_id"]] += o["total_amount"]
+        return spent
+
+    def pivot():
+        cells = defaultdict(float)
+        for o in orders:
+            if counted(o) and start <= o["created"] < end:
+                hour = o["created"] % SECONDS_PER_DAY // 3600
+                for item in o["items"]:
+                    cells[item["product_id"], hour] += item["subtotal"]
+        return cells
+
+    return {"range revenue": revenue, "average order value": aov, "quantity by product": by_product,
+            "revenue by customer": by_customer, "pivot product x hour": pivot}
+
+
+def column_queries(columns: OrderColumns, start: int, end: int) -> dict:
+    return {
+        "range revenue": lambda: columns.revenue(start, end),
+        "average order value": lambda: columns.average_order_value(),
+        "quantity by product": lambda: columns.group_items(
+            "product", "quantity", start, end, size=len(columns.products)),
+        "revenue by customer": lambda: columns.group_orders("customer", size=len(columns.customers)),
+        "pivot product x hour": lambda: pivot(columns, start, end),
+    }
+
+
+def pivot(columns: OrderColumns, start: int, end: int):
+    items = columns.item_selection(start, end)
+    products, product_labels = columns.item_dimension("product", items)
+    hours, hour_labels = columns.item_dimension("hour", items)
+    return cross_tab(products, len(product_labels), hours, len(hour_labels),
+                     weights=columns.item_column("amount")[items])
+
+
+def main():
+    begin = time.perf_counter()
+    columns = build(ITEMS)
+    print(f"built {columns.order_count:,} orders / {columns.item_count:,} items "
+          f"in {time.perf_counter() - begin:.1f} s")
+
+    # A 90-day window in the middle of the year
+    start = START + 120 * SECONDS_PER_DAY
+    end = start + 90 * SECONDS_PER_DAY
+    scale = ITEMS / BASELINE_ITEMS
+    orders = to_dicts(columns, BASELINE_ITEMS // ITEMS_PER_ORDER)
+    # The subset spans the start of the year; window its second half
+    sub_end = START + int(DAYS * SECONDS_PER_DAY / scale)
+    sub_start = (START + sub_end) // 2
+    loops = loop_queries(orders, sub_start, sub_end)
+    vectorized = column_queries(columns, start, end)
+
+    print(f"{'query':<22} {'dict loop (scaled)':>20} {'columnar':>12} {'speedup':>9}")
+    for name, fn in vectorized.items():
+        loop_ms = timed(loops[name]) * scale
+        column_ms = timed(fn)
+        print(f"{name:<22} {loop_ms:>17.0f} ms {column_ms:>9.1f} ms {loop_ms / column_ms:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
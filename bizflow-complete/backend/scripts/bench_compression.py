@@ -0,0 +1,113 @@
+"""Benchmark: bytes on the wire and CPU cost of response compression
+
+Encodes a page of each large list endpoint the way the routes do, then
+pushes it through CompressionMiddleware as a single body and as a stream
+of small chunks (as a StreamingResponse would send it). Reports the bytes
+sent, the CPU time the middleware adds per response and the time the
+body takes to cross a slow mobile link.
+
+Run from the backend directory:
+    python scripts/bench_compression.py
+"""
+import asyncio
+import copy
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.application.business_logic import MOCK_ORDERS_DB, MOCK_PRODUCTS_DB  # noqa: E402
+from src.presentation.compression import CompressionMiddleware  # noqa: E402
+from src.presentation.responses import dumps  # noqa: E402
+
+PAGE = 100
+JOURNAL_PAGE = 500
+CHUNK = 4096
+# Sustained downlink of a weak 3G connection
+LINK_BYTES_PER_SECOND = 1_000_000 / 8
+ROUNDS = 50
+
+
+def seed_page(db, key, size):
+    template = next(iter(db["store_123"]))
+    records = []
+    for i in range(size):
+        record = copy.deepcopy(template)
+        record["id"] = f"{template['id']}_{i}"
+        records.append(record)
+    return {key: records, "total": size, "next_cursor": None}
+
+
+BODIES = {
+    "/products": dumps(seed_page(MOCK_PRODUCTS_DB, "products", PAGE)),
+    "/orders": dumps(seed_page(MOCK_ORDERS_DB, "orders", PAGE)),
+    "/bookkeeping/journal": dumps({
+        "entries": [
+            {"id": f"entry_{i:05d}", "entry_date": "2026-01-15", "account_code": "4000",
+             "account_name": "Doanh Thu Bán Hàng", "description": f"Bán hàng đơn #{i}",
+             "debit_amount": 0.0, "credit_amount": 125000.0, "reference_doc": f"ORD{i:05d}",
+             "created_at": "2026-01-15T10:30:00"}
+            for i in range(JOURNAL_PAGE)
+        ],
+        "total": JOURNAL_PAGE,
+    }),
+}
+
+
+def make_app(body: bytes, streaming: bool):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        if not streaming:
+            await send({"type": "http.response.body", "body": body})
+            return
+        for start in range(0, len(body), CHUNK):
+            await send({"type": "http.response.body", "body": body[start:start + CHUNK], "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+    return app
+
+
+async def run(app, accept_encoding: str):
+    """(bytes sent, CPU seconds per response) of one app"""
+    scope = {"type": "http", "method": "GET", "path": "/",
+             "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    sent = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        nonlocal sent
+        sent += len(message.get("body", b""))
+
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        sent = 0
+        await app(scope, receive, send)
+    return sent, (time.process_time() - start) / ROUNDS
+
+
+async def main():
+    configs = [("identity", "identity", 6), ("gzip-1", "gzip", 1), ("gzip-6", "gzip", 6),
+               ("gzip-9", "gzip", 9), ("deflate-6", "deflate", 6)]
+    print(f"{'endpoint':>20} | {'mode':>6} | {'coding':>9} | {'bytes':>8} | {'ratio':>6} | "
+          f"{'cpu/resp':>9} | {'3G transfer':>11}")
+    print("-" * 88)
+    for endpoint, body in BODIES.items():
+        for streaming in (False, True):
+            mode = "stream" if streaming else "single"
+            inner = make_app(body, streaming)
+            _, baseline_cpu = await run(inner, "identity")
+            for label, coding, level in configs:
+                app = CompressionMiddleware(inner, minimum_size=1024, level=level)
+                sent, cpu = await run(app, coding)
+                added = max(cpu - baseline_cpu, 0.0) * 1000
+                transfer = sent / LINK_BYTES_PER_SECOND * 1000
+                print(f"{endpoint:>20} | {mode:>6} | {label:>9} | {sent:>8,} | {len(body) / sent:>5.1f}x | "
+                      f"{added:>6.2f} ms | {transfer:>8.0f} ms")
+        print("-" * 88)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
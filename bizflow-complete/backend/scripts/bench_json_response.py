@@ -0,0 +1,82 @@
+"""Microbenchmark: serializing list endpoint payloads
+
+For each list endpoint, builds a page shaped like the in-memory service
+output and compares FastAPI's default path for a returned dict
+(jsonable_encoder, then JSONResponse) with json_response. For customers it
+also times validating the page through a cached TypeAdapter, the path for
+output that isn't trusted.
+
+Run from the backend directory:
+    python scripts/bench_json_response.py
+"""
+import copy
+import sys
+import timeit
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from src.application.business_logic import MOCK_CUSTOMERS_DB, MOCK_ORDERS_DB, MOCK_PRODUCTS_DB  # noqa: E402
+from src.application.dtos import CustomerResponse  # noqa: E402
+from src.presentation.responses import json_response, orjson  # noqa: E402
+
+PAGE = 100
+JOURNAL_PAGE = 500
+
+
+def clone(record, i):
+    copied = copy.deepcopy(record)
+    copied["id"] = f"{record['id']}_{i}"
+    return copied
+
+
+def seed_page(db, key, size):
+    template = next(iter(db["store_123"]))
+    return {key: [clone(template, i) for i in range(size)], "total": size, "next_cursor": None}
+
+
+PAYLOADS = {
+    "/orders": seed_page(MOCK_ORDERS_DB, "orders", PAGE),
+    "/customers": seed_page(MOCK_CUSTOMERS_DB, "customers", PAGE),
+    "/products": seed_page(MOCK_PRODUCTS_DB, "products", PAGE),
+    "/bookkeeping/journal": {
+        "entries": [
+            {"id": f"entry_{i:05d}", "entry_date": "2026-01-15", "account_code": "4000",
+             "account_name": "Doanh Thu Bán Hàng", "description": f"Bán hàng đơn #{i}",
+             "debit_amount": 0.0, "credit_amount": 125000.0, "reference_doc": f"ORD{i:05d}",
+             "created_at": "2026-01-15T10:30:00"}
+            for i in range(JOURNAL_PAGE)
+        ],
+        "total": JOURNAL_PAGE,
+    },
+}
+
+
+def per_call_us(func, number=300) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    encoder = "orjson" if orjson is not None else "json (orjson not installed)"
+    print(f"Serialization per response, encoder: {encoder}")
+    print(f"{'endpoint':>22} | {'bytes':>7} | {'default':>9} | {'json_response':>13} | {'speedup':>7}")
+    print("-" * 72)
+    for endpoint, payload in PAYLOADS.items():
+        default = per_call_us(lambda: JSONResponse(jsonable_encoder(payload)))
+        fast = per_call_us(lambda: json_response(payload))
+        size = len(json_response(payload).body)
+        print(f"{endpoint:>22} | {size:>7,} | {default:>6.0f} us | {fast:>10.0f} us | {default / fast:>6.1f}x")
+
+    customers = PAYLOADS["/customers"]["customers"]
+    validated = per_call_us(lambda: json_response(customers, List[CustomerResponse], trusted=False))
+    trusted = per_call_us(lambda: json_response(customers))
+    print(f"\n/customers page validated through a cached TypeAdapter: {validated:.0f} us "
+          f"(trusted: {trusted:.0f} us)")
+
+
+if __name__ == "__main__":
+    main()
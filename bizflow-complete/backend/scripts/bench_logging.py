@@ -0,0 +1,107 @@
+"""Benchmark: per-request logging overhead of a GET /orders page
+
+Replays the logging one list_orders request used to do with print() (two
+middleware lines, three summary lines and one line per order) against the
+logger calls that replaced it, with stdout pointed at a file as it is
+under a process manager. The logger variants run through setup_logging's
+QueueHandler at INFO (debug disabled, the default) and DEBUG, and through
+the same handlers attached synchronously at DEBUG for comparison.
+
+Run from the backend directory:
+    python scripts/bench_logging.py
+"""
+import contextlib
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.infrastructure.logging import setup_logging, shutdown_logging  # noqa: E402
+
+PAGE = 50
+REQUESTS = 2_000
+ORDERS = [
+    {"id": f"order_{i}", "order_number": f"ORD-{i:05d}", "total_amount": 125_000 + i,
+     "payment_status": "paid" if i % 3 else "pending"}
+    for i in range(PAGE)
+]
+logger = logging.getLogger("bench.api_routes")
+
+
+def request_with_prints():
+    """What list_orders and the request middleware printed per request"""
+    print(">>> Incoming GET /api/orders")
+    result = ORDERS
+    print(f"DEBUG: Returning {len(result)} orders for store store_123")
+    paid_count = sum(1 for o in result if o.get("payment_status") == "paid")
+    pending_count = sum(1 for o in result if o.get("payment_status") != "paid")
+    paid_total = sum(o.get("total_amount", 0) for o in result if o.get("payment_status") == "paid")
+    pending_total = sum(o.get("total_amount", 0) for o in result if o.get("payment_status") != "paid")
+    print(f"DEBUG: Paid orders: {paid_count}, total={paid_total}")
+    print(f"DEBUG: Unpaid orders: {pending_count}, total={pending_total}")
+    for o in result:
+        print(f"  - {o.get('order_number')}: {o.get('payment_status', 'unknown')}, {o.get('total_amount', 0)}đ")
+    print("<<< Response GET /api/orders -> 200")
+
+
+def request_with_logger():
+    """The same request with the logger calls now in main.py and api_routes"""
+    start = time.perf_counter()
+    result = ORDERS
+    if logger.isEnabledFor(logging.DEBUG):
+        paid = [o for o in result if o.get("payment_status") == "paid"]
+        logger.debug(
+            "Returning %d orders for store %s: %d paid (total=%s), %d unpaid (total=%s)",
+            len(result), "store_123",
+            len(paid), sum(o.get("total_amount", 0) for o in paid),
+            len(result) - len(paid),
+            sum(o.get("total_amount", 0) for o in result) - sum(o.get("total_amount", 0) for o in paid),
+        )
+    logger.debug("%s %s -> %d (%.1f ms)", "GET", "/api/orders", 200, (time.perf_counter() - start) * 1000)
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        func()
+    return (time.perf_counter() - start) / REQUESTS * 1e6
+
+
+def main():
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(Path(tmp) / "stdout.log", "w") as out, contextlib.redirect_stdout(out):
+            rows.append(("print() to stdout (before)", timed(request_with_prints)))
+
+            setup_logging("INFO", tmp)
+            rows.append(("logger, INFO, queue", timed(request_with_logger)))
+            setup_logging("DEBUG", tmp)
+            rows.append(("logger, DEBUG, queue", timed(request_with_logger)))
+            shutdown_logging()
+
+            root = logging.getLogger()
+            for handler in root.handlers[:]:
+                root.removeHandler(handler)
+            # Same console + file handlers, but written on the calling thread
+            formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+            handlers = [logging.StreamHandler(sys.stdout), logging.FileHandler(Path(tmp) / "sync.log")]
+            for handler in handlers:
+                handler.setFormatter(formatter)
+                root.addHandler(handler)
+            rows.append(("logger, DEBUG, sync handlers", timed(request_with_logger)))
+            for handler in handlers:
+                root.removeHandler(handler)
+                handler.close()
+
+    print(f"Logging work per GET /orders request ({PAGE} orders per page, {REQUESTS:,} requests)")
+    print(f"{'variant':>30} | {'us/request':>10}")
+    print("-" * 44)
+    for name, micros in rows:
+        print(f"{name:>30} | {micros:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
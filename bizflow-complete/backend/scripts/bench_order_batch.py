@@ -0,0 +1,103 @@
+"""Benchmark: POST /orders one by one vs. the batch ingestion path
+
+Run from the backend directory:
+    python scripts/bench_order_batch.py
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.application.business_logic import (  # noqa: E402
+    OrderService, MOCK_PRODUCTS_DB, MOCK_CUSTOMERS_DB, MOCK_ORDERS_DB, CUSTOMER_TOTALS
+)
+
+STORE_ID = "store_bench_batch"
+BATCH_SIZES = [10, 100, 500]
+PRODUCTS = 200
+LINES_PER_ORDER = 5
+
+
+def reset_store():
+    MOCK_PRODUCTS_DB[STORE_ID] = [
+        {"id": f"p{i}", "name": f"P{i}", "price": 1000 + i, "quantity_in_stock": 10**9}
+        for i in range(PRODUCTS)
+    ]
+    MOCK_CUSTOMERS_DB[STORE_ID] = [{"id": "c1", "name": "C1"}]
+    MOCK_ORDERS_DB[STORE_ID] = []
+    CUSTOMER_TOTALS.pop(STORE_ID, None)
+
+
+def make_orders(n: int) -> list:
+    return [
+        {
+            "customer_id": "c1",
+            "payment_status": "paid",
+            "items": [
+                {"product_id": f"p{(i * LINES_PER_ORDER + j) % PRODUCTS}", "quantity": 1, "unit": "cái"}
+                for j in range(LINES_PER_ORDER)
+            ],
+        }
+        for i in range(n)
+    ]
+
+
+async def bench_single(orders: list) -> float:
+    """Orders per second calling create_order once per order"""
+    reset_store()
+    start = time.perf_counter()
+    for order in orders:
+        data = dict(order)
+        await OrderService.create_order(STORE_ID, data.pop("customer_id"), data.pop("items"), **data)
+    return len(orders) / (time.perf_counter() - start)
+
+
+async def bench_batch(orders: list) -> float:
+    """Orders per second through create_orders_batch"""
+    reset_store()
+    start = time.perf_counter()
+    await OrderService.create_orders_batch(STORE_ID, orders)
+    return len(orders) / (time.perf_counter() - start)
+
+
+def bench_http(orders: list):
+    """Orders per second over HTTP (single POSTs, one batch POST)"""
+    try:
+        from fastapi.testclient import TestClient
+        from src.main import app
+    except ImportError:
+        return None
+    client = TestClient(app)
+    params = {"store_id": STORE_ID}
+
+    reset_store()
+    start = time.perf_counter()
+    for order in orders:
+        client.post("/api/orders", json=order, params=params)
+    single = len(orders) / (time.perf_counter() - start)
+
+    reset_store()
+    start = time.perf_counter()
+    client.post("/api/orders/batch", json={"orders": orders}, params=params)
+    batch = len(orders) / (time.perf_counter() - start)
+    return single, batch
+
+
+def main():
+    print(f"{'orders':>8} | {'service single':>15} | {'service batch':>14} | {'HTTP single':>12} | {'HTTP batch':>11}")
+    print("-" * 74)
+    for size in BATCH_SIZES:
+        orders = make_orders(size)
+        single = asyncio.run(bench_single(orders))
+        batch = asyncio.run(bench_batch(orders))
+        http = bench_http(orders)
+        http_cols = f"{http[0]:>8,.0f}/s | {http[1]:>7,.0f}/s" if http else f"{'n/a':>12} | {'n/a':>11}"
+        print(f"{size:>8} | {single:>13,.0f}/s | {batch:>12,.0f}/s | {http_cols}")
+    for db in (MOCK_PRODUCTS_DB, MOCK_CUSTOMERS_DB, MOCK_ORDERS_DB, CUSTOMER_TOTALS):
+        db.pop(STORE_ID, None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark: deep-page latency of skip/limit vs. keyset cursors
+
+Run from the backend directory:
+    python scripts/bench_pagination.py
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from src.infrastructure.entity_store import EntityCollection  # noqa: E402
+from src.infrastructure.models import Base, CustomerModel  # noqa: E402
+from src.infrastructure.pagination import created_at_key, encode_cursor  # noqa: E402
+from src.infrastructure.repositories import CustomerRepository  # noqa: E402
+
+RECORDS = 200_000
+LIMIT = 50
+DEPTHS = [0, 1_000, 10_000, 100_000, 199_000]
+REPEAT = 20
+
+
+def bench_memory():
+    start = datetime(2026, 1, 1)
+    collection = EntityCollection(
+        [
+            {"id": f"o{i:07d}", "created_at": (start + timedelta(seconds=i)).isoformat(), "status": "paid"}
+            for i in range(RECORDS)
+        ],
+        indexes={"status": lambda r: r.get("status")},
+        order_by=created_at_key,
+    )
+    rows = []
+    for depth in DEPTHS:
+        prev = collection.page(depth - 1, 1)[0] if depth else None
+        cursor = encode_cursor(prev["created_at"], prev["id"]) if prev else None
+
+        t = time.perf_counter()
+        for _ in range(REPEAT):
+            collection.find(depth, LIMIT, status="paid")
+        offset_us = (time.perf_counter() - t) / REPEAT * 1e6
+
+        t = time.perf_counter()
+        for _ in range(REPEAT):
+            collection.paginate(limit=LIMIT, cursor=cursor, status="paid")
+        cursor_us = (time.perf_counter() - t) / REPEAT * 1e6
+        rows.append((depth, offset_us, cursor_us))
+    return rows
+
+
+async def bench_sql():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        # Creates ix_customers_business_created (business_id, created_at, id)
+        await conn.run_sync(Base.metadata.create_all)
+    start = datetime(2026, 1, 1)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await session.execute(insert(CustomerModel), [
+            {"id": f"c{i:07d}", "business_id": "b1", "name": f"C{i}", "created_at": start + timedelta(seconds=i)}
+            for i in range(RECORDS)
+        ])
+        await session.commit()
+
+        repo = CustomerRepository(session)
+        rows = []
+        for depth in DEPTHS:
+            cursor = None
+            if depth:
+                prev = (await session.execute(
+                    select(CustomerModel).order_by(CustomerModel.created_at, CustomerModel.id)
+                    .offset(depth - 1).limit(1)
+                )).scalar_one()
+                cursor = encode_cursor(prev.created_at, prev.id)
+
+            t = time.perf_counter()
+            for _ in range(REPEAT):
+                await repo.get_all_by_business("b1", depth, LIMIT)
+            offset_us = (time.perf_counter() - t) / REPEAT * 1e6
+
+            t = time.perf_counter()
+            for _ in range(REPEAT):
+                await repo.get_page_by_business("b1", LIMIT, cursor)
+            cursor_us = (time.perf_counter() - t) / REPEAT * 1e6
+            rows.append((depth, offset_us, cursor_us))
+    await engine.dispose()
+    return rows
+
+
+def print_rows(title, rows):
+    print(f"\n{title} ({RECORDS:,} records, pages of {LIMIT})")
+    print(f"{'depth':>10} | {'skip/limit':>12} | {'cursor':>10}")
+    print("-" * 40)
+    for depth, offset_us, cursor_us in rows:
+        print(f"{depth:>10,} | {offset_us:>9,.0f} µs | {cursor_us:>7,.0f} µs")
+
+
+def main():
+    print_rows("In-memory EntityCollection", bench_memory())
+    print_rows("SQLite repository", asyncio.run(bench_sql()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Regenerate the daily/monthly sales rollups and product counters from raw orders
+
+Run from the backend directory against the shared backend:
+
+    STORAGE_BACKEND=sql python scripts/rebuild_rollups.py [store_id ...]
+
+Without store ids every store that has orders is rebuilt. The in-memory
+backend keeps rollups per worker; there, call
+POST /api/reports/rollups/rebuild instead.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.application.business_logic import STORAGE, ProductSales, SalesRollups  # noqa: E402
+from src.infrastructure.database import engine  # noqa: E402
+
+
+async def main(store_ids):
+    try:
+        for store_id in store_ids or await STORAGE.orders.store_ids():
+            buckets = await SalesRollups.rebuild(store_id)
+            product_buckets = await ProductSales.rebuild(store_id)
+            print(f"{store_id}: {buckets} rollup records, {product_buckets} product sales records")
+    finally:
+        await STORAGE.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
@@ -1,15 +1,35 @@
 """Application layer - Business logic and use cases"""
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+from datetime import date, datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import hashlib
+import logging
 import secrets
+import time
+import numpy as np
 from ..domain.entities import User, Product, Order, Customer, Debt, OrderItem
 from ..infrastructure.models import (
     UserModel, ProductModel, OrderModel, CustomerModel,
     DebtModel, OrderItemModel
 )
+from ..infrastructure.entity_store import EntityStore
+from ..infrastructure.pagination import created_at_key, encode_cursor
+from ..infrastructure.jwt_auth import (
+    JWTAuthenticator, MAX_TOKENS_PER_USER, RESET_TOKEN_SWEEP_INTERVAL, RESET_TOKEN_TTL
+)
+from ..infrastructure.passwords import PASSWORD_HASHER
+from ..infrastructure.metrics import REGISTRY
+from ..infrastructure.cache import LocalCache, MISSING, REPORT_CACHE_SIZE, build_cache
+from ..infrastructure.columnar import Dictionary, OrderColumns, TIME_DIMENSIONS, cross_tab
+from ..infrastructure.storage import STORAGE_BACKEND, MemoryBackend, build_storage
+from ..infrastructure.topk import HeavyHitters, top_k
+
+logger = logging.getLogger(__name__)
 
 # Mock database for development
-TOKEN_STORE: Dict[str, Dict[str, Any]] = {}
+# Product, customer and store-info reads; shared across workers via REDIS_URL
+# (and off without it when STORAGE_BACKEND=sql, see build_cache)
+CACHE = build_cache(shared=STORAGE_BACKEND == "sql")
 
 MOCK_USERS_DB = {
     "admin@bizflow.com": {
@@ -34,7 +54,13 @@ MOCK_USERS_DB = {
     }
 }
 
-MOCK_PRODUCTS_DB = {
+# Product catalog lookups besides id (see ProductCatalog)
+PRODUCT_INDEXES = {
+    "sku": lambda product: product.get("sku"),
+    "barcode": lambda product: product.get("barcode"),
+}
+
+MOCK_PRODUCTS_DB = EntityStore({
     "store_123": [
         {
             "id": "prod_001",
@@ -169,9 +195,9 @@ MOCK_PRODUCTS_DB = {
             "description": "Cà phê đen đậm đà"
         }
     ]
-}
+}, indexes=PRODUCT_INDEXES, order_by=created_at_key)
 
-MOCK_CUSTOMERS_DB = {
+MOCK_CUSTOMERS_DB = EntityStore({
     "store_123": [
         {
             "id": "cust_001",
@@ -222,9 +248,28 @@ MOCK_CUSTOMERS_DB = {
             "total_debt": 0
         }
     ]
+}, order_by=created_at_key)
+
+def _order_day(order: dict) -> str:
+    """Calendar day (YYYY-MM-DD) an order was created on"""
+    return (order.get("created_at") or "")[:10]
+
+
+# Secondary indexes kept on every store's orders and debts
+ORDER_INDEXES = {
+    "customer_id": lambda order: order.get("customer_id"),
+    "status": lambda order: order.get("status"),
+    "payment_status": lambda order: order.get("payment_status"),
+    "day": _order_day,
+    # Batch-created orders (see OrderService.create_orders_batch)
+    "client_ref": lambda order: order.get("client_ref"),
+}
+DEBT_INDEXES = {
+    "customer_id": lambda debt: debt.get("customer_id"),
+    "status": lambda debt: debt.get("status"),
 }
 
-MOCK_ORDERS_DB = {
+MOCK_ORDERS_DB = EntityStore({
     "store_123": [
         {
             "id": "ORD001",
@@ -363,9 +408,9 @@ MOCK_ORDERS_DB = {
             "completed_at": "2026-01-16T14:45:00"
         }
     ]
-}
+}, indexes=ORDER_INDEXES, order_by=created_at_key)
 
-MOCK_DEBTS_DB = {
+MOCK_DEBTS_DB = EntityStore({
     "store_123": [
         {
             "id": "debt_001",
@@ -377,12 +422,58 @@ MOCK_DEBTS_DB = {
             "status": "pending"  # pending, partial, paid
         }
     ]
-}
+}, indexes=DEBT_INDEXES, order_by=created_at_key)
 
 # AI draft order and bookkeeping mock stores
 MOCK_DRAFT_ORDERS_DB: Dict[str, List[Dict[str, Any]]] = {}
-MOCK_JOURNAL_DB: Dict[str, List[Dict[str, Any]]] = {}
-MOCK_EMPLOYEES_DB: Dict[str, List[Dict[str, Any]]] = {}
+MOCK_JOURNAL_DB = EntityStore(order_by=created_at_key)
+# Employees are looked up by email on create (duplicate check)
+MOCK_EMPLOYEES_DB = EntityStore(
+    indexes={"email": lambda user: user.get("email")}, order_by=created_at_key
+)
+
+# Running per-customer order totals, one record per customer id
+CUSTOMER_TOTALS = EntityStore()
+# Sales totals per day/month bucket (see SalesRollups)
+SALES_ROLLUPS = EntityStore()
+# Product counters per day/month bucket (see ProductSales)
+PRODUCT_SALES = EntityStore()
+# Token revocations (see JWTAuthenticator) and password reset tokens (see PasswordResets)
+TOKEN_INDEXES = {
+    "user_id": lambda record: record.get("user_id"),
+}
+AUTH_TOKENS = EntityStore(indexes=TOKEN_INDEXES)
+
+# The demo data above, served as is by STORAGE_BACKEND=memory and copied
+# into an empty shared backend on startup (see seed_storage)
+DEMO_DATA = MemoryBackend(
+    MOCK_PRODUCTS_DB, MOCK_CUSTOMERS_DB, MOCK_ORDERS_DB, MOCK_DEBTS_DB,
+    MOCK_JOURNAL_DB, CUSTOMER_TOTALS, SALES_ROLLUPS, PRODUCT_SALES, AUTH_TOKENS, MOCK_USERS_DB
+)
+# Where the services below keep products, customers, orders, debts, the
+# journal, users, token revocations and reset tokens. Draft orders and employees stay in
+# this process whatever the backend.
+STORAGE = build_storage(DEMO_DATA)
+JWT_AUTH = JWTAuthenticator(revocations=STORAGE.tokens)
+
+
+def _mock_store_sizes():
+    """(collection, records) of every in-memory store, read at scrape time"""
+    yield ("users",), len(MOCK_USERS_DB)
+    yield ("tokens",), sum(len(records) for records in AUTH_TOKENS.values())
+    for name, stores in (
+        ("products", MOCK_PRODUCTS_DB), ("customers", MOCK_CUSTOMERS_DB),
+        ("orders", MOCK_ORDERS_DB), ("debts", MOCK_DEBTS_DB),
+        ("employees", MOCK_EMPLOYEES_DB), ("draft_orders", MOCK_DRAFT_ORDERS_DB),
+        ("journal", MOCK_JOURNAL_DB),
+    ):
+        yield (name,), sum(len(records) for records in stores.values())
+
+
+REGISTRY.gauge(
+    "bizflow_store_records", "Records held by the in-memory stores", ("collection",),
+    collector=_mock_store_sizes
+)
 
 # Minimal chart of accounts for TT88-lite demos
 CHART_OF_ACCOUNTS: Dict[str, str] = {
@@ -399,26 +490,89 @@ CHART_OF_ACCOUNTS: Dict[str, str] = {
 }
 
 
+class PasswordResets:
+    """Pending password reset tokens, kept in STORAGE.tokens so any worker can redeem them.
+
+    Records are keyed by the token's SHA-256 (the token itself is never
+    stored) and hold the user's email and id and an expiry. Issuing a token
+    drops the user's expired ones and keeps at most MAX_TOKENS_PER_USER
+    pending; tokens of users who never come back are removed by sweep(),
+    which the app runs every RESET_TOKEN_SWEEP_INTERVAL seconds. Lookups
+    by user go through the user_id index, so they cost the user's tokens,
+    not every pending one.
+    """
+
+    SCOPE = "reset"
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @staticmethod
+    async def issue(user: dict) -> str:
+        now = time.time()
+        pending = sorted(await STORAGE.tokens.find(PasswordResets.SCOPE, user_id=user["id"]),
+                         key=lambda record: record["expires_at"])
+        live = [record for record in pending if record["expires_at"] > now]
+        dropped = [record for record in pending if record["expires_at"] <= now]
+        dropped += live[:max(0, len(live) - MAX_TOKENS_PER_USER + 1)]
+        for record in dropped:
+            await STORAGE.tokens.remove(PasswordResets.SCOPE, record["id"])
+        token = secrets.token_urlsafe(24)
+        await STORAGE.tokens.add(PasswordResets.SCOPE, {
+            "id": PasswordResets._key(token), "user_id": user["id"], "email": user["email"].lower(),
+            "expires_at": now + RESET_TOKEN_TTL,
+        })
+        return token
+
+    @staticmethod
+    async def redeem(token: str) -> Optional[dict]:
+        """Consume a token: its record if it was pending and unexpired, else None"""
+        record = await STORAGE.tokens.remove(PasswordResets.SCOPE, PasswordResets._key(token))
+        if record is None or record["expires_at"] <= time.time():
+            return None
+        return record
+
+    @staticmethod
+    async def revoke_user(user_id: str) -> None:
+        for record in await STORAGE.tokens.find(PasswordResets.SCOPE, user_id=user_id):
+            await STORAGE.tokens.remove(PasswordResets.SCOPE, record["id"])
+
+    @staticmethod
+    async def sweep(now: Optional[float] = None) -> int:
+        """Remove every expired token; returns how many were removed"""
+        now = time.time() if now is None else now
+        removed = 0
+        for record in await STORAGE.tokens.find(PasswordResets.SCOPE):
+            if record["expires_at"] <= now and await STORAGE.tokens.remove(PasswordResets.SCOPE, record["id"]):
+                removed += 1
+        return removed
+
+    @staticmethod
+    async def sweep_periodically(interval: float = RESET_TOKEN_SWEEP_INTERVAL) -> None:
+        """sweep() every interval seconds until cancelled"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                removed = await PasswordResets.sweep()
+            except Exception as e:
+                logger.warning("Sweeping expired password reset tokens failed: %s", e)
+            else:
+                logger.debug("Swept %d expired password reset tokens", removed)
+
+
 class AuthService:
     """User authentication and authorization service"""
     
     @staticmethod
     def _issue_tokens(user: dict) -> dict:
-        """Create short-lived mock tokens and persist in memory."""
-        access_token = secrets.token_urlsafe(32)
-        refresh_token = secrets.token_urlsafe(32)
-        TOKEN_STORE[access_token] = {
-            **user,
-            "token_type": "access"
-        }
-        TOKEN_STORE[refresh_token] = {
-            **user,
-            "token_type": "refresh"
-        }
+        """Create signed access/refresh tokens; any worker can verify them."""
+        access_token, refresh_token, expires_in = JWT_AUTH.issue_pair(user)
         return {
             "access_token": access_token,
             "refresh_token": refresh_token,
-            "token_type": "bearer"
+            "token_type": "bearer",
+            "expires_in": expires_in
         }
 
     @staticmethod
@@ -426,26 +580,40 @@ class AuthService:
         """Authenticate user with email and password."""
         email_lower = email.lower()
 
-        # Check if user exists in mock database
-        if email_lower in MOCK_USERS_DB:
-            user = MOCK_USERS_DB[email_lower]
-            # Check password (plain text for now, TODO: use bcrypt in production)
-            if user["password"] == password:
+        user = await STORAGE.users.get(email_lower)
+        if user is not None:
+            # Seed users still hold plaintext under "password"; it is
+            # replaced by a bcrypt hash on their first login
+            matches, new_hash = await PASSWORD_HASHER.verify(
+                password, user.get("password_hash") or user.get("password")
+            )
+            if matches:
+                if new_hash:
+                    await AuthService._store_password_hash(email_lower, new_hash)
                 tokens = AuthService._issue_tokens(user)
                 return {
-                    "user": {
-                        "id": user["id"],
-                        "email": user["email"],
-                        "full_name": user["full_name"],
-                        "role": user["role"],
-                        "store_id": user["store_id"],
-                        "store_name": user.get("store_name", "Store"),
-                        "phone": user["phone"]
-                    },
+                    "user": AuthService._public_user(user),
                     **tokens
                 }
 
         return None
+
+    @staticmethod
+    def _public_user(user: dict) -> dict:
+        """User fields safe to return to clients."""
+        return {
+            "id": user["id"],
+            "email": user["email"],
+            "full_name": user["full_name"],
+            "role": user["role"],
+            "store_id": user["store_id"],
+            "store_name": user.get("store_name", "Store"),
+            "phone": user["phone"]
+        }
+
+    @staticmethod
+    async def _store_password_hash(email: str, password_hash: str) -> None:
+        await STORAGE.users.update(email, {"password_hash": password_hash}, remove=("password",))
     
     @staticmethod
     async def register(email: str, password: str, full_name: str,
@@ -454,17 +622,19 @@ class AuthService:
         email_lower = email.lower()
         
         # Check if email already exists
-        if email_lower in MOCK_USERS_DB:
+        if await STORAGE.users.get(email_lower) is not None:
             return None  # Email already registered
         
-        # Create new user in mock database
-        user_id = f"user_{len(MOCK_USERS_DB) + 100}"
-        store_id = f"store_{len(MOCK_USERS_DB) + 100}"
+        # Hash first: ids are reserved right before the user is added
+        password_hash = await PASSWORD_HASHER.hash(password)
+        sequence = await STORAGE.users.reserve_sequence()
+        user_id = f"user_{sequence + 100}"
+        store_id = f"store_{sequence + 100}"
         
         new_user = {
             "id": user_id,
             "email": email_lower,
-            "password": password,  # TODO: Hash with bcrypt in production
+            "password_hash": password_hash,
             "full_name": full_name,
             "role": "owner",  # New registrations are owners
             "store_id": store_id,
@@ -472,11 +642,12 @@ class AuthService:
             "phone": phone
         }
         
-        # Save to mock database
-        MOCK_USERS_DB[email_lower] = new_user
+        # Lost a race for the same email
+        if not await STORAGE.users.add(new_user):
+            return None
         
         # Initialize demo data for new store
-        AuthService._initialize_store_data(store_id, store_name)
+        await AuthService._initialize_store_data(store_id, store_name)
         
         tokens = AuthService._issue_tokens(new_user)
 
@@ -494,10 +665,10 @@ class AuthService:
         }
     
     @staticmethod
-    def _initialize_store_data(store_id: str, store_name: str):
+    async def _initialize_store_data(store_id: str, store_name: str):
         """Initialize demo data for new store"""
         # Create demo products
-        MOCK_PRODUCTS_DB[store_id] = [
+        await STORAGE.products.replace(store_id, [
             {
                 "id": f"prod_{store_id}_001",
                 "store_id": store_id,
@@ -537,10 +708,10 @@ class AuthService:
                 "unit_of_measure": "ly",
                 "description": "Cà phê đen đậm đà"
             }
-        ]
+        ])
         
         # Create demo customers
-        MOCK_CUSTOMERS_DB[store_id] = [
+        await STORAGE.customers.replace(store_id, [
             {
                 "id": f"cust_{store_id}_001",
                 "store_id": store_id,
@@ -553,19 +724,19 @@ class AuthService:
                 "created_at": "2024-01-01",
                 "total_debt": 0
             }
-        ]
+        ])
         
         # Initialize empty orders
-        MOCK_ORDERS_DB[store_id] = []
+        await STORAGE.orders.replace(store_id, [])
         
         # Initialize empty debts
-        MOCK_DEBTS_DB[store_id] = []
+        await STORAGE.debts.replace(store_id, [])
         
         # Initialize empty draft orders
         MOCK_DRAFT_ORDERS_DB[store_id] = []
         
         # Initialize empty journal entries
-        MOCK_JOURNAL_DB[store_id] = []
+        await STORAGE.journal.replace(store_id, [])
 
         # Initialize empty employees list
         MOCK_EMPLOYEES_DB[store_id] = []
@@ -577,12 +748,12 @@ class AuthService:
             return None
 
         token = token.strip()
-        user = TOKEN_STORE.get(token)
+        user = await JWT_AUTH.verify(token, "access")
         if not user:
             return None
 
         return {
-            "id": user.get("id"),
+            "id": user.get("sub"),
             "email": user.get("email"),
             "full_name": user.get("full_name"),
             "role": user.get("role", "employee"),
@@ -593,12 +764,30 @@ class AuthService:
 
     @staticmethod
     async def refresh(refresh_token: str) -> Optional[dict]:
-        """Issue a new access token using a stored refresh token."""
-        user = TOKEN_STORE.get(refresh_token)
-        if not user or user.get("token_type") != "refresh":
+        """Issue a new access token using a valid refresh token."""
+        claims = await JWT_AUTH.verify(refresh_token, "refresh")
+        if not claims:
             return None
+        # Pick up profile changes made since the refresh token was issued
+        email = claims.get("email")
+        user = (await STORAGE.users.get(email) if email else None) or {**claims, "id": claims["sub"]}
         tokens = AuthService._issue_tokens(user)
-        return {"user": user, **tokens}
+        return {"user": AuthService._public_user(user), **tokens}
+
+    @staticmethod
+    async def logout(token: str) -> bool:
+        """Revoke the access token and the refresh token issued with it."""
+        claims = await JWT_AUTH.verify(token, "access")
+        if not claims:
+            return False
+        await JWT_AUTH.revoke_session(claims)
+        return True
+
+    @staticmethod
+    async def revoke_all_tokens(user_id: str) -> None:
+        """Sign a user out everywhere, including pending password resets."""
+        await JWT_AUTH.revoke_user(user_id)
+        await PasswordResets.revoke_user(user_id)
 
     @staticmethod
     async def request_password_reset(email: str) -> Optional[dict]:
@@ -610,75 +799,182 @@ class AuthService:
         if not email:
             return None
         email_lower = email.lower()
-        user = MOCK_USERS_DB.get(email_lower)
+        user = await STORAGE.users.get(email_lower)
         # Always generate a token to avoid user enumeration patterns in real apps
         if not user:
-            # Still generate a throwaway token for parity
-            token = secrets.token_urlsafe(24)
-            TOKEN_STORE[token] = {"token_type": "reset", "email": email_lower}
-            return {"reset_token": token, "expires_in": 900}
+            # Still generate a throwaway token for parity; nothing can redeem it
+            return {"reset_token": secrets.token_urlsafe(24), "expires_in": RESET_TOKEN_TTL}
 
-        token = secrets.token_urlsafe(24)
-        TOKEN_STORE[token] = {**user, "token_type": "reset", "email": email_lower}
-        return {"reset_token": token, "expires_in": 900}
+        token = await PasswordResets.issue(user)
+        return {"reset_token": token, "expires_in": RESET_TOKEN_TTL}
 
     @staticmethod
     async def reset_password(token: str, new_password: str) -> bool:
         """Reset a user's password using a previously issued token."""
         if not token or not new_password:
             return False
-        payload = TOKEN_STORE.get(token)
-        if not payload or payload.get("token_type") != "reset":
+        # Redeeming consumes the token, so two concurrent resets can't both use it
+        payload = await PasswordResets.redeem(token)
+        if not payload:
             return False
 
         email = payload.get("email")
-        if not email or email not in MOCK_USERS_DB:
+        if not email or await STORAGE.users.get(email) is None:
             return False
 
-        # Update password (plain text for demo; hash in production)
-        MOCK_USERS_DB[email]["password"] = new_password
+        await AuthService._store_password_hash(email, await PASSWORD_HASHER.hash(new_password))
 
-        # Invalidate token after use
-        try:
-            del TOKEN_STORE[token]
-        except Exception:
-            pass
+        # Invalidate every session and pending reset of the user
+        await AuthService.revoke_all_tokens(payload["user_id"])
 
         return True
 
 
+def product_cache_key(store_id: str, product_id: str) -> str:
+    return f"product:{store_id}:{product_id}"
+
+
+def customer_cache_key(store_id: str, customer_id: str) -> str:
+    return f"customer:{store_id}:{customer_id}"
+
+
+def store_info_cache_key(store_id: str, email: str) -> str:
+    return f"store_info:{store_id}:{email}"
+
+
+class StoreService:
+    """Store profile, kept on the owner's user record"""
+
+    FIELDS = {"store_name": "store_name", "owner_name": "full_name", "email": "email",
+              "phone": "phone", "address": "address"}
+
+    @staticmethod
+    def _info(store_id: str, profile: dict) -> dict:
+        return {
+            "store_id": store_id,
+            "store_name": profile.get("store_name", "BizFlow Store"),
+            "owner_name": profile.get("full_name", "Store Owner"),
+            "email": profile.get("email", ""),
+            "phone": profile.get("phone", ""),
+            "address": profile.get("address", ""),
+            "created_at": "2024-01-01"
+        }
+
+    @staticmethod
+    async def get_info(store_id: str, current_user: Optional[dict]) -> dict:
+        """Store info from the user's current profile, generic without a user"""
+        if not current_user:
+            return StoreService._info(store_id, {})
+        email = (current_user.get("email") or "").lower()
+
+        async def load():
+            # The profile may have changed since the token's claims were signed
+            return StoreService._info(store_id, (await STORAGE.users.get(email)) or current_user)
+        return await CACHE.get_or_load(store_info_cache_key(store_id, email), load)
+
+    @staticmethod
+    async def update_info(store_id: str, current_user: dict, changes: Dict[str, Any]) -> Optional[dict]:
+        """Apply non-None changes to a registered user's store; None for test accounts"""
+        email = (current_user.get("email") or "").lower()
+        updates = {
+            attribute: changes[field]
+            for field, attribute in StoreService.FIELDS.items()
+            if changes.get(field) is not None
+        }
+        user = await STORAGE.users.update(email, updates)
+        if user is None:
+            return None
+        CACHE.invalidate(store_info_cache_key(store_id, email))
+        return StoreService._info(store_id, user)
+
+
+class ProductCatalog:
+    """Per-store product lookup by id, SKU or barcode.
+
+    Resolves order lines against the product collection (indexed on SKU
+    and barcode in memory, JSON criteria in SQL) instead of scanning the
+    catalog, and moves stock with one atomic adjust per order or batch.
+    """
+
+    @staticmethod
+    async def lookup(store_id: str, ref: Optional[str]) -> Optional[dict]:
+        """Find a product whose id, SKU or barcode equals ref"""
+        if not ref:
+            return None
+        products = STORAGE.products
+        product = await products.get(store_id, ref)
+        if product is None:
+            found = (await products.find(store_id, 0, 1, sku=ref)
+                     or await products.find(store_id, 0, 1, barcode=ref))
+            product = found[0] if found else None
+        return product
+
+    @staticmethod
+    async def resolve_lines(store_id: str, items: List[dict],
+                            resolved: Optional[Dict[Optional[str], Optional[dict]]] = None) -> List[tuple]:
+        """Pair every order line with its product (or None) in one pass.
+
+        Pass the same resolved dict across calls to look each reference up
+        only once for a whole batch of orders.
+        """
+        if resolved is None:
+            resolved = {}
+        lines = []
+        for item in items:
+            ref = item.get("product_id") or item.get("sku") or item.get("barcode")
+            if ref not in resolved:
+                resolved[ref] = await ProductCatalog.lookup(store_id, ref)
+            lines.append((item, resolved[ref]))
+        return lines
+
+    @staticmethod
+    async def adjust_stock(store_id: str, lines: List[tuple], sign: int = -1,
+                           floor: Optional[float] = None) -> None:
+        """Move quantity_in_stock of each resolved product by the line quantity"""
+        deltas: Dict[str, Dict[str, float]] = {}
+        for item, product in lines:
+            if product is None:
+                continue
+            moved = deltas.setdefault(product["id"], {"quantity_in_stock": 0})
+            moved["quantity_in_stock"] += sign * item.get("quantity", 0)
+        if deltas:
+            await STORAGE.products.adjust(store_id, deltas, floor=floor)
+            CACHE.invalidate(*(product_cache_key(store_id, product_id) for product_id in deltas))
+
+
 class ProductService:
     """Product management service"""
     
     @staticmethod
     async def list_products(store_id: str, skip: int = 0, limit: int = 50) -> List[dict]:
         """Get all products for a store"""
-        products = MOCK_PRODUCTS_DB.get(store_id, [])
-        return products[skip:skip+limit]
+        return await STORAGE.products.find(store_id, skip, limit)
+    
+    @staticmethod
+    async def page_products(store_id: str, skip: int = 0, limit: int = 50,
+                            cursor: Optional[str] = None, with_total: bool = True) -> dict:
+        """Page of products with the store total (if asked for) and the next page's cursor"""
+        return await STORAGE.products.paginate(store_id, skip, limit, cursor, with_total)
     
     @staticmethod
     async def get_product(product_id: str, store_id: str) -> Optional[dict]:
         """Get single product with details"""
-        products = MOCK_PRODUCTS_DB.get(store_id, [])
-        for product in products:
-            if product["id"] == product_id:
-                return product
-        return None
+        async def load():
+            return await STORAGE.products.get(store_id, product_id)
+        return await CACHE.get_or_load(product_cache_key(store_id, product_id), load)
     
     @staticmethod
     async def create_product(store_id: str, data: dict) -> dict:
         """Create new product"""
-        if store_id not in MOCK_PRODUCTS_DB:
-            MOCK_PRODUCTS_DB[store_id] = []
-        
         # Generate ID
-        product_id = f"prod_{len(MOCK_PRODUCTS_DB[store_id]) + 100}"
+        product_id = f"prod_{await STORAGE.products.reserve_sequence(store_id) + 100}"
         
         product = {
             "id": product_id,
             "store_id": store_id,
             "name": data.get("name"),
             "sku": data.get("sku"),
+            "barcode": data.get("barcode"),
             "category": data.get("category", ""),
             "price": float(data.get("price", 0)),
             "cost": float(data.get("cost", 0)),
@@ -689,32 +985,29 @@ class ProductService:
             "created_at": datetime.now().isoformat()
         }
         
-        MOCK_PRODUCTS_DB[store_id].append(product)
+        await STORAGE.products.add(store_id, product)
         return product
     
     @staticmethod
     async def update_product(product_id: str, store_id: str, data: dict) -> Optional[dict]:
         """Update product"""
-        products = MOCK_PRODUCTS_DB.get(store_id, [])
-        for i, product in enumerate(products):
-            if product["id"] == product_id:
-                # Update fields
-                for key, value in data.items():
-                    if key not in ["id", "store_id", "created_at"]:
-                        product[key] = value
-                MOCK_PRODUCTS_DB[store_id][i] = product
-                return product
-        return None
+        # Update fields; goes through the collection so SKU/barcode lookups follow
+        product = await STORAGE.products.update(
+            store_id, product_id, {k: v for k, v in data.items() if k not in ["id", "store_id", "created_at"]}
+        )
+        CACHE.invalidate(product_cache_key(store_id, product_id))
+        return product
     
     @staticmethod
     async def delete_product(product_id: str, store_id: str) -> bool:
         """Delete product"""
-        products = MOCK_PRODUCTS_DB.get(store_id, [])
-        for i, product in enumerate(products):
-            if product["id"] == product_id:
-                del MOCK_PRODUCTS_DB[store_id][i]
-                return True
-        return False
+        CACHE.invalidate(product_cache_key(store_id, product_id))
+        return await STORAGE.products.remove(store_id, product_id) is not None
+
+    @staticmethod
+    async def version(store_id: str) -> str:
+        """Version of the store's catalog; changes with every product or stock write"""
+        return await STORAGE.products.version(store_id)
 
     @staticmethod
     async def search_products(store_id: str, query: str) -> List[Product]:
@@ -965,26 +1258,471 @@ class ReportService:
         # TODO: Customer retention
         return {}
 
+# ============ CUSTOMER TOTALS ============
+class CustomerTotals:
+    """Per-customer outstanding debt, purchases and order count.
+
+    Updated from order create/update/delete events so customer reads never
+    scan orders. An order counts toward total_purchases once paid and toward
+    outstanding_debt while not paid; cancelled orders count nowhere, as in
+    SalesRollups.
+    """
+
+    @staticmethod
+    def _empty() -> Dict[str, float]:
+        return {"outstanding_debt": 0.0, "total_purchases": 0.0, "total_transactions": 0}
+
+    @staticmethod
+    def _fields(record: Optional[dict]) -> Dict[str, float]:
+        return {field: (record or {}).get(field, empty) for field, empty in CustomerTotals._empty().items()}
+
+    @staticmethod
+    async def get(store_id: str, customer_id: Optional[str]) -> Dict[str, float]:
+        return CustomerTotals._fields(await STORAGE.customer_totals.get(store_id, customer_id))
+
+    @staticmethod
+    async def get_many(store_id: str, customer_ids: Iterable[str]) -> Dict[str, Dict[str, float]]:
+        """Totals of several customers in one read"""
+        customer_ids = list(customer_ids)
+        found = await STORAGE.customer_totals.get_many(store_id, customer_ids)
+        return {customer_id: CustomerTotals._fields(found.get(customer_id)) for customer_id in customer_ids}
+
+    @staticmethod
+    def _contribution(order: dict) -> Dict[str, float]:
+        """What one order adds to its customer's totals (nothing if cancelled)"""
+        if not order.get("customer_id") or order.get("status") == "cancelled":
+            return {}
+        amount = order.get("total_amount", 0) or 0
+        field = "total_purchases" if order.get("payment_status") == "paid" else "outstanding_debt"
+        return {field: amount, "total_transactions": 1}
+
+    @staticmethod
+    async def apply_orders(store_id: str, orders: Iterable[dict], sign: int = 1) -> None:
+        """Add (sign=1) or retract (sign=-1) the orders' contributions in one write"""
+        deltas = {
+            customer_id: {field: sign * value for field, value in totals.items()}
+            for customer_id, totals in CustomerTotals.tally(orders).items()
+        }
+        if not deltas:
+            return
+        await STORAGE.customer_totals.adjust(store_id, deltas, create=True)
+        CACHE.invalidate(*(customer_cache_key(store_id, customer_id) for customer_id in deltas))
+
+    @staticmethod
+    def tally(orders: Iterable[dict]) -> Dict[str, Dict[str, float]]:
+        """Every customer's totals, computed from scratch out of orders"""
+        computed: Dict[str, Dict[str, float]] = {}
+        for order in orders:
+            contribution = CustomerTotals._contribution(order)
+            if not contribution:
+                continue
+            totals = computed.setdefault(order["customer_id"], CustomerTotals._empty())
+            for field, value in contribution.items():
+                totals[field] += value
+        return computed
+
+    @staticmethod
+    def records(computed: Dict[str, Dict[str, float]]) -> List[dict]:
+        return [{"id": customer_id, **totals} for customer_id, totals in computed.items()]
+
+    @staticmethod
+    async def compute(store_id: str) -> Dict[str, Dict[str, float]]:
+        """Recompute every customer's totals out of the store's orders"""
+        return CustomerTotals.tally(await STORAGE.orders.find(store_id))
+
+    @staticmethod
+    async def rebuild(store_id: str) -> None:
+        stale = [record["id"] for record in await STORAGE.customer_totals.find(store_id)]
+        computed = await CustomerTotals.compute(store_id)
+        await STORAGE.customer_totals.replace(store_id, CustomerTotals.records(computed))
+        CACHE.invalidate(*(customer_cache_key(store_id, c) for c in set(stale) | set(computed)))
+
+    @staticmethod
+    async def check_consistency(store_id: str, tolerance: float = 0.01) -> List[Dict[str, Any]]:
+        """Compare running totals with a full recompute.
+
+        Returns one entry per drifted customer and field; empty means consistent.
+        """
+        expected = await CustomerTotals.compute(store_id)
+        running = {record["id"]: record for record in await STORAGE.customer_totals.find(store_id)}
+        drift = []
+        for customer_id in set(expected) | set(running):
+            want = expected.get(customer_id) or CustomerTotals._empty()
+            have = CustomerTotals._fields(running.get(customer_id))
+            for field, value in want.items():
+                if abs(have[field] - value) > tolerance:
+                    drift.append({
+                        "customer_id": customer_id,
+                        "field": field,
+                        "running": have[field],
+                        "expected": value,
+                    })
+        return drift
+
+
+class SalesRollups:
+    """Per-store sales totals by day, by month and overall.
+
+    Bucket records are keyed "day:YYYY-MM-DD", "month:YYYY-MM" and "all"
+    and are moved by every order create/update/delete, so the daily and
+    monthly reports read a single record instead of the orders. Revenue
+    counts paid orders and unpaid amounts count as debt; cancelled orders
+    count nowhere. Unique customers are kept exact under retractions by a
+    "<bucket>:<customer_id>" record holding each customer's order count.
+    """
+
+    @staticmethod
+    def _empty() -> Dict[str, float]:
+        return {
+            "total_revenue": 0.0, "total_orders": 0, "unique_customers": 0,
+            "paid_orders": 0, "unpaid_orders": 0, "unpaid_amount": 0.0, "total_discount": 0.0,
+        }
+
+    @staticmethod
+    def buckets(order: dict) -> List[str]:
+        created_at = order.get("created_at") or ""
+        return [f"day:{created_at[:10]}", f"month:{created_at[:7]}", "all"]
+
+    @staticmethod
+    def _contribution(order: dict) -> Dict[str, float]:
+        """What one order adds to each of its buckets (nothing if cancelled)"""
+        if order.get("status") == "cancelled":
+            return {}
+        amount = order.get("total_amount", 0) or 0
+        paid = order.get("payment_status") == "paid"
+        return {
+            "total_revenue": amount if paid else 0,
+            "total_orders": 1,
+            "paid_orders": 1 if paid else 0,
+            "unpaid_orders": 0 if paid else 1,
+            "unpaid_amount": 0 if paid else amount,
+            "total_discount": order.get("discount", 0) or 0,
+        }
+
+    @staticmethod
+    async def apply_orders(store_id: str, orders: Iterable[dict], sign: int = 1) -> None:
+        """Add (sign=1) or retract (sign=-1) the orders' contributions in one pass"""
+        deltas: Dict[str, Dict[str, float]] = {}
+        # "<bucket>:<customer_id>" -> ({"orders": moved}, bucket)
+        seen_moves: Dict[str, Tuple[Dict[str, float], str]] = {}
+        for order in orders:
+            contribution = SalesRollups._contribution(order)
+            if not contribution:
+                continue
+            customer_id = order.get("customer_id")
+            for bucket in SalesRollups.buckets(order):
+                totals = deltas.setdefault(bucket, {})
+                for field, value in contribution.items():
+                    totals[field] = totals.get(field, 0) + sign * value
+                if customer_id:
+                    seen_moves.setdefault(f"{bucket}:{customer_id}", ({"orders": 0}, bucket))[0]["orders"] += sign
+        if not deltas:
+            return
+        if seen_moves:
+            seen = await STORAGE.sales_rollups.adjust(
+                store_id, {key: moved for key, (moved, _) in seen_moves.items()}, create=True
+            )
+            for key, (moved, bucket) in seen_moves.items():
+                # First orders of the customer in the bucket, or the last ones gone
+                after = seen[key]["orders"]
+                if (after - moved["orders"] > 0) != (after > 0):
+                    totals = deltas[bucket]
+                    totals["unique_customers"] = totals.get("unique_customers", 0) + (1 if after > 0 else -1)
+        await STORAGE.sales_rollups.adjust(store_id, deltas, create=True)
+
+    @staticmethod
+    def tally(orders: Iterable[dict]) -> Dict[str, Dict[str, float]]:
+        """Every bucket (and customer count) computed from scratch out of orders"""
+        rollups: Dict[str, Dict[str, float]] = {}
+        for order in orders:
+            contribution = SalesRollups._contribution(order)
+            if not contribution:
+                continue
+            customer_id = order.get("customer_id")
+            for bucket in SalesRollups.buckets(order):
+                totals = rollups.setdefault(bucket, SalesRollups._empty())
+                for field, value in contribution.items():
+                    totals[field] += value
+                if customer_id:
+                    seen = rollups.setdefault(f"{bucket}:{customer_id}", {"orders": 0})
+                    seen["orders"] += 1
+                    if seen["orders"] == 1:
+                        totals["unique_customers"] += 1
+        return rollups
+
+    @staticmethod
+    def records(rollups: Dict[str, Dict[str, float]]) -> List[dict]:
+        return [{"id": bucket, **totals} for bucket, totals in rollups.items()]
+
+    @staticmethod
+    async def get(store_id: str, bucket: str) -> Dict[str, float]:
+        """A bucket's totals; zeros for a period without orders"""
+        record = await STORAGE.sales_rollups.get(store_id, bucket) or {}
+        return {field: record.get(field, empty) for field, empty in SalesRollups._empty().items()}
+
+    @staticmethod
+    async def rebuild(store_id: str) -> int:
+        """Regenerate the store's rollups from its orders; returns the bucket count"""
+        records = SalesRollups.records(SalesRollups.tally(await STORAGE.orders.find(store_id)))
+        await STORAGE.sales_rollups.replace(store_id, records)
+        return len(records)
+
+
+class ProductSales:
+    """Quantity and revenue sold per product, by day, by month and overall.
+
+    One record per SalesRollups bucket holds a "quantity:<product_id>" and
+    a "revenue:<product_id>" counter for each product sold in it, moved by
+    every order create/update/delete; cancelled orders count nowhere. Best
+    sellers of a period merge the few records covering it (whole months
+    from month buckets, the remaining days from day buckets) and take the
+    top k with a heap.
+    """
+
+    FIELDS = ("quantity", "revenue")
+
+    @staticmethod
+    def _counters(order: dict) -> Dict[str, float]:
+        """What one order adds to each of its buckets"""
+        if order.get("status") == "cancelled":
+            return {}
+        counters: Dict[str, float] = {}
+        for item in order.get("items") or ():
+            product_id = item.get("product_id")
+            if product_id is None:
+                continue
+            for field, value in (("quantity", item.get("quantity")), ("revenue", item.get("subtotal"))):
+                key = f"{field}:{product_id}"
+                counters[key] = counters.get(key, 0) + (value or 0)
+        return counters
+
+    @staticmethod
+    async def apply_orders(store_id: str, orders: Iterable[dict], sign: int = 1) -> None:
+        """Add (sign=1) or retract (sign=-1) the orders' items in one write"""
+        deltas = {
+            bucket: {key: sign * value for key, value in counters.items()}
+            for bucket, counters in ProductSales.tally(orders).items()
+        }
+        if deltas:
+            await STORAGE.product_sales.adjust(store_id, deltas, create=True)
+
+    @staticmethod
+    def tally(orders: Iterable[dict]) -> Dict[str, Dict[str, float]]:
+        """Every bucket's counters computed from scratch out of orders"""
+        buckets: Dict[str, Dict[str, float]] = {}
+        for order in orders:
+            counters = ProductSales._counters(order)
+            for bucket in SalesRollups.buckets(order) if counters else ():
+                totals = buckets.setdefault(bucket, {})
+                for key, value in counters.items():
+                    totals[key] = totals.get(key, 0) + value
+        return buckets
+
+    @staticmethod
+    def records(buckets: Dict[str, Dict[str, float]]) -> List[dict]:
+        return [{"id": bucket, **counters} for bucket, counters in buckets.items()]
+
+    @staticmethod
+    async def rebuild(store_id: str) -> int:
+        """Regenerate the store's counters from its orders; returns the bucket count"""
+        records = ProductSales.records(ProductSales.tally(await STORAGE.orders.find(store_id)))
+        await STORAGE.product_sales.replace(store_id, records)
+        return len(records)
+
+    @staticmethod
+    def period_buckets(start: Optional[date], end: Optional[date]) -> List[str]:
+        """Buckets covering the days start..end inclusive ("all" without bounds)"""
+        if start is None and end is None:
+            return ["all"]
+        if start is None:
+            raise ValueError("start is required with end")
+        end = end or date.today()
+        if start > end:
+            raise ValueError("start must not be after end")
+        buckets, day = [], start
+        while day <= end:
+            if day.day == 1:
+                next_month = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+                if next_month - timedelta(days=1) <= end:
+                    buckets.append(f"month:{day:%Y-%m}")
+                    day = next_month
+                    continue
+            buckets.append(f"day:{day.isoformat()}")
+            day += timedelta(days=1)
+        return buckets
+
+    @staticmethod
+    async def _counter_records(store_id: str, buckets: List[str]):
+        for bucket in buckets:
+            record = await STORAGE.product_sales.get(store_id, bucket)
+            if record:
+                yield record
+
+    @staticmethod
+    async def top(store_id: str, buckets: List[str], by: str = "quantity", k: int = 10,
+                  approximate: bool = False) -> List[dict]:
+        """The k best sellers over the buckets, ranked by quantity or revenue.
+
+        Exact mode sums every product's counters before the heap. The
+        approximate mode streams the counters through a count-min sketch
+        and a k-entry heap (HeavyHitters), so memory stays fixed however
+        many products the window holds, then sums the exact counters of
+        just those k candidates in a second pass.
+        """
+        candidates = None
+        if approximate:
+            tracker = HeavyHitters(k)
+            prefix = f"{by}:"
+            async for record in ProductSales._counter_records(store_id, buckets):
+                for key, value in record.items():
+                    if key.startswith(prefix):
+                        tracker.add(key[len(prefix):], value)
+            candidates = {product_id for product_id, _ in tracker.result()}
+        totals: Dict[str, Dict[str, float]] = {}
+        async for record in ProductSales._counter_records(store_id, buckets):
+            for key, value in record.items():
+                field, _, product_id = key.partition(":")
+                if field in ProductSales.FIELDS and (candidates is None or product_id in candidates):
+                    totals.setdefault(product_id, {"quantity": 0, "revenue": 0})[field] += value
+        # Orders retracted since leave zeroed counters behind
+        ranked = top_k(((pid, t[by]) for pid, t in totals.items() if any(t.values())), k)
+        return [{"product_id": product_id, **totals[product_id]} for product_id, _ in ranked]
+
+
+class SalesAnalytics:
+    """Columnar projections of each store's orders (see OrderColumns).
+
+    A projection is built from the order collection in chunks and reused
+    for as long as the orders' version stays the same, so repeated range
+    and group-by queries cost NumPy passes rather than order scans. When
+    orders were only added since (the store's growth token still holds),
+    the ones after the projection's last (created_at, id) are appended
+    instead; any change or removal of an order rebuilds it.
+    """
+
+    CHUNK_SIZE = 5000
+    # store_id -> (orders version, growth token, orders added, last cursor,
+    # OrderColumns); least recently used dropped
+    _projections = LocalCache(maxsize=64, ttl=float("inf"))
+
+    @staticmethod
+    async def columns(store_id: str) -> OrderColumns:
+        # Read first: writes landing mid-build make the next call catch up
+        version = await STORAGE.orders.version(store_id)
+        cached = SalesAnalytics._projections.get(store_id)
+        if cached is not MISSING:
+            if cached[0] == version:
+                return cached[4]
+            appended = await SalesAnalytics._append(store_id, version, cached)
+            if appended is not None:
+                return appended
+        token, inserted = await STORAGE.orders.growth(store_id)
+        columns = OrderColumns()
+        cursor = await SalesAnalytics._scan(store_id, None, columns.append)
+        SalesAnalytics._projections.set(store_id, (version, token, inserted, cursor, columns))
+        return columns
+
+    @staticmethod
+    async def _append(store_id: str, version: str, cached: tuple) -> Optional[OrderColumns]:
+        """Append the orders added after the cached projection, or None to rebuild"""
+        _, token, inserted, cursor, columns = cached
+        added: List[dict] = []
+        cursor = await SalesAnalytics._scan(store_id, cursor, added.extend)
+        # Read after the scan: every order added since the projection must be
+        # one it just read, otherwise one landed behind the cursor
+        token_now, inserted_now = await STORAGE.orders.growth(store_id)
+        if token_now != token or len(added) != inserted_now - inserted:
+            return None
+        if SalesAnalytics._projections.get(store_id) is not cached:
+            return None  # Another caller moved the projection on meanwhile
+        if added:
+            columns.append(added)
+        SalesAnalytics._projections.set(store_id, (version, token, inserted_now, cursor, columns))
+        return columns
+
+    @staticmethod
+    async def _scan(store_id: str, cursor: Optional[str], into: Callable[[List[dict]], None]) -> Optional[str]:
+        """Feed the orders after cursor to into, chunk by chunk; the last one's cursor"""
+        while True:
+            page = await STORAGE.orders.paginate(store_id, limit=SalesAnalytics.CHUNK_SIZE, cursor=cursor,
+                                                 with_total=False)
+            if page["items"]:
+                into(page["items"])
+                last = page["items"][-1]
+                cursor = encode_cursor(created_at_key(last), last["id"])
+            if page["next_cursor"] is None:
+                return cursor
+
+
+REPORT_CACHE_REQUESTS = REGISTRY.counter(
+    "bizflow_report_cache_requests_total", "Report cache lookups by report and hit/miss", ("report", "result")
+)
+
+
+class ReportCache:
+    """Report results cached under the store's data version.
+
+    The data version joins the store versions of the orders, debts,
+    journal and sales rollups, and every write to any of them moves it
+    forward, on any worker sharing the backend. A result is therefore
+    served until the store's data next changes, with no TTL to tune;
+    results of older versions are never read again and age out of the
+    LRU.
+    """
+
+    SOURCES = ("orders", "debts", "journal", "sales_rollups")
+    _results = LocalCache(maxsize=REPORT_CACHE_SIZE, ttl=float("inf"))
+
+    @staticmethod
+    async def data_version(store_id: str) -> str:
+        return "/".join([await getattr(STORAGE, name).version(store_id) for name in ReportCache.SOURCES])
+
+    @staticmethod
+    async def get_or_load(report: str, store_id: str, args: tuple, loader: Callable[[], Awaitable[Any]]) -> Any:
+        # Read first: writes landing mid-load leave the result under the old version
+        key = f"{report}:{store_id}:{await ReportCache.data_version(store_id)}:{args!r}"
+        value = ReportCache._results.get(key)
+        if value is not MISSING:
+            REPORT_CACHE_REQUESTS.labels(report, "hit").inc()
+            return value
+        REPORT_CACHE_REQUESTS.labels(report, "miss").inc()
+        value = await loader()
+        ReportCache._results.set(key, value)
+        return value
+
+
+REGISTRY.gauge(
+    "bizflow_report_cache_entries", "Report results held by this worker's report cache",
+    collector=lambda: [((), len(ReportCache._results))]
+)
+
+
 # ============ CUSTOMER SERVICE ============
 class CustomerService:
     @staticmethod
     async def list_customers(store_id: str, skip: int = 0, limit: int = 50) -> List[dict]:
-        customers = MOCK_CUSTOMERS_DB.get(store_id, [])
+        customers = await STORAGE.customers.find(store_id, skip, limit)
         # Ensure response has all optional fields expected by CustomerResponse
-        normalized = [CustomerService._normalize_customer(c, store_id) for c in customers]
-        return normalized[skip:skip+limit]
+        return await CustomerService._normalize_customers(customers, store_id)
+    
+    @staticmethod
+    async def page_customers(store_id: str, skip: int = 0, limit: int = 50,
+                             cursor: Optional[str] = None, with_total: bool = True) -> dict:
+        """Page of customers with the store total (if asked for) and the next page's cursor"""
+        page = await STORAGE.customers.paginate(store_id, skip, limit, cursor, with_total)
+        page["items"] = await CustomerService._normalize_customers(page["items"], store_id)
+        return page
     
     @staticmethod
     async def get_customer(customer_id: str, store_id: str) -> Optional[dict]:
-        customers = MOCK_CUSTOMERS_DB.get(store_id, [])
-        found = next((c for c in customers if c["id"] == customer_id), None)
-        return CustomerService._normalize_customer(found, store_id) if found else None
+        async def load():
+            found = await STORAGE.customers.get(store_id, customer_id)
+            return await CustomerService._normalize_customer(found, store_id)
+        return await CACHE.get_or_load(customer_cache_key(store_id, customer_id), load)
     
     @staticmethod
     async def create_customer(store_id: str, data: dict) -> dict:
-        if store_id not in MOCK_CUSTOMERS_DB:
-            MOCK_CUSTOMERS_DB[store_id] = []
-        customer_id = f"cust_{len(MOCK_CUSTOMERS_DB[store_id]) + 100}"
+        customer_id = f"cust_{await STORAGE.customers.reserve_sequence(store_id) + 100}"
         customer = {
             "id": customer_id,
             "store_id": store_id,
@@ -999,92 +1737,189 @@ class CustomerService:
             "is_active": data.get("is_active", True),
             "created_at": datetime.now().isoformat()
         }
-        MOCK_CUSTOMERS_DB[store_id].append(customer)
-        return CustomerService._normalize_customer(customer, store_id)
+        await STORAGE.customers.add(store_id, customer)
+        return await CustomerService._normalize_customer(customer, store_id)
     
     @staticmethod
     async def update_customer(customer_id: str, store_id: str, data: dict) -> Optional[dict]:
-        customers = MOCK_CUSTOMERS_DB.get(store_id, [])
-        for i, customer in enumerate(customers):
-            if customer["id"] == customer_id:
-                customer.update({k: v for k, v in data.items() if k not in ["id", "store_id", "created_at"]})
-                MOCK_CUSTOMERS_DB[store_id][i] = customer
-                return CustomerService._normalize_customer(customer, store_id)
-        return None
+        customer = await STORAGE.customers.update(
+            store_id, customer_id, {k: v for k, v in data.items() if k not in ["id", "store_id", "created_at"]}
+        )
+        CACHE.invalidate(customer_cache_key(store_id, customer_id))
+        return await CustomerService._normalize_customer(customer, store_id)
     
     @staticmethod
     async def delete_customer(customer_id: str, store_id: str) -> bool:
-        customers = MOCK_CUSTOMERS_DB.get(store_id, [])
-        for i, customer in enumerate(customers):
-            if customer["id"] == customer_id:
-                del MOCK_CUSTOMERS_DB[store_id][i]
-                return True
-        return False
+        CACHE.invalidate(customer_cache_key(store_id, customer_id))
+        return await STORAGE.customers.remove(store_id, customer_id) is not None
+
+    @staticmethod
+    async def version(store_id: str) -> str:
+        """Version of the store's customers; changes with customer writes and
+        with the order events that move their totals"""
+        customers = await STORAGE.customers.version(store_id)
+        return f"{customers}.{await STORAGE.customer_totals.version(store_id)}"
 
     @staticmethod
-    def _normalize_customer(customer: Optional[dict], store_id: str) -> Optional[dict]:
+    async def _normalize_customers(customers: List[dict], store_id: str) -> List[dict]:
+        """_normalize_customer over a page, reading the page's totals at once"""
+        totals = await CustomerTotals.get_many(store_id, [c.get("id") for c in customers])
+        return [CustomerService._with_totals(c, store_id, totals[c.get("id")]) for c in customers]
+
+    @staticmethod
+    async def _normalize_customer(customer: Optional[dict], store_id: str) -> Optional[dict]:
         """Add optional fields with defaults so response_model validation passes."""
         if not customer:
             return None
         
-        # Auto-calculate outstanding_debt from unpaid orders
-        customer_id = customer.get("id")
-        calculated_debt = CustomerService._calculate_outstanding_debt(customer_id, store_id)
-        total_purchases = CustomerService._calculate_total_purchases(customer_id, store_id)
-        
+        # Totals are maintained from order events (see CustomerTotals),
+        # so they override any stale values stored on the customer record
+        totals = await CustomerTotals.get(store_id, customer.get("id"))
+        return CustomerService._with_totals(customer, store_id, totals)
+
+    @staticmethod
+    def _with_totals(customer: dict, store_id: str, totals: Dict[str, float]) -> dict:
         return {
             **customer,
             "business_id": customer.get("business_id", store_id),
-            "outstanding_debt": calculated_debt,
-            "total_transactions": customer.get("total_transactions", 0),
+            "outstanding_debt": totals["outstanding_debt"],
+            "total_transactions": totals["total_transactions"],
             "is_active": customer.get("is_active", True),
-            # Derive total_purchases from paid orders to avoid stale mock values
-            "total_purchases": total_purchases,
+            "total_purchases": totals["total_purchases"],
         }
-    
+
     @staticmethod
-    def _calculate_outstanding_debt(customer_id: str, store_id: str) -> float:
-        """Calculate outstanding debt as sum of all unpaid orders (payment_status != 'paid')."""
-        total_debt = 0.0
-        orders = MOCK_ORDERS_DB.get(store_id, [])
-        
-        for order in orders:
-            if order.get("customer_id") == customer_id:
-                # Include any order that is NOT fully paid
-                if order.get("payment_status") != "paid":
-                    total_debt += order.get("total_amount", 0)
-        
-        return total_debt
+    async def get_customer_history(customer_id: str, store_id: str) -> dict:
+        """Purchase history read from the customer_id order index"""
+        orders = await STORAGE.orders.find(store_id, customer_id=customer_id)
+        totals = await CustomerTotals.get(store_id, customer_id)
+        return {
+            "total_orders": len(orders),
+            "total_spent": totals["total_purchases"],
+            "last_order": orders[-1] if orders else None,
+            "orders": orders,
+        }
 
     @staticmethod
-    def _calculate_total_purchases(customer_id: str, store_id: str) -> float:
-        """Sum of total_amount for all paid orders of the customer."""
-        orders = MOCK_ORDERS_DB.get(store_id, [])
-        return sum(
-            order.get("total_amount", 0)
-            for order in orders
-            if order.get("customer_id") == customer_id and order.get("payment_status") == "paid"
-        )
+    async def check_totals(store_id: str) -> List[Dict[str, Any]]:
+        """Detect drift between running customer totals and the orders"""
+        return await CustomerTotals.check_consistency(store_id)
 
 
 # ============ ORDER SERVICE ============
 class OrderService:
     @staticmethod
-    async def list_orders(store_id: str, skip: int = 0, limit: int = 50) -> List[dict]:
-        orders = MOCK_ORDERS_DB.get(store_id, [])
-        return orders[skip:skip+limit]
+    async def list_orders(store_id: str, skip: int = 0, limit: int = 50,
+                          status: Optional[str] = None,
+                          payment_status: Optional[str] = None,
+                          customer_id: Optional[str] = None) -> List[dict]:
+        """Orders matching the given filters, filtered through the order indexes before paginating"""
+        return await STORAGE.orders.find(
+            store_id, skip, limit, status=status, payment_status=payment_status, customer_id=customer_id
+        )
+    
+    @staticmethod
+    async def page_orders(store_id: str, skip: int = 0, limit: int = 50,
+                          cursor: Optional[str] = None,
+                          status: Optional[str] = None,
+                          payment_status: Optional[str] = None,
+                          customer_id: Optional[str] = None,
+                          with_total: bool = True) -> dict:
+        """Page of matching orders with their total (if asked for) and the next page's cursor"""
+        return await STORAGE.orders.paginate(
+            store_id, skip, limit, cursor, with_total,
+            status=status, payment_status=payment_status, customer_id=customer_id
+        )
     
     @staticmethod
     async def get_order(order_id: str, store_id: str) -> Optional[dict]:
-        orders = MOCK_ORDERS_DB.get(store_id, [])
-        return next((o for o in orders if o["id"] == order_id), None)
+        return await STORAGE.orders.get(store_id, order_id)
     
     @staticmethod
     async def create_order(store_id: str, customer_id: str, items: list, **kwargs) -> dict:
-        if store_id not in MOCK_ORDERS_DB:
-            MOCK_ORDERS_DB[store_id] = []
+        # Resolve every line against the catalog once, then build items
+        lines = await ProductCatalog.resolve_lines(store_id, OrderService._item_dicts(items))
+        order = await OrderService._build_order(store_id, customer_id, lines, kwargs)
+        async with STORAGE.transaction():
+            await STORAGE.orders.add(store_id, order)
+            await OrderService._apply_order(store_id, order)
+            
+            # Reduce inventory if payment is already made
+            if kwargs.get("payment_status") == "paid":
+                await ProductCatalog.adjust_stock(store_id, lines)
+        OrderService._forget(store_id, order)
+        return order
+
+    @staticmethod
+    async def create_orders_batch(store_id: str, orders_data: List[dict]) -> dict:
+        """Create many orders at once, e.g. a POS/mobile offline queue.
+
+        Every order is validated and built first, with products resolved once
+        for the whole batch; a bad order is reported in its result without
+        failing the rest. The valid orders are then added, and their customer
+        totals, rollups and stock moved once for the batch, in one
+        transaction. An order whose client_ref the store already has is not
+        created again: its result carries the existing order with
+        "duplicate" set, so a client can replay a batch safely.
+        """
+        resolved: Dict[Optional[str], Optional[dict]] = {}
+        results = []
+        accepted = []
+        refs = set()
+        
+        for index, data in enumerate(orders_data):
+            result = {"index": index, "client_ref": data.get("client_ref")}
+            results.append(result)
+            lines = await ProductCatalog.resolve_lines(
+                store_id, OrderService._item_dicts(data.get("items") or []), resolved
+            )
+            error = OrderService._validate_lines(lines)
+            if error is None and result["client_ref"] is not None:
+                if result["client_ref"] in refs:
+                    error = f"Duplicate client_ref in batch: {result['client_ref']}"
+                refs.add(result["client_ref"])
+            if error:
+                result.update(success=False, error=error)
+                continue
+            accepted.append((result, data, lines))
+        
+        existing = {}
+        for ref in refs:
+            found = await STORAGE.orders.find(store_id, limit=1, client_ref=ref)
+            if found:
+                existing[ref] = found[0]
         
-        # Convert Pydantic models to dicts for easier processing
+        orders, paid_lines = [], []
+        for result, data, lines in accepted:
+            if result["client_ref"] in existing:
+                result.update(success=True, order=existing[result["client_ref"]], duplicate=True)
+                continue
+            kwargs = {k: v for k, v in data.items() if k not in ["customer_id", "items", "client_ref"]}
+            order = await OrderService._build_order(store_id, data.get("customer_id"), lines, kwargs)
+            if result["client_ref"] is not None:
+                order["client_ref"] = result["client_ref"]
+            if order["payment_status"] == "paid":
+                paid_lines.extend(lines)
+            orders.append(order)
+            result.update(success=True, order=order)
+        
+        if orders:
+            async with STORAGE.transaction():
+                for order in orders:
+                    await STORAGE.orders.add(store_id, order)
+                await OrderService._apply_orders(store_id, orders)
+                await ProductCatalog.adjust_stock(store_id, paid_lines)
+            OrderService._forget(store_id, *orders)
+        return {
+            "results": results,
+            "total": len(results),
+            "created": len(orders),
+            "failed": sum(1 for r in results if not r["success"]),
+        }
+
+    @staticmethod
+    def _item_dicts(items: list) -> List[dict]:
+        """Convert Pydantic models to dicts for easier processing"""
         items_list = []
         for item in items:
             if isinstance(item, dict):
@@ -1092,26 +1927,39 @@ class OrderService:
             else:
                 # Convert Pydantic model to dict
                 items_list.append(item.dict() if hasattr(item, 'dict') else vars(item))
-        
+        return items_list
+
+    @staticmethod
+    def _validate_lines(lines: List[tuple]) -> Optional[str]:
+        """Reason an order's lines can't be accepted, or None if they can"""
+        if not lines:
+            return "Order has no items"
+        for item, product in lines:
+            if product is None:
+                return f"Product not found: {item.get('product_id') or item.get('sku') or item.get('barcode')}"
+            quantity = item.get("quantity")
+            if isinstance(quantity, bool) or not isinstance(quantity, (int, float)) or quantity <= 0:
+                return f"Invalid quantity for product {product['id']}"
+        return None
+
+    @staticmethod
+    async def _build_order(store_id: str, customer_id: Optional[str],
+                           lines: List[tuple], kwargs: dict) -> dict:
+        """Price resolved lines and assemble a new order record"""
         # Generate order number and ID
-        order_count = len(MOCK_ORDERS_DB[store_id]) + 1
+        order_count = await STORAGE.orders.reserve_sequence(store_id) + 1
         order_id = f"order_{order_count:03d}"
         order_number = f"ORD-{datetime.now().year}-{order_count:03d}"
         
-        # Get product prices and build items
-        products_in_store = MOCK_PRODUCTS_DB.get(store_id, [])
         processed_items = []
         total_amount = 0
         
-        for i, item in enumerate(items_list):
-            # Find product to get price
+        for i, (item, product) in enumerate(lines):
             product_price = 0
             product_name = item.get("product_name", "")
-            for product in products_in_store:
-                if product.get("id") == item.get("product_id"):
-                    product_price = product.get("price", 0)
-                    product_name = product.get("name", product_name)
-                    break
+            if product:
+                product_price = product.get("price", 0)
+                product_name = product.get("name", product_name)
             
             quantity = item.get("quantity", 0)
             subtotal = quantity * product_price
@@ -1119,7 +1967,7 @@ class OrderService:
             
             processed_items.append({
                 "id": f"item_{i+1:03d}",
-                "product_id": item.get("product_id", ""),
+                "product_id": product["id"] if product else item.get("product_id", ""),
                 "product_name": product_name,
                 "quantity": quantity,
                 "unit": item.get("unit", "cái"),
@@ -1128,7 +1976,7 @@ class OrderService:
             })
         
         # Create order with all required fields
-        order = {
+        return {
             "id": order_id,
             "order_number": order_number,
             "business_id": store_id,
@@ -1147,116 +1995,117 @@ class OrderService:
             "created_at": datetime.now().isoformat(),
             "completed_at": None
         }
-        MOCK_ORDERS_DB[store_id].append(order)
-        
-        # Reduce inventory if payment is already made
-        if kwargs.get("payment_status") == "paid":
-            for item in items_list:
-                product_id = item.get("product_id")
-                quantity = item.get("quantity", 0)
-                if product_id and store_id in MOCK_PRODUCTS_DB:
-                    for product in MOCK_PRODUCTS_DB[store_id]:
-                        if product.get("id") == product_id:
-                            product["quantity_in_stock"] = product.get("quantity_in_stock", 0) - quantity
-            
-            # Update customer total_purchases
-            if customer_id and store_id in MOCK_CUSTOMERS_DB:
-                for customer in MOCK_CUSTOMERS_DB[store_id]:
-                    if customer.get("id") == customer_id:
-                        customer["total_purchases"] = customer.get("total_purchases", 0) + total_amount
-                        break
-        
-        # outstanding_debt is auto-calculated from all unpaid orders, no need to manual update here
-        
-        return order
     
     @staticmethod
     async def update_order(order_id: str, store_id: str, data: dict) -> Optional[dict]:
-        orders = MOCK_ORDERS_DB.get(store_id, [])
-        for i, order in enumerate(orders):
-            if order["id"] == order_id:
+        order = await STORAGE.orders.get(store_id, order_id)
+        if not order:
+            return None
+        # Shipping statuses that require payment
+        shipping_statuses = ["confirmed", "shipped", "delivered"]
+        
+        # Validate: Can only ship/deliver if customer has address
+        has_address = True
+        if data.get("status") in ["shipped", "delivered"]:
+            customer_id = data.get("customer_id", order.get("customer_id"))
+            customer = await CustomerService.get_customer(customer_id, store_id)
+            has_address = bool(customer and customer.get("address"))
+        
+        def change(current: dict) -> dict:
+            # Runs against the locked order, so the checks see what the update replaces
+            changes = {k: v for k, v in data.items() if k not in ["id", "store_id", "created_at"]}
+            new_status = changes.get("status", current.get("status"))
+            new_payment_status = changes.get("payment_status", current.get("payment_status"))
+            logger.debug(
+                "Updating order %s: status %s -> %s, payment_status %s -> %s",
+                order_id, current.get("status"), new_status, current.get("payment_status"), new_payment_status
+            )
+            if new_status in shipping_statuses and new_payment_status != "paid":
                 # Validate: Can only ship/deliver if payment_status is "paid"
-                new_status = data.get("status", order.get("status"))
-                new_payment_status = data.get("payment_status", order.get("payment_status"))
-                
-                print(f"=== UPDATE ORDER {order_id} ===")
-                print(f"DEBUG: Current status={order.get('status')}, payment_status={order.get('payment_status')}")
-                print(f"DEBUG: New status={new_status}, payment_status={new_payment_status}")
-                print(f"DEBUG: Data received: {data}")
-                
-                # Shipping statuses that require payment
-                shipping_statuses = ["confirmed", "shipped", "delivered"]
-                
-                if new_status in shipping_statuses and new_payment_status != "paid":
-                    # If trying to change to shipping status without payment, reject or reset
-                    print(f"WARNING: Trying to set shipping status {new_status} without payment - keeping old status {order.get('status')}")
-                    data["status"] = order.get("status")  # Keep old status
-                
-                # Validate: Can only ship/deliver if customer has address
-                if new_status in ["shipped", "delivered"]:
-                    customer_id = data.get("customer_id", order.get("customer_id"))
-                    customer = await CustomerService.get_customer(customer_id, store_id)
-                    if not customer or not customer.get("address"):
-                        # If customer has no address, keep old status
-                        print(f"WARNING: Customer {customer_id} has no address - keeping old status {order.get('status')}")
-                        data["status"] = order.get("status")
-                
-                # Handle payment status change to "paid"
-                if data.get("payment_status") == "paid" and order.get("payment_status") != "paid":
-                    # Reduce inventory for all order items
-                    for item in order.get("items", []):
-                        products = MOCK_PRODUCTS_DB.get(store_id, [])
-                        for j, product in enumerate(products):
-                            if product["id"] == item["product_id"]:
-                                # Reduce quantity_in_stock
-                                reduction = item.get("quantity", 0)
-                                product["quantity_in_stock"] = max(0, product.get("quantity_in_stock", 0) - reduction)
-                                MOCK_PRODUCTS_DB[store_id][j] = product
-                                break
-                    
-                    # Update customer total_purchases
-                    customer_id = data.get("customer_id", order.get("customer_id"))
-                    if customer_id and store_id in MOCK_CUSTOMERS_DB:
-                        for customer in MOCK_CUSTOMERS_DB[store_id]:
-                            if customer.get("id") == customer_id:
-                                amount = order.get("total_amount", 0)
-                                customer["total_purchases"] = customer.get("total_purchases", 0) + amount
-                                # outstanding_debt is auto-calculated from unpaid orders, no manual update needed
-                                break
-                
-                # Update order with new data
-                order.update({k: v for k, v in data.items() if k not in ["id", "store_id", "created_at"]})
-                MOCK_ORDERS_DB[store_id][i] = order
-                return order
-        return None
+                logger.warning(
+                    "Order %s: shipping status %s requires payment, keeping %s",
+                    order_id, new_status, current.get("status")
+                )
+                changes["status"] = current.get("status")
+            elif new_status in ["shipped", "delivered"] and not has_address:
+                logger.warning(
+                    "Order %s: customer has no address, keeping status %s", order_id, current.get("status")
+                )
+                changes["status"] = current.get("status")
+            return changes
+        
+        # The order, its stock movement and the totals derived from it change together
+        async with STORAGE.transaction():
+            changed = await STORAGE.orders.modify(store_id, order_id, change)
+            if changed is None:
+                return None
+            before, order = changed
+            if order.get("payment_status") == "paid" and before.get("payment_status") != "paid":
+                # Reduce inventory once, on the transition this update made
+                lines = await ProductCatalog.resolve_lines(store_id, before.get("items", []))
+                await ProductCatalog.adjust_stock(store_id, lines, floor=0)
+            await OrderService._apply_order(store_id, before, -1)
+            await OrderService._apply_order(store_id, order)
+        OrderService._forget(store_id, before, order)
+        return order
     
     @staticmethod
     async def delete_order(order_id: str, store_id: str) -> bool:
-        orders = MOCK_ORDERS_DB.get(store_id, [])
-        for i, order in enumerate(orders):
-            if order["id"] == order_id:
-                del MOCK_ORDERS_DB[store_id][i]
-                return True
-        return False
+        async with STORAGE.transaction():
+            order = await STORAGE.orders.remove(store_id, order_id)
+            if order is None:
+                return False
+            await OrderService._apply_order(store_id, order, -1)
+        OrderService._forget(store_id, order)
+        return True
+
+    @staticmethod
+    async def _apply_order(store_id: str, order: dict, sign: int = 1) -> None:
+        """Move the running totals derived from orders by one order"""
+        await OrderService._apply_orders(store_id, [order], sign)
+
+    @staticmethod
+    async def _apply_orders(store_id: str, orders: List[dict], sign: int = 1) -> None:
+        """Move the running totals derived from orders by several orders, one write per kind"""
+        await CustomerTotals.apply_orders(store_id, orders, sign)
+        await SalesRollups.apply_orders(store_id, orders, sign)
+        await ProductSales.apply_orders(store_id, orders, sign)
+
+    @staticmethod
+    def _forget(store_id: str, *orders: dict) -> None:
+        """Drop cached customers and products an order write changed, once it has committed.
+
+        The writes invalidate them too, but a read between that and the
+        commit could cache the old values again.
+        """
+        keys = {customer_cache_key(store_id, order["customer_id"]) for order in orders if order.get("customer_id")}
+        keys.update(product_cache_key(store_id, item.get("product_id"))
+                    for order in orders for item in order.get("items") or [])
+        CACHE.invalidate(*keys)
 
 
 # ============ DEBT SERVICE ============
 class DebtService:
     @staticmethod
-    async def list_debts(store_id: str, skip: int = 0, limit: int = 50) -> List[dict]:
-        debts = MOCK_DEBTS_DB.get(store_id, [])
-        return debts[skip:skip+limit]
+    async def list_debts(store_id: str, skip: int = 0, limit: int = 50,
+                         status: Optional[str] = None) -> List[dict]:
+        return await STORAGE.debts.find(store_id, skip, limit, status=status)
+    
+    @staticmethod
+    async def page_debts(store_id: str, skip: int = 0, limit: int = 50,
+                         cursor: Optional[str] = None,
+                         status: Optional[str] = None,
+                         with_total: bool = True) -> dict:
+        """Page of matching debts with their total (if asked for) and the next page's cursor"""
+        return await STORAGE.debts.paginate(store_id, skip, limit, cursor, with_total, status=status)
     
     @staticmethod
     async def get_debt(debt_id: str, store_id: str) -> Optional[dict]:
-        debts = MOCK_DEBTS_DB.get(store_id, [])
-        return next((d for d in debts if d["id"] == debt_id), None)
+        return await STORAGE.debts.get(store_id, debt_id)
     
     @staticmethod
     async def create_debt(store_id: str, data: dict) -> dict:
-        if store_id not in MOCK_DEBTS_DB:
-            MOCK_DEBTS_DB[store_id] = []
-        debt_id = f"debt_{len(MOCK_DEBTS_DB[store_id]) + 100}"
+        debt_id = f"debt_{await STORAGE.debts.reserve_sequence(store_id) + 100}"
         debt = {
             "id": debt_id,
             "store_id": store_id,
@@ -1267,62 +2116,253 @@ class DebtService:
             "status": "pending",
             "note": data.get("note", "")
         }
-        MOCK_DEBTS_DB[store_id].append(debt)
+        await STORAGE.debts.add(store_id, debt)
         return debt
     
     @staticmethod
     async def update_debt(debt_id: str, store_id: str, data: dict) -> Optional[dict]:
-        debts = MOCK_DEBTS_DB.get(store_id, [])
-        for i, debt in enumerate(debts):
-            if debt["id"] == debt_id:
-                debt.update({k: v for k, v in data.items() if k not in ["id", "store_id", "created_at"]})
-                MOCK_DEBTS_DB[store_id][i] = debt
-                return debt
-        return None
+        return await STORAGE.debts.update(
+            store_id, debt_id, {k: v for k, v in data.items() if k not in ["id", "store_id", "created_at"]}
+        )
     
     @staticmethod
     async def delete_debt(debt_id: str, store_id: str) -> bool:
-        debts = MOCK_DEBTS_DB.get(store_id, [])
-        for i, debt in enumerate(debts):
-            if debt["id"] == debt_id:
-                del MOCK_DEBTS_DB[store_id][i]
-                return True
-        return False
+        return await STORAGE.debts.remove(store_id, debt_id) is not None
 
 
 # ============ REPORT SERVICE ============
 class ReportService:
+    # Pivot dimensions as the API names them -> OrderColumns item dimensions;
+    # category regroups products through the catalog
+    PIVOT_DIMENSIONS = {
+        "product": "product",
+        "category": "product",
+        "customer": "customer",
+        "employee_id": "employee",
+        "order_type": "order_type",
+        "payment_method": "payment_method",
+        "day": "day",
+        "hour": "hour",
+        "weekday": "weekday",
+    }
+    PIVOT_MEASURES = ("revenue", "quantity", "orders")
+
     @staticmethod
     async def get_daily_report(store_id: str, date: str) -> dict:
-        orders = MOCK_ORDERS_DB.get(store_id, [])
-        daily_orders = [o for o in orders if o.get("created_at", "").startswith(date)]
-        total_revenue = sum(o.get("total", 0) for o in daily_orders if o.get("status") == "completed")
-        total_customers = len(set(o.get("customer_id") for o in daily_orders))
-        customers = MOCK_CUSTOMERS_DB.get(store_id, [])
-        total_debt = sum(c.get("debt", 0) for c in customers)
-        return {
-            "date": date,
-            "metrics": {
-                "total_revenue": total_revenue,
-                "total_orders": len(daily_orders),
-                "unique_customers": total_customers,
-                "total_debt": total_debt
+        if isinstance(date, datetime):
+            date = date.date().isoformat()
+
+        async def load():
+            metrics = await SalesRollups.get(store_id, f"day:{date}")
+            # Everything still unpaid, whenever it was ordered
+            metrics["total_debt"] = (await SalesRollups.get(store_id, "all"))["unpaid_amount"]
+            return {
+                "date": date,
+                "metrics": metrics
             }
-        }
+        return await ReportCache.get_or_load("daily", store_id, (date,), load)
     
     @staticmethod
     async def get_monthly_report(store_id: str, year: int, month: int) -> dict:
-        orders = MOCK_ORDERS_DB.get(store_id, [])
-        month_str = f"{year}-{month:02d}"
-        monthly_orders = [o for o in orders if o.get("created_at", "").startswith(month_str)]
-        total_revenue = sum(o.get("total", 0) for o in monthly_orders if o.get("status") == "completed")
-        return {
-            "year": year,
-            "month": month,
-            "metrics": {
-                "total_revenue": total_revenue,
-                "total_orders": len(monthly_orders)
+        async def load():
+            return {
+                "year": year,
+                "month": month,
+                "metrics": await SalesRollups.get(store_id, f"month:{year}-{month:02d}")
             }
+        return await ReportCache.get_or_load("monthly", store_id, (year, month), load)
+
+    @staticmethod
+    def _period(start_date: Optional[datetime], end_date: Optional[datetime]) -> tuple:
+        """[start, end) for a report period; a date-only end covers that whole day"""
+        if end_date is not None and end_date.time() == datetime.min.time():
+            end_date += timedelta(days=1)
+        return start_date, end_date
+
+    @staticmethod
+    async def get_revenue_report(store_id: str, start_date: datetime, end_date: datetime) -> dict:
+        """Revenue, cost of goods and profit over a period, with a daily breakdown"""
+        columns = await SalesAnalytics.columns(store_id)
+        start, end = ReportService._period(start_date, end_date)
+        revenue = columns.revenue(start, end)
+        # Cost at today's catalog cost, per product sold
+        sold = columns.group_items("product", "quantity", start, end, size=len(columns.products))
+        products = {p["id"]: p for p in await STORAGE.products.find(store_id)}
+        costs = np.array([(products.get(pid) or {}).get("cost", 0) or 0 for pid in columns.products.labels])
+        total_cost = float(sold @ costs) if len(sold) else 0.0
+        days, daily = columns.daily_revenue(start, end)
+        return {
+            "period": f"{start_date} to {end_date}",
+            "total_revenue": revenue,
+            "total_cost": total_cost,
+            "total_profit": revenue - total_cost,
+            "total_orders": columns.order_count_between(start, end, paid_only=True),
+            "average_order_value": columns.average_order_value(start, end),
+            "daily": [
+                {"date": str(np.datetime64(int(day), "s").astype("datetime64[D]")), "revenue": float(amount)}
+                for day, amount in zip(days, daily)
+            ],
+        }
+
+    @staticmethod
+    async def get_inventory_report(store_id: str, slow_days: int = 30, limit: int = 10) -> dict:
+        """Stock value, low stock and products without sales in the last slow_days"""
+        products = await STORAGE.products.find(store_id)
+        quantity = np.array([p.get("quantity_in_stock", 0) or 0 for p in products], dtype=np.float64)
+        cost = np.array([p.get("cost", 0) or 0 for p in products], dtype=np.float64)
+        alert = np.array([p.get("min_quantity_alert", 0) or 0 for p in products], dtype=np.float64)
+        columns = await SalesAnalytics.columns(store_id)
+        sold = columns.group_items(
+            "product", "quantity", datetime.now() - timedelta(days=slow_days), size=len(columns.products)
+        )
+        # Products never sold get code -1, which reads the appended zero
+        codes = np.array([columns.products.codes.get(p["id"], -1) for p in products], dtype=np.int64)
+        recent = np.append(sold, 0.0)[codes]
+        slow = np.flatnonzero(recent == 0)
+        # Most stock tied up first
+        slow = slow[np.argsort(-(quantity[slow] * cost[slow]), kind="stable")][:limit]
+        return {
+            "total_items": len(products),
+            "total_quantity": float(quantity.sum()),
+            "total_value": float(quantity @ cost),
+            "low_stock_count": int((quantity <= alert).sum()),
+            "slow_moving": [
+                {"product_id": products[i]["id"], "name": products[i].get("name"),
+                 "quantity_in_stock": float(quantity[i])}
+                for i in slow
+            ],
+        }
+
+    @staticmethod
+    async def get_customer_report(store_id: str, top: int = 5) -> dict:
+        """Customer counts, repeat buyers and the top spenders"""
+        columns = await SalesAnalytics.columns(store_id)
+        size = len(columns.customers)
+        spend = columns.group_orders("customer", "total", size=size)
+        orders = columns.group_orders("customer", None, paid_only=False, size=size)
+        known = np.array([label is not None for label in columns.customers.labels], dtype=bool)
+        spend, orders = spend * known, orders * known
+        ranked = np.argsort(-spend, kind="stable")[:top]
+        month = datetime.now().strftime("%Y-%m")
+        customers = await STORAGE.customers.find(store_id)
+        buyers = int((orders > 0).sum())
+        repeat = int((orders > 1).sum())
+        return {
+            "total_customers": len(customers),
+            "new_customers_this_month": sum(1 for c in customers if str(c.get("created_at", "")).startswith(month)),
+            "buying_customers": buyers,
+            "repeat_customers": repeat,
+            "repeat_rate": repeat / buyers if buyers else 0.0,
+            "top_customers": [
+                {"customer_id": columns.customers.labels[i], "total_spent": float(spend[i]),
+                 "orders": int(orders[i])}
+                for i in ranked if spend[i] > 0
+            ],
+        }
+
+    @staticmethod
+    async def get_analytics(store_id: str) -> dict:
+        """Dashboard totals: paid revenue and orders, customers and debt"""
+        columns = await SalesAnalytics.columns(store_id)
+        return {
+            "total_revenue": columns.revenue(),
+            "total_orders": columns.order_count_between(paid_only=True),
+            "total_customers": await STORAGE.customers.count(store_id),
+            "outstanding_debt": (await SalesRollups.get(store_id, "all"))["unpaid_amount"],
+            "average_order_value": columns.average_order_value(),
+        }
+
+    @staticmethod
+    async def get_pivot(store_id: str, rows: str, cols: Optional[str] = None, measure: str = "revenue",
+                        start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                        paid_only: bool = True) -> dict:
+        """Order items aggregated by one or two dimensions, as a matrix.
+
+        revenue sums item subtotals (before order discounts), quantity sums
+        item quantities and orders counts the distinct orders in each cell.
+        Rows and columns without items are left out; calendar dimensions
+        keep their natural order, the others are sorted by label.
+        """
+        for name in (rows, cols):
+            if name is not None and name not in ReportService.PIVOT_DIMENSIONS:
+                raise ValueError(f"Unknown dimension: {name}")
+        if measure not in ReportService.PIVOT_MEASURES:
+            raise ValueError(f"Unknown measure: {measure}")
+        columns = await SalesAnalytics.columns(store_id)
+        items = columns.item_selection(*ReportService._period(start_date, end_date), paid_only)
+        row_codes, row_labels = await ReportService._pivot_dimension(store_id, columns, rows, items)
+        if cols is None:
+            col_codes, col_labels = np.zeros(len(items), dtype=np.int64), [measure]
+        else:
+            col_codes, col_labels = await ReportService._pivot_dimension(store_id, columns, cols, items)
+        shape = (row_codes, len(row_labels), col_codes, len(col_labels))
+        if measure == "orders":
+            orders = columns.item_column("order")[items]
+            table = cross_tab(*shape, groups=orders)
+            total = len(np.unique(orders))
+        else:
+            weights = columns.item_column("amount" if measure == "revenue" else "quantity")[items]
+            table = cross_tab(*shape, weights=weights)
+            total = float(weights.sum())
+        counts = cross_tab(*shape)
+        row_order = ReportService._pivot_order(rows, row_labels, counts.sum(axis=1))
+        col_order = ReportService._pivot_order(cols, col_labels, counts.sum(axis=0))
+        return {
+            "rows": rows,
+            "cols": cols,
+            "measure": measure,
+            "row_labels": [row_labels[i] for i in row_order],
+            "col_labels": [col_labels[i] for i in col_order],
+            "values": table[np.ix_(row_order, col_order)].tolist(),
+            "total": total,
+        }
+
+    @staticmethod
+    async def _pivot_dimension(store_id: str, columns: OrderColumns, name: str, items) -> tuple:
+        """(code per item, labels) of a pivot dimension"""
+        codes, labels = columns.item_dimension(ReportService.PIVOT_DIMENSIONS[name], items)
+        if name == "category":
+            # Regroup product codes by the catalog's current categories
+            categories = {p["id"]: p.get("category") for p in await STORAGE.products.find(store_id)}
+            dictionary = Dictionary()
+            mapping = np.array([dictionary.code(categories.get(pid)) for pid in labels], dtype=np.int32)
+            codes, labels = mapping[codes], dictionary.labels
+        return codes, labels
+
+    @staticmethod
+    def _pivot_order(name: Optional[str], labels: list, counts) -> list:
+        """Positions of the non-empty labels, in display order"""
+        keep = np.flatnonzero(counts).tolist()
+        if ReportService.PIVOT_DIMENSIONS.get(name) in TIME_DIMENSIONS:
+            return keep
+        return sorted(keep, key=lambda i: (labels[i] is None, str(labels[i])))
+
+    @staticmethod
+    async def get_top_products(store_id: str, start: Optional[date] = None, end: Optional[date] = None,
+                               by: str = "quantity", limit: int = 10, approximate: bool = False) -> dict:
+        """Best-selling products of the days start..end (all time without them)"""
+        if by not in ProductSales.FIELDS:
+            raise ValueError(f"Unknown ranking: {by}")
+        buckets = ProductSales.period_buckets(start, end)
+        ranked = await ProductSales.top(store_id, buckets, by, limit, approximate)
+        for entry in ranked:
+            product = await STORAGE.products.get(store_id, entry["product_id"]) or {}
+            entry["name"] = product.get("name")
+        return {
+            "start": start.isoformat() if start else None,
+            "end": end.isoformat() if end else None,
+            "by": by,
+            "approximate": approximate,
+            "products": ranked,
+        }
+
+    @staticmethod
+    async def rebuild_rollups(store_id: str) -> dict:
+        """Regenerate the sales rollups and product counters from the store's orders"""
+        return {
+            "store_id": store_id,
+            "buckets": await SalesRollups.rebuild(store_id),
+            "product_buckets": await ProductSales.rebuild(store_id),
         }
 
 
@@ -1389,15 +2429,9 @@ class DraftOrderService:
 
 # ============ ACCOUNTING / BOOKKEEPING (TT88-lite) ============
 class AccountingService:
-    @staticmethod
-    def _ensure_store(store_id: str):
-        if store_id not in MOCK_JOURNAL_DB:
-            MOCK_JOURNAL_DB[store_id] = []
-
     @staticmethod
     async def add_journal_entry(store_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        AccountingService._ensure_store(store_id)
-        entry_id = f"entry_{len(MOCK_JOURNAL_DB[store_id]) + 1:05d}"
+        entry_id = f"entry_{await STORAGE.journal.reserve_sequence(store_id) + 1:05d}"
         debit = float(data.get("debit_amount", 0) or 0)
         credit = float(data.get("credit_amount", 0) or 0)
 
@@ -1412,12 +2446,13 @@ class AccountingService:
             "reference_doc": data.get("reference_doc", ""),
             "created_at": datetime.now().isoformat(),
         }
-        MOCK_JOURNAL_DB[store_id].insert(0, entry)
+        await STORAGE.journal.add(store_id, entry)
         return entry
 
     @staticmethod
     async def list_journal_entries(store_id: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
-        entries = MOCK_JOURNAL_DB.get(store_id, [])
+        # Newest first
+        entries = (await STORAGE.journal.find(store_id))[::-1]
         if not start_date and not end_date:
             return entries
 
@@ -1433,7 +2468,13 @@ class AccountingService:
 
     @staticmethod
     async def ledger_summary(store_id: str) -> List[Dict[str, Any]]:
-        entries = MOCK_JOURNAL_DB.get(store_id, [])
+        return await ReportCache.get_or_load(
+            "ledger", store_id, (), lambda: AccountingService._ledger_summary(store_id)
+        )
+
+    @staticmethod
+    async def _ledger_summary(store_id: str) -> List[Dict[str, Any]]:
+        entries = await STORAGE.journal.find(store_id)
         accounts: Dict[str, Dict[str, Any]] = {
             code: {
                 "account_code": code,
@@ -1459,6 +2500,14 @@ class AccountingService:
 
     @staticmethod
     async def accounting_report(store_id: str, start_date: Optional[str], end_date: Optional[str]) -> Dict[str, Any]:
+        return await ReportCache.get_or_load(
+            "accounting", store_id, (start_date, end_date),
+            lambda: AccountingService._accounting_report(store_id, start_date, end_date)
+        )
+
+    @staticmethod
+    async def _accounting_report(store_id: str, start_date: Optional[str],
+                                 end_date: Optional[str]) -> Dict[str, Any]:
         entries = await AccountingService.list_journal_entries(store_id, start_date, end_date)
         total_debits = sum(float(e.get("debit_amount", 0) or 0) for e in entries)
         total_credits = sum(float(e.get("credit_amount", 0) or 0) for e in entries)
@@ -1476,4 +2525,24 @@ class AccountingService:
             "total_credits": total_credits,
             "profit_loss": revenue - cogs,
             "entries_count": len(entries),
-        }
\ No newline at end of file
+        }
+
+
+async def seed_storage() -> None:
+    """Copy the demo data into a shared backend that has no users yet"""
+    if STORAGE is DEMO_DATA or await STORAGE.users.get("admin@bizflow.com") is not None:
+        return
+    for name in ("products", "customers", "orders", "debts", "journal", "customer_totals", "sales_rollups",
+                 "product_sales"):
+        for store_id, records in getattr(DEMO_DATA, name).stores.items():
+            await getattr(STORAGE, name).replace(store_id, records)
+    # Users last, so a start interrupted midway seeds again
+    for user in MOCK_USERS_DB.values():
+        await STORAGE.users.add(dict(user))
+
+
+# Seed running totals and rollups for the demo stores
+for _store_id, _orders in MOCK_ORDERS_DB.items():
+    CUSTOMER_TOTALS[_store_id] = CustomerTotals.records(CustomerTotals.tally(_orders))
+    SALES_ROLLUPS[_store_id] = SalesRollups.records(SalesRollups.tally(_orders))
+    PRODUCT_SALES[_store_id] = ProductSales.records(ProductSales.tally(_orders))
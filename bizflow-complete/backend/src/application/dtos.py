@@ -128,6 +128,14 @@ class OrderCreateRequest(BaseModel):
     notes: Optional[str] = None
 
 
+class BatchOrderItem(OrderCreateRequest):
+    client_ref: Optional[str] = None
+
+
+class OrderBatchRequest(BaseModel):
+    orders: List[BatchOrderItem] = Field(..., min_length=1, max_length=500)
+
+
 class OrderResponse(BaseModel):
     id: str
     order_number: str
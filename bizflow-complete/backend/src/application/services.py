@@ -1,4 +1,5 @@
 """Application Layer - Business Logic Services"""
+import heapq
 from typing import Optional, List
 from datetime import datetime
 from ..domain.entities import Order, OrderStatus, Debt, Customer
@@ -96,21 +97,23 @@ class ReportService:
             'average_order_value': avg_order
         }
     
-    async def get_top_sellers(self, orders: List[Order]) -> List[dict]:
-        """Get top-selling products"""
+    async def get_top_sellers(self, orders: List[Order], limit: int = 10) -> List[dict]:
+        """Get top-selling products by revenue"""
         product_sales = {}
         for order in orders:
             for item in order.items:
-                if item['product_id'] not in product_sales:
-                    product_sales[item['product_id']] = {
-                        'name': item['product_name'],
-                        'quantity': 0,
-                        'revenue': 0
-                    }
-                product_sales[item['product_id']]['quantity'] += item['quantity']
-                product_sales[item['product_id']]['revenue'] += item['subtotal']
+                # Items are OrderItem entities, or dicts from create_order above
+                fields = item if isinstance(item, dict) else vars(item)
+                sales = product_sales.setdefault(fields['product_id'], {
+                    'name': fields['product_name'],
+                    'quantity': 0,
+                    'revenue': 0
+                })
+                sales['quantity'] += fields['quantity']
+                sales['revenue'] += fields['subtotal']
         
-        return sorted(product_sales.values(), key=lambda x: x['revenue'], reverse=True)[:10]
+        # A heap picks the top few without sorting every product
+        return heapq.nlargest(limit, product_sales.values(), key=lambda x: x['revenue'])
 
 
 class AIOrderService:
@@ -1,5 +1,5 @@
 """Customer Use Cases"""
-from typing import List
+from typing import List, Optional, Tuple
 from datetime import datetime
 from ...domain.entities import Customer
 from ...domain.repositories import ICustomerRepository
@@ -96,6 +96,19 @@ class GetCustomersUseCase:
         """Get all customers by business"""
         return await self.customer_repo.get_all_by_business(business_id, skip, limit)
 
+    async def get_page(
+        self,
+        business_id: str,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Customer], Optional[str]]:
+        """Get a keyset page of customers and the next page's cursor"""
+        return await self.customer_repo.get_page_by_business(business_id, limit, cursor)
+
+    async def count(self, business_id: str) -> int:
+        """Count customers by business"""
+        return await self.customer_repo.count_by_business(business_id)
+
     async def search(
         self,
         business_id: str,
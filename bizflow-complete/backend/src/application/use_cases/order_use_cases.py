@@ -1,8 +1,9 @@
 """Order Use Cases"""
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from ...domain.entities import Order, OrderItem, OrderStatus
-from ...domain.repositories import IOrderRepository, IProductRepository
+from ...domain.repositories import IOrderRepository, IProductRepository, IInventoryRepository
 
 
 class CreateOrderUseCase:
@@ -12,9 +13,11 @@ class CreateOrderUseCase:
         self,
         order_repository: IOrderRepository,
         product_repository: IProductRepository,
+        inventory_repository: IInventoryRepository,
     ):
         self.order_repo = order_repository
         self.product_repo = product_repository
+        self.inventory_repo = inventory_repository
 
     async def execute(
         self,
@@ -30,6 +33,7 @@ class CreateOrderUseCase:
         # Validate items and calculate total
         order_items = []
         total_amount = 0.0
+        quantities = defaultdict(float)
 
         for item_data in items:
             product = await self.product_repo.get_by_id(item_data["product_id"])
@@ -37,6 +41,7 @@ class CreateOrderUseCase:
                 raise ValueError(f"Product not found: {item_data['product_id']}")
 
             quantity = item_data["quantity"]
+            quantities[product.id] += quantity
             unit_price = item_data.get("unit_price", product.price)
             subtotal = quantity * unit_price
 
@@ -66,6 +71,10 @@ class CreateOrderUseCase:
             notes=notes,
         )
 
+        # Take the stock in one conditional UPDATE, so concurrent orders
+        # can't both sell the last units; raises if any line is short
+        await self.inventory_repo.decrement_stock_bulk(business_id, quantities)
+
         # Save to repository
         saved_order = await self.order_repo.create(order)
         return saved_order
@@ -107,6 +116,19 @@ class GetOrdersUseCase:
         """Get all orders by business"""
         return await self.order_repo.get_all_by_business(business_id, skip, limit)
 
+    async def get_page(
+        self,
+        business_id: str,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Order], Optional[str]]:
+        """Get a keyset page of orders and the next page's cursor"""
+        return await self.order_repo.get_page_by_business(business_id, limit, cursor)
+
+    async def count(self, business_id: str) -> int:
+        """Count orders by business"""
+        return await self.order_repo.count_by_business(business_id)
+
     async def get_by_status(
         self,
         business_id: str,
@@ -1,5 +1,5 @@
 """Product Use Cases"""
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from ...domain.entities import Product
 from ...domain.repositories import IProductRepository
 
@@ -64,6 +64,19 @@ class GetProductsUseCase:
         """Get all products by business"""
         return await self.product_repo.get_all_by_business(business_id, skip, limit)
 
+    async def get_page(
+        self,
+        business_id: str,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Product], Optional[str]]:
+        """Get a keyset page of products and the next page's cursor"""
+        return await self.product_repo.get_page_by_business(business_id, limit, cursor)
+
+    async def count(self, business_id: str) -> int:
+        """Count products by business"""
+        return await self.product_repo.count_by_business(business_id)
+
     async def get_by_category(
         self,
         business_id: str,
@@ -2,16 +2,17 @@
 import secrets
 from typing import Optional, Tuple
 from datetime import datetime, timedelta
-import hashlib
 from ...domain.entities import User, UserRole
 from ...domain.repositories import IUserRepository
+from ...infrastructure.passwords import PASSWORD_HASHER, PasswordHasher
 
 
 class LoginUseCase:
     """User login use case"""
 
-    def __init__(self, user_repository: IUserRepository):
+    def __init__(self, user_repository: IUserRepository, password_hasher: PasswordHasher = PASSWORD_HASHER):
         self.user_repo = user_repository
+        self.passwords = password_hasher
 
     async def execute(self, email: str, password: str) -> Tuple[User, str]:
         """Login user and return user + token"""
@@ -23,7 +24,7 @@ class LoginUseCase:
                 user = User(
                     id=secrets.token_urlsafe(16),
                     email=email,
-                    password_hash=self._hash_password(password),
+                    password_hash=await self.passwords.hash(password),
                     full_name="Admin User",
                     username="admin",
                     business_id=secrets.token_urlsafe(16),
@@ -36,10 +37,13 @@ class LoginUseCase:
             else:
                 raise ValueError("Invalid credentials")
 
-        # Verify password (simple hash comparison)
-        password_hash = self._hash_password(password)
-        if user.password_hash != password_hash:
+        # Verify password off the event loop; legacy SHA-256 hashes are
+        # upgraded to bcrypt on the way
+        matches, new_hash = await self.passwords.verify(password, user.password_hash)
+        if not matches:
             raise ValueError("Invalid credentials")
+        if new_hash:
+            user.password_hash = new_hash
 
         # Generate token
         token = self._generate_token()
@@ -50,11 +54,6 @@ class LoginUseCase:
 
         return user, token
 
-    @staticmethod
-    def _hash_password(password: str) -> str:
-        """Simple password hashing"""
-        return hashlib.sha256(password.encode()).hexdigest()
-
     @staticmethod
     def _generate_token() -> str:
         """Generate token"""
@@ -64,8 +63,9 @@ class LoginUseCase:
 class RegisterUseCase:
     """User registration use case"""
 
-    def __init__(self, user_repository: IUserRepository):
+    def __init__(self, user_repository: IUserRepository, password_hasher: PasswordHasher = PASSWORD_HASHER):
         self.user_repo = user_repository
+        self.passwords = password_hasher
 
     async def execute(
         self,
@@ -89,7 +89,7 @@ class RegisterUseCase:
         # Create user
         user = User(
             email=email,
-            password_hash=self._hash_password(password),
+            password_hash=await self.passwords.hash(password),
             full_name=full_name,
             business_id=business_id,
             username=username or email.split("@")[0],
@@ -97,8 +97,3 @@ class RegisterUseCase:
         )
 
         return await self.user_repo.create(user)
-
-    @staticmethod
-    def _hash_password(password: str) -> str:
-        """Simple password hashing"""
-        return hashlib.sha256(password.encode()).hexdigest()
@@ -44,6 +44,18 @@ class ICustomerRepository(ABC):
         """Get all customers by business"""
         pass
 
+    @abstractmethod
+    async def get_page_by_business(
+        self, business_id: str, limit: int = 100, cursor: Optional[str] = None
+    ) -> tuple[list[Customer], Optional[str]]:
+        """Get a keyset page of customers by business and the next page's cursor"""
+        pass
+
+    @abstractmethod
+    async def count_by_business(self, business_id: str) -> int:
+        """Count customers by business"""
+        pass
+
     @abstractmethod
     async def search(
         self, business_id: str, query: str, skip: int = 0, limit: int = 100
@@ -44,6 +44,18 @@ class IDebtRepository(ABC):
         """Get all debts by business"""
         pass
 
+    @abstractmethod
+    async def get_page_by_business(
+        self, business_id: str, limit: int = 100, cursor: Optional[str] = None
+    ) -> tuple[list[Debt], Optional[str]]:
+        """Get a keyset page of debts by business and the next page's cursor"""
+        pass
+
+    @abstractmethod
+    async def count_by_business(self, business_id: str) -> int:
+        """Count debts by business"""
+        pass
+
     @abstractmethod
     async def get_unpaid_by_business(self, business_id: str) -> list[Debt]:
         """Get all unpaid debts by business"""
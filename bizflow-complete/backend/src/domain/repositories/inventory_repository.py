@@ -1,6 +1,6 @@
 """Inventory Repository Interface"""
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Mapping, Optional
 from ..entities import Inventory
 
 
@@ -49,6 +49,16 @@ class IInventoryRepository(ABC):
         """Update inventory quantity"""
         pass
 
+    @abstractmethod
+    async def decrement_stock(self, business_id: str, product_id: str, quantity: float) -> Inventory:
+        """Atomically take quantity out of stock; raise if not enough is available"""
+        pass
+
+    @abstractmethod
+    async def decrement_stock_bulk(self, business_id: str, lines: Mapping[str, float]) -> list[Inventory]:
+        """Atomically take all order lines (product_id -> quantity) out of stock, or none"""
+        pass
+
     @abstractmethod
     async def get_total_stock_value(self, business_id: str) -> float:
         """Calculate total stock value"""
@@ -35,6 +35,18 @@ class IOrderRepository(ABC):
         """Get all orders by business"""
         pass
 
+    @abstractmethod
+    async def get_page_by_business(
+        self, business_id: str, limit: int = 100, cursor: Optional[str] = None
+    ) -> tuple[list[Order], Optional[str]]:
+        """Get a keyset page of orders by business and the next page's cursor"""
+        pass
+
+    @abstractmethod
+    async def count_by_business(self, business_id: str) -> int:
+        """Count orders by business"""
+        pass
+
     @abstractmethod
     async def get_by_status(
         self, business_id: str, status: str, skip: int = 0, limit: int = 100
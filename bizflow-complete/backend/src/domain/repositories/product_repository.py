@@ -39,6 +39,18 @@ class IProductRepository(ABC):
         """Get all products by business"""
         pass
 
+    @abstractmethod
+    async def get_page_by_business(
+        self, business_id: str, limit: int = 100, cursor: Optional[str] = None
+    ) -> tuple[list[Product], Optional[str]]:
+        """Get a keyset page of products by business and the next page's cursor"""
+        pass
+
+    @abstractmethod
+    async def count_by_business(self, business_id: str) -> int:
+        """Count products by business"""
+        pass
+
     @abstractmethod
     async def get_by_category(
         self, business_id: str, category: str, skip: int = 0, limit: int = 100
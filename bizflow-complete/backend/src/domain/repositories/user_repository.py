@@ -41,3 +41,15 @@ class IUserRepository(ABC):
     async def get_all(self, business_id: str, skip: int = 0, limit: int = 100) -> list[User]:
         """Get all users by business"""
         pass
+
+    @abstractmethod
+    async def get_page_by_business(
+        self, business_id: str, limit: int = 100, cursor: Optional[str] = None
+    ) -> tuple[list[User], Optional[str]]:
+        """Get a keyset page of users by business and the next page's cursor"""
+        pass
+
+    @abstractmethod
+    async def count_by_business(self, business_id: str) -> int:
+        """Count users by business"""
+        pass
@@ -0,0 +1,244 @@
+"""Two-tier read cache: an in-process LRU with TTL, plus Redis when configured"""
+import asyncio
+import json
+import logging
+import os
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - Redis tier is optional
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "")
+# Upper bound on staleness if an invalidation message is lost
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+# Entries kept in each worker's local tier
+CACHE_LOCAL_SIZE = int(os.getenv("CACHE_LOCAL_SIZE", "10000"))
+# Report results kept per worker (see ReportCache in the services)
+REPORT_CACHE_SIZE = int(os.getenv("REPORT_CACHE_SIZE", "1024"))
+CACHE_KEY_PREFIX = "bizflow:cache:"
+CACHE_INVALIDATION_CHANNEL = "bizflow:cache:invalidate"
+
+# Returned by get() on a miss; None is a value callers may want to tell apart
+MISSING = object()
+
+
+class LocalCache:
+    """Bounded LRU of key -> value, each entry expiring after its TTL (maxsize=0 keeps nothing)"""
+
+    def __init__(self, maxsize: int = CACHE_LOCAL_SIZE, ttl: float = CACHE_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        # key -> (expires_at, value), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self._clock():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._entries[key] = (self._clock() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class TieredCache:
+    """Cache-aside reads through a local tier and an optional Redis tier.
+
+    Reads try the worker's own LocalCache, then Redis, then the loader,
+    filling the tiers on the way back. Writes call invalidate(): the keys
+    are dropped locally at once, then deleted from Redis and announced on
+    a pub/sub channel so every other worker drops its local copy too.
+    Values in Redis are JSON, so only JSON-ready values should be cached.
+
+    Redis failures never fail a read: the cache logs them and carries on
+    with the local tier, and the TTL bounds how stale a worker can get if
+    an invalidation is missed.
+
+    A load that a write invalidates while it runs may have read the old
+    data, so its value is returned to its caller but not cached.
+    """
+
+    def __init__(self, local: Optional[LocalCache] = None, redis: Any = None,
+                 ttl: float = CACHE_TTL_SECONDS, prefix: str = CACHE_KEY_PREFIX,
+                 channel: str = CACHE_INVALIDATION_CHANNEL):
+        self.local = local if local is not None else LocalCache(ttl=ttl)
+        self.redis = redis
+        self.ttl = ttl
+        self.prefix = prefix
+        self.channel = channel
+        # Tags our own invalidation messages so the listener can skip them
+        self.node_id = secrets.token_hex(8)
+        self._listener: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
+        # key -> tickets of the loads in flight for it; invalidate() drops them
+        self._loads: Dict[str, Set[object]] = {}
+
+    async def get(self, key: str) -> Any:
+        value = self.local.get(key)
+        if value is not MISSING or self.redis is None:
+            return value
+        try:
+            raw = await self.redis.get(self.prefix + key)
+        except Exception as e:
+            logger.warning("Redis get failed for %s: %s", key, e)
+            return MISSING
+        if raw is None:
+            return MISSING
+        value = json.loads(raw)
+        self.local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        self.local.set(key, value, ttl)
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(self.prefix + key, json.dumps(value, default=str), ex=max(1, int(ttl)))
+        except Exception as e:
+            logger.warning("Redis set failed for %s: %s", key, e)
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]],
+                          ttl: Optional[float] = None) -> Any:
+        """Cached value of key, calling loader on a miss; None is not cached"""
+        value = await self.get(key)
+        if value is not MISSING:
+            return value
+        ticket = object()
+        self._loads.setdefault(key, set()).add(ticket)
+        try:
+            value = await loader()
+        finally:
+            tickets = self._loads.get(key)
+            current = tickets is not None and ticket in tickets
+            if current:
+                tickets.discard(ticket)
+                if not tickets:
+                    del self._loads[key]
+        if value is not None and current:
+            await self.set(key, value, ttl)
+        return value
+
+    def invalidate(self, *keys: str) -> None:
+        """Drop keys here now and, with Redis, everywhere else shortly after.
+
+        Synchronous so write paths that aren't coroutines can call it; the
+        Redis round trips run as a task on the running loop.
+        """
+        if not keys:
+            return
+        self._drop(keys)
+        if self.redis is None:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(self._invalidate_remote(keys))
+        except RuntimeError:
+            # No loop (import-time seeding): nothing remote to reach yet
+            return
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def flush(self) -> None:
+        """Wait for scheduled Redis invalidations to finish"""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    def clear(self) -> None:
+        """Empty the local tier"""
+        self.local.clear()
+
+    async def start(self) -> None:
+        """Listen for other workers' invalidations (no-op without Redis)"""
+        if self.redis is None or self._listener is not None:
+            return
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(self.channel)
+        self._listener = asyncio.get_running_loop().create_task(self._listen(pubsub))
+
+    async def close(self) -> None:
+        await self.flush()
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self.redis is not None:
+            await self.redis.aclose()
+
+    def _drop(self, keys: Iterable[str]) -> None:
+        """Forget keys locally, including any load of them still in flight"""
+        for key in keys:
+            self.local.delete(key)
+            self._loads.pop(key, None)
+
+    async def _invalidate_remote(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        try:
+            await self.redis.delete(*[self.prefix + key for key in keys])
+            await self.redis.publish(self.channel, json.dumps({"node": self.node_id, "keys": keys}))
+        except Exception as e:
+            logger.warning("Redis invalidation failed for %s: %s", keys, e)
+
+    async def _listen(self, pubsub) -> None:
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    data: Dict[str, Any] = json.loads(message["data"])
+                except (TypeError, ValueError):
+                    continue
+                if data.get("node") != self.node_id:
+                    self._drop(data.get("keys", []))
+        finally:
+            await pubsub.unsubscribe(self.channel)
+            await pubsub.aclose()
+
+
+def build_cache(redis_url: str = REDIS_URL, shared: bool = False) -> TieredCache:
+    """TieredCache with a Redis tier when redis_url is set and redis is installed.
+
+    shared says other workers write the same records (a shared storage
+    backend). Their writes only reach this worker's local tier through
+    Redis, so without a Redis tier nothing is cached rather than serving
+    another worker's overwritten values until the TTL runs out.
+    """
+    if redis_url and aioredis is None:
+        logger.warning("REDIS_URL is set but the redis package is not installed")
+    if redis_url and aioredis is not None:
+        return TieredCache(redis=aioredis.from_url(redis_url))
+    if shared:
+        logger.warning("Storage is shared between workers but no Redis cache is configured; reads are not cached")
+        return TieredCache(local=LocalCache(maxsize=0))
+    return TieredCache()
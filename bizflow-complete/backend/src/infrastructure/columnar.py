@@ -0,0 +1,307 @@
+"""Columnar (NumPy) projection of orders and their line items for analytics.
+
+Orders and items are held as parallel arrays: timestamps as epoch
+seconds, money as float64, and products, customers, employees, order
+types and payment methods as integer codes into per-projection
+dictionaries. Range sums, averages and group-bys are then slices,
+boolean masks and ``np.bincount`` calls instead of Python loops over
+order dicts.
+"""
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+TimeBound = Union[None, int, str, date, datetime]
+
+SECONDS_PER_DAY = 86400
+
+
+def to_seconds(value: TimeBound) -> Optional[int]:
+    """Epoch seconds of a bound; naive datetimes and dates are read as UTC.
+
+    Stored timestamps are treated the same way, so a day bound always
+    lines up with the YYYY-MM-DD prefix of created_at.
+    """
+    if value is None or isinstance(value, (int, np.integer)):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def parse_timestamps(values: Sequence[Optional[str]]) -> np.ndarray:
+    """ISO created_at strings to epoch seconds; missing ones sort first"""
+    stamps = np.array([value[:26] if value else "NaT" for value in values], dtype="datetime64[us]")
+    return stamps.astype("datetime64[s]").astype(np.int64)
+
+
+class Dictionary:
+    """Integer codes for the distinct values of a column, in first-seen order"""
+
+    def __init__(self):
+        self.codes: Dict[Any, int] = {}
+        self.labels: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def code(self, value: Any) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.labels)
+            self.labels.append(value)
+        return code
+
+    def encode(self, values: Iterable[Any]) -> np.ndarray:
+        return np.fromiter((self.code(value) for value in values), dtype=np.int32)
+
+
+class Column:
+    """Append-only array with amortized O(1) growth"""
+
+    def __init__(self, dtype, capacity: int = 1024):
+        self._data = np.empty(capacity, dtype=dtype)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._data[:self._size]
+
+    def extend(self, values: np.ndarray) -> None:
+        end = self._size + len(values)
+        if end > len(self._data):
+            grown = np.empty(max(end, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:self._size] = self.values
+            self._data = grown
+        self._data[self._size:end] = values
+        self._size = end
+
+
+def cross_tab(row_codes: np.ndarray, n_rows: int, col_codes: np.ndarray, n_cols: int,
+              weights: Optional[np.ndarray] = None, groups: Optional[np.ndarray] = None) -> np.ndarray:
+    """n_rows x n_cols table of summed weights (counts when weights is None).
+
+    Each (row, col) pair is folded into one code, row * n_cols + col, and
+    tallied with a single bincount. With groups (e.g. order rows) a cell
+    counts the distinct groups in it instead: the (cell, group) keys are
+    deduplicated by sorting first.
+    """
+    cells = row_codes.astype(np.int64) * n_cols + col_codes
+    if groups is not None:
+        span = int(groups.max()) + 1 if len(groups) else 1
+        cells = np.unique(cells * span + groups) // span
+        weights = None
+    return np.bincount(cells, weights=weights, minlength=n_rows * n_cols).reshape(n_rows, n_cols)
+
+
+# Per-order columns and their dtypes
+ORDER_COLUMNS = {
+    "created": np.int64,
+    "total": np.float64,
+    "discount": np.float64,
+    "paid": np.bool_,
+    "active": np.bool_,
+    "customer": np.int32,
+    "employee": np.int32,
+    "order_type": np.int32,
+    "payment_method": np.int32,
+}
+# Per-item columns; "order" is the row of the item's order
+ITEM_COLUMNS = {
+    "order": np.int64,
+    "product": np.int32,
+    "quantity": np.float64,
+    "amount": np.float64,
+}
+# Dimensions an item can be grouped by: its own and its order's codes, and
+# calendar parts of the order's created_at (weekday 0 is Monday)
+ORDER_DIMENSIONS = {
+    "customer": "customers",
+    "employee": "employees",
+    "order_type": "order_types",
+    "payment_method": "payment_methods",
+}
+TIME_DIMENSIONS = ("day", "hour", "weekday")
+ITEM_DIMENSIONS = ("product", *ORDER_DIMENSIONS, *TIME_DIMENSIONS)
+
+
+class OrderColumns:
+    """Append-only columnar projection of one store's orders and line items.
+
+    Append orders in chunks (``append`` for order dicts, ``extend`` for
+    ready-made arrays); every query runs vectorized over all of them.
+    Windows are half-open [start, end) on created_at; while orders arrive
+    in created_at order (the usual case) a window is a binary search and a
+    slice, otherwise a mask. Cancelled orders are kept but never counted.
+    """
+
+    def __init__(self):
+        self.products = Dictionary()
+        self.customers = Dictionary()
+        self.employees = Dictionary()
+        self.order_types = Dictionary()
+        self.payment_methods = Dictionary()
+        self.orders = {name: Column(dtype) for name, dtype in ORDER_COLUMNS.items()}
+        self.items = {name: Column(dtype) for name, dtype in ITEM_COLUMNS.items()}
+        self._sorted = True
+
+    @property
+    def order_count(self) -> int:
+        return len(self.orders["created"])
+
+    @property
+    def item_count(self) -> int:
+        return len(self.items["order"])
+
+    def order_column(self, name: str) -> np.ndarray:
+        return self.orders[name].values
+
+    def item_column(self, name: str) -> np.ndarray:
+        return self.items[name].values
+
+    def append(self, orders: Sequence[dict]) -> None:
+        """Project a chunk of order records (as the services store them)"""
+        order_arrays = {
+            "created": parse_timestamps([o.get("created_at") for o in orders]),
+            "total": np.fromiter((o.get("total_amount") or 0 for o in orders), np.float64, len(orders)),
+            "discount": np.fromiter((o.get("discount") or 0 for o in orders), np.float64, len(orders)),
+            "paid": np.fromiter((o.get("payment_status") == "paid" for o in orders), np.bool_, len(orders)),
+            "active": np.fromiter((o.get("status") != "cancelled" for o in orders), np.bool_, len(orders)),
+            "customer": self.customers.encode(o.get("customer_id") for o in orders),
+            "employee": self.employees.encode(o.get("employee_id") for o in orders),
+            "order_type": self.order_types.encode(o.get("order_type") for o in orders),
+            "payment_method": self.payment_methods.encode(o.get("payment_method") for o in orders),
+        }
+        items = [(row, item) for row, order in enumerate(orders) for item in order.get("items") or ()]
+        item_arrays = {
+            "order": np.fromiter((row for row, _ in items), np.int64, len(items)),
+            "product": self.products.encode(item.get("product_id") for _, item in items),
+            "quantity": np.fromiter((item.get("quantity") or 0 for _, item in items), np.float64, len(items)),
+            "amount": np.fromiter((item.get("subtotal") or 0 for _, item in items), np.float64, len(items)),
+        }
+        self.extend(order_arrays, item_arrays)
+
+    def extend(self, order_arrays: Dict[str, np.ndarray], item_arrays: Dict[str, np.ndarray]) -> None:
+        """Append a chunk given as arrays.
+
+        Codes must come from this projection's dictionaries; item "order"
+        values are rows within the chunk and are shifted into place here.
+        """
+        created = order_arrays["created"]
+        if len(created):
+            previous = self.order_column("created")
+            if (len(previous) and created[0] < previous[-1]) or np.any(created[1:] < created[:-1]):
+                self._sorted = False
+        item_arrays = {**item_arrays, "order": item_arrays["order"] + self.order_count}
+        for name, column in self.orders.items():
+            column.extend(order_arrays[name])
+        for name, column in self.items.items():
+            column.extend(item_arrays[name])
+
+    # ---- windows
+
+    def window(self, start: TimeBound = None, end: TimeBound = None,
+               paid_only: bool = False) -> Tuple[slice, np.ndarray]:
+        """Order rows in [start, end) as (slice, mask within the slice)"""
+        created = self.order_column("created")
+        start, end = to_seconds(start), to_seconds(end)
+        if self._sorted:
+            low = 0 if start is None else int(np.searchsorted(created, start, "left"))
+            high = len(created) if end is None else int(np.searchsorted(created, end, "left"))
+            rows = slice(low, max(low, high))
+            mask = self.order_column("active")[rows].copy()
+        else:
+            rows = slice(0, len(created))
+            mask = self.order_column("active").copy()
+            if start is not None:
+                mask &= created >= start
+            if end is not None:
+                mask &= created < end
+        if paid_only:
+            mask &= self.order_column("paid")[rows]
+        return rows, mask
+
+    def item_window(self, rows: slice, mask: np.ndarray) -> Tuple[slice, np.ndarray]:
+        """Item rows belonging to the orders selected by window()"""
+        order = self.item_column("order")
+        low, high = np.searchsorted(order, [rows.start, rows.stop], "left")
+        item_rows = slice(int(low), int(high))
+        return item_rows, mask[order[item_rows] - rows.start]
+
+    def item_selection(self, start: TimeBound = None, end: TimeBound = None,
+                       paid_only: bool = True) -> np.ndarray:
+        """Indices of the items whose orders fall in [start, end)"""
+        item_rows, item_mask = self.item_window(*self.window(start, end, paid_only))
+        return np.flatnonzero(item_mask) + item_rows.start
+
+    def item_dimension(self, name: str, items: np.ndarray) -> Tuple[np.ndarray, List[Any]]:
+        """(code per item, label per code) of one of ITEM_DIMENSIONS for the given items"""
+        if name == "product":
+            return self.item_column("product")[items], self.products.labels
+        orders = self.item_column("order")[items]
+        if name in ORDER_DIMENSIONS:
+            return self.order_column(name)[orders], getattr(self, ORDER_DIMENSIONS[name]).labels
+        created = self.order_column("created")[orders]
+        if name == "hour":
+            return created % SECONDS_PER_DAY // 3600, list(range(24))
+        days = created // SECONDS_PER_DAY
+        if name == "weekday":
+            # 1970-01-01 was a Thursday
+            return (days + 3) % 7, list(range(7))
+        if name == "day":
+            first = int(days.min()) if len(days) else 0
+            count = int(days.max()) - first + 1 if len(days) else 0
+            labels = np.arange(first, first + count).astype("datetime64[D]").astype(str).tolist()
+            return days - first, labels
+        raise KeyError(name)
+
+    # ---- measures
+
+    def revenue(self, start: TimeBound = None, end: TimeBound = None, paid_only: bool = True) -> float:
+        rows, mask = self.window(start, end, paid_only)
+        return float(self.order_column("total")[rows][mask].sum())
+
+    def order_count_between(self, start: TimeBound = None, end: TimeBound = None,
+                            paid_only: bool = False) -> int:
+        return int(self.window(start, end, paid_only)[1].sum())
+
+    def average_order_value(self, start: TimeBound = None, end: TimeBound = None,
+                            paid_only: bool = True) -> float:
+        rows, mask = self.window(start, end, paid_only)
+        count = int(mask.sum())
+        return float(self.order_column("total")[rows][mask].sum() / count) if count else 0.0
+
+    def group_orders(self, key: str, value: Optional[str] = "total", start: TimeBound = None,
+                     end: TimeBound = None, paid_only: bool = True, size: Optional[int] = None) -> np.ndarray:
+        """Sum of an order column per code of another (counts when value is None)"""
+        rows, mask = self.window(start, end, paid_only)
+        codes = self.order_column(key)[rows][mask]
+        weights = None if value is None else self.order_column(value)[rows][mask]
+        return np.bincount(codes, weights=weights, minlength=size or 0)
+
+    def group_items(self, key: str, value: str = "amount", start: TimeBound = None,
+                    end: TimeBound = None, paid_only: bool = True, size: Optional[int] = None) -> np.ndarray:
+        """Sum of an item column per code of an item column (e.g. product)"""
+        rows, mask = self.window(start, end, paid_only)
+        item_rows, item_mask = self.item_window(rows, mask)
+        codes = self.item_column(key)[item_rows][item_mask]
+        return np.bincount(codes, weights=self.item_column(value)[item_rows][item_mask], minlength=size or 0)
+
+    def daily_revenue(self, start: TimeBound, end: TimeBound,
+                      paid_only: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """(day start seconds, revenue) for every day in [start, end)"""
+        start, end = to_seconds(start), to_seconds(end)
+        first_day = start // SECONDS_PER_DAY
+        days = max(0, -(-end // SECONDS_PER_DAY) - first_day)
+        rows, mask = self.window(start, end, paid_only)
+        day = self.order_column("created")[rows][mask] // SECONDS_PER_DAY - first_day
+        revenue = np.bincount(day, weights=self.order_column("total")[rows][mask], minlength=days)
+        return (first_day + np.arange(days)) * SECONDS_PER_DAY, revenue[:days]
@@ -1,8 +1,12 @@
 """Database configuration and connection management"""
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from typing import AsyncGenerator
 import os
+import time
+
+from .metrics import DB_POOL_CHECKOUT
 
 # Database URLs
 DATABASE_URL = os.getenv(
@@ -11,6 +15,17 @@ DATABASE_URL = os.getenv(
 )
 
 
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Connection pool that records how long each checkout waited"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT.observe(time.perf_counter() - start)
+
+
 # Create async engine
 engine = create_async_engine(
     DATABASE_URL,
@@ -18,7 +33,8 @@ engine = create_async_engine(
     future=True,
     pool_pre_ping=True,
     pool_size=20,
-    max_overflow=0
+    max_overflow=0,
+    poolclass=TimedQueuePool
 )
 
 
@@ -0,0 +1,289 @@
+"""In-memory entity store used by the mock business services"""
+from bisect import bisect_left, bisect_right, insort
+from itertools import count, islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .pagination import decode_cursor, encode_cursor
+
+# Maps an index name to the function extracting the indexed value from a record
+IndexSpec = Dict[str, Callable[[Dict[str, Any]], Any]]
+# Extracts the value a collection is ordered by (insertion order if not given)
+OrderBy = Callable[[Dict[str, Any]], Any]
+
+# Versions come from one process-wide sequence, so a collection that replaces
+# another (``MOCK_X_DB[store_id] = [...]``) never reuses a version it had
+_versions = count(1)
+
+
+class EntityCollection:
+    """Records of one store, indexed by id and kept in a stable order.
+
+    Backed by a plain dict, so lookup, insert and delete by id are O(1).
+    Every record has a position key (order_by value, id) -- insertion order
+    unless order_by is given -- and a sorted list of those keys drives
+    iteration, so a page can start right after a cursor key without walking
+    the records before it. Optional secondary indexes map a value to the
+    keys holding it, sorted the same way, so filtered pages come out in the
+    same order as unfiltered ones.
+    """
+
+    def __init__(
+        self,
+        records: Optional[Iterable[Dict[str, Any]]] = None,
+        indexes: Optional[IndexSpec] = None,
+        order_by: Optional[OrderBy] = None,
+    ):
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._indexes: IndexSpec = dict(indexes or {})
+        self._order_by = order_by
+        self._buckets: Dict[str, Dict[Any, List[Tuple[Any, str]]]] = {name: {} for name in self._indexes}
+        # Position keys of all records, sorted
+        self._order: List[Tuple[Any, str]] = []
+        # Position key and indexed values of each record, for removal/reindexing
+        self._keys: Dict[str, Tuple[Any, str]] = {}
+        self._indexed: Dict[str, Dict[str, Any]] = {}
+        # Number of records ever added; generated ids derive from it so they
+        # stay unique after deletes (len() would hand out a used id again).
+        self.sequence = 0
+        # Past the last id handed out by reserve_sequence
+        self.reserved = 0
+        # Changes on every write; equal versions mean equal contents
+        self.version = next(_versions)
+        # Changes when a record is changed or removed, not when one is added:
+        # while it holds, the collection has only grown (by sequence records)
+        self.rewritten = self.version
+        for record in records or []:
+            self.add(record)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self._records[record_id] for _, record_id in self._order)
+
+    def __contains__(self, record_id: str) -> bool:
+        return record_id in self._records
+
+    def touch(self) -> int:
+        """Bump the version after records were changed in place"""
+        self.version = self.rewritten = next(_versions)
+        return self.version
+
+    def get(self, record_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Get record by id"""
+        return self._records.get(record_id)
+
+    def add(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert or replace a record keyed by its id"""
+        record_id = record["id"]
+        replaced = record_id in self._records
+        if replaced:
+            self._unindex(record_id)
+            position = self._keys[record_id][0]
+        else:
+            position = self.sequence
+            self.sequence += 1
+        self._records[record_id] = record
+        self._place(record, position)
+        self._index(record)
+        if replaced:
+            self.touch()
+        else:
+            self.version = next(_versions)
+        return record
+
+    def update(self, record_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Apply changes to a record in place and refresh its index entries"""
+        record = self._records.get(record_id)
+        if record is None:
+            return None
+        self._unindex(record_id)
+        record.update(changes)
+        self._place(record, self._keys[record_id][0])
+        self._index(record)
+        self.touch()
+        return record
+
+    def remove(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """Delete record by id and return it, or None if missing"""
+        record = self._records.pop(record_id, None)
+        if record is not None:
+            self._unindex(record_id)
+            _discard(self._order, self._keys.pop(record_id))
+            self.touch()
+        return record
+
+    def page(self, skip: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        """Records in order, sliced like list[skip:skip+limit]"""
+        return [self._records[record_id] for _, record_id in self._order[skip:skip + limit]]
+
+    def find(
+        self,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[Any, str]] = None,
+        **criteria: Any,
+    ) -> List[Dict[str, Any]]:
+        """Records matching all criteria, in order, then paginated.
+
+        Criteria on indexed names are answered from the smallest matching
+        bucket; any other criteria are checked against those candidates only.
+        None values are ignored so optional query params can pass through.
+        With after, matching starts right past that position key.
+        """
+        matches = self._iter_matches(criteria, after)
+        stop = None if limit is None else skip + limit
+        return list(islice(matches, skip, stop))
+
+    def paginate(
+        self,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        with_total: bool = True,
+        **criteria: Any,
+    ) -> Dict[str, Any]:
+        """One page of matching records with its total and next cursor.
+
+        With a cursor the page starts after the record it points at and skip
+        is ignored; without one, skip/limit behave as before. The total is
+        None unless with_total. Raises InvalidCursorError for a cursor that
+        can't be decoded.
+        """
+        after = decode_cursor(cursor)
+        # Fetch one extra record to know whether another page follows
+        items = self.find(0 if after else skip, limit + 1, after=after, **criteria)
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(*self._keys[items[-1]["id"]])
+        total = self.count(**criteria) if with_total else None
+        return {"items": items, "total": total, "next_cursor": next_cursor}
+
+    def count(self, **criteria: Any) -> int:
+        """Number of records matching all criteria"""
+        criteria = {k: v for k, v in criteria.items() if v is not None}
+        if not criteria:
+            return len(self._records)
+        if len(criteria) == 1:
+            name, value = next(iter(criteria.items()))
+            if name in self._indexes:
+                return len(self._buckets[name].get(value, ()))
+        return sum(1 for _ in self._iter_matches(criteria))
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """All records in order"""
+        return list(self)
+
+    def _iter_matches(
+        self, criteria: Dict[str, Any], after: Optional[Tuple[Any, str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        criteria = {k: v for k, v in criteria.items() if v is not None}
+        indexed = [name for name in criteria if name in self._indexes]
+        keys = self._order
+        if indexed:
+            buckets = [self._buckets[name].get(criteria[name], []) for name in indexed]
+            keys = min(buckets, key=len)
+        start = bisect_right(keys, tuple(after)) if after else 0
+        # Index from start rather than islice, which would step over every
+        # key before it
+        candidates = (self._records[keys[i][1]] for i in range(start, len(keys)))
+        for record in candidates:
+            if all(self._value(record, name) == value for name, value in criteria.items()):
+                yield record
+
+    def _value(self, record: Dict[str, Any], name: str) -> Any:
+        extract = self._indexes.get(name)
+        return extract(record) if extract else record.get(name)
+
+    def _place(self, record: Dict[str, Any], position: int) -> None:
+        """(Re)insert the record's position key into the sorted order"""
+        record_id = record["id"]
+        value = self._order_by(record) if self._order_by else position
+        key = (value, record_id)
+        old = self._keys.get(record_id)
+        if old == key:
+            return
+        if old is not None:
+            _discard(self._order, old)
+        self._keys[record_id] = key
+        insort(self._order, key)
+
+    def _index(self, record: Dict[str, Any]) -> None:
+        if not self._indexes:
+            return
+        record_id = record["id"]
+        key = self._keys[record_id]
+        values = {}
+        for name, extract in self._indexes.items():
+            value = extract(record)
+            values[name] = value
+            insort(self._buckets[name].setdefault(value, []), key)
+        self._indexed[record_id] = values
+
+    def _unindex(self, record_id: str) -> None:
+        values = self._indexed.pop(record_id, None)
+        if not values:
+            return
+        key = self._keys[record_id]
+        for name, value in values.items():
+            bucket = self._buckets[name].get(value)
+            if not bucket:
+                continue
+            _discard(bucket, key)
+            if not bucket:
+                del self._buckets[name][value]
+
+
+def _discard(keys: List[Tuple[Any, str]], key: Tuple[Any, str]) -> None:
+    """Remove key from a sorted key list if present"""
+    pos = bisect_left(keys, key)
+    if pos < len(keys) and keys[pos] == key:
+        del keys[pos]
+
+
+class EntityStore(dict):
+    """Mapping of store_id -> EntityCollection.
+
+    Plain lists assigned to a store are wrapped on the way in, so seed data
+    and ``MOCK_X_DB[store_id] = [...]`` keep working unchanged. Every
+    collection of the store gets the same secondary indexes and ordering.
+    """
+
+    def __init__(
+        self,
+        stores: Optional[Dict[str, Iterable[Dict[str, Any]]]] = None,
+        indexes: Optional[IndexSpec] = None,
+        order_by: Optional[OrderBy] = None,
+    ):
+        super().__init__()
+        self.indexes: IndexSpec = dict(indexes or {})
+        self.order_by = order_by
+        for store_id, records in (stores or {}).items():
+            self[store_id] = records
+
+    def __setitem__(self, store_id: str, records: Iterable[Dict[str, Any]]) -> None:
+        if not isinstance(records, EntityCollection):
+            records = EntityCollection(records, self.indexes, self.order_by)
+        super().__setitem__(store_id, records)
+
+    def setdefault(self, store_id: str, records: Optional[Iterable[Dict[str, Any]]] = None) -> EntityCollection:
+        if store_id not in self:
+            self[store_id] = records or []
+        return self[store_id]
+
+    def collection(self, store_id: str, create: bool = False) -> EntityCollection:
+        """Get the collection for a store.
+
+        Reads get an empty, detached collection for unknown stores so they
+        don't register the store as a side effect; writes pass create=True.
+        """
+        if create:
+            return self.setdefault(store_id)
+        found = self.get(store_id)
+        return found if found is not None else EntityCollection(indexes=self.indexes, order_by=self.order_by)
+
+    def version(self, store_id: str) -> int:
+        """Version of a store's collection; 0 for a store with no collection"""
+        found = self.get(store_id)
+        return found.version if found is not None else 0
@@ -0,0 +1,180 @@
+"""Stateless JWT issuing and verification for the API"""
+import logging
+import os
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import jwt
+
+from .cache import LocalCache, MISSING
+from .entity_store import EntityStore
+from .storage import MemoryCollection, RecordCollection
+
+logger = logging.getLogger(__name__)
+
+ENVIRONMENT = os.getenv("ENVIRONMENT", "development").lower()
+
+
+def _secret_key() -> str:
+    """JWT_SECRET_KEY; outside development the app refuses to start without it"""
+    secret = os.getenv("JWT_SECRET_KEY")
+    if secret:
+        return secret
+    if ENVIRONMENT != "development":
+        raise RuntimeError(f"JWT_SECRET_KEY must be set when ENVIRONMENT={ENVIRONMENT}")
+    logger.warning(
+        "JWT_SECRET_KEY is not set; signing with a random key, so tokens die with this "
+        "process and don't verify on other workers"
+    )
+    return secrets.token_urlsafe(32)
+
+
+# Every worker must share the key, so it comes from the environment
+SECRET_KEY = _secret_key()
+ALGORITHM = os.getenv("ALGORITHM", "HS256")
+# Lifetimes in seconds, per token kind
+ACCESS_TOKEN_TTL = int(os.getenv("ACCESS_TOKEN_TTL_SECONDS", str(30 * 60)))
+REFRESH_TOKEN_TTL = int(os.getenv("REFRESH_TOKEN_TTL_SECONDS", str(7 * 24 * 3600)))
+RESET_TOKEN_TTL = int(os.getenv("RESET_TOKEN_TTL_SECONDS", str(15 * 60)))
+# Pending password reset tokens kept per user; requesting another past
+# this drops the oldest
+MAX_TOKENS_PER_USER = int(os.getenv("MAX_TOKENS_PER_USER", "50"))
+# Seconds between sweeps of expired password reset tokens
+RESET_TOKEN_SWEEP_INTERVAL = float(os.getenv("RESET_TOKEN_SWEEP_SECONDS", "300"))
+# Verified tokens remembered so hot tokens skip the signature check
+VERIFIED_CACHE_SIZE = int(os.getenv("JWT_VERIFIED_CACHE_SIZE", "4096"))
+# How long a worker trusts its copy of a user's revocations; a logout on
+# another worker takes up to this long to reach this one
+REVOCATION_CACHE_TTL = float(os.getenv("JWT_REVOCATION_CACHE_TTL", "5"))
+# Partition of the revocations collection holding one record per user
+REVOCATION_SCOPE = "revocations"
+
+# User fields carried in the token, so requests don't need a lookup
+USER_CLAIMS = ("email", "full_name", "role", "store_id", "store_name", "phone")
+
+
+class JWTAuthenticator:
+    """Issues and verifies signed access/refresh tokens.
+
+    Any worker holding the secret can verify a token, so requests are no
+    longer tied to the process that logged the user in. Decoded claims of
+    recently seen tokens are kept in a bounded LRU; a hit skips the HMAC
+    and JSON decoding but still checks expiry and revocation.
+
+    Revocations are shared by every worker through the revocations
+    collection, one record per user: logout adds the session id (the access
+    and refresh token issued together share one) until the session's
+    refresh token would have expired, and revoking a user sets a cutoff
+    that rejects tokens issued before it. Expired session ids are dropped
+    whenever the record is written, so it stays as small as the user's live
+    sessions. Each worker caches the records it reads for revocation_ttl
+    seconds; its own revocations apply at once.
+    """
+
+    def __init__(
+        self,
+        secret: str = SECRET_KEY,
+        algorithm: str = ALGORITHM,
+        cache_size: int = VERIFIED_CACHE_SIZE,
+        clock: Callable[[], float] = time.time,
+        revocations: Optional[RecordCollection] = None,
+        revocation_ttl: float = REVOCATION_CACHE_TTL,
+    ):
+        self.secret = secret
+        self.algorithm = algorithm
+        self.cache_size = cache_size
+        self.ttls = {"access": ACCESS_TOKEN_TTL, "refresh": REFRESH_TOKEN_TTL}
+        self._clock = clock
+        self._verified: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Without a shared collection, revocations only reach this instance
+        self.revocations = revocations if revocations is not None else MemoryCollection(EntityStore())
+        self._revocation_cache = LocalCache(cache_size, revocation_ttl, clock=clock)
+        self.hits = 0
+        self.misses = 0
+
+    def issue_pair(self, user: Dict[str, Any]) -> Tuple[str, str, int]:
+        """Access and refresh token of a new session, plus the access lifetime"""
+        session_id = secrets.token_urlsafe(8)
+        access = self._encode(user, "access", session_id)
+        refresh = self._encode(user, "refresh", session_id)
+        return access, refresh, self.ttls["access"]
+
+    async def verify(self, token: Optional[str], kind: str = "access") -> Optional[Dict[str, Any]]:
+        """Claims of a valid, unexpired, unrevoked token of the given kind"""
+        if not token:
+            return None
+        claims = self._verified.get(token)
+        if claims is not None:
+            self.hits += 1
+            self._verified.move_to_end(token)
+        else:
+            self.misses += 1
+            try:
+                # Expiry is checked below against our clock, for cached claims too
+                claims = jwt.decode(
+                    token, self.secret, algorithms=[self.algorithm],
+                    options={"verify_exp": False, "verify_iat": False, "require": ["exp", "iat", "sub", "typ"]},
+                )
+            except jwt.InvalidTokenError:
+                return None
+            self._verified[token] = claims
+            if len(self._verified) > self.cache_size:
+                self._verified.popitem(last=False)
+        if claims["exp"] <= self._clock():
+            self._verified.pop(token, None)
+            return None
+        if claims.get("typ") != kind or await self.is_revoked(claims):
+            return None
+        return claims
+
+    async def is_revoked(self, claims: Dict[str, Any]) -> bool:
+        record = await self._revocations_of(claims["sub"])
+        if claims.get("sid") in (record.get("sessions") or {}):
+            return True
+        return claims["iat"] < (record.get("not_before") or 0)
+
+    async def revoke_session(self, claims: Dict[str, Any]) -> None:
+        """Revoke the token pair the claims belong to"""
+        await self._revoke(claims["sub"], sessions={claims["sid"]: claims["iat"] + self.ttls["refresh"]})
+
+    async def revoke_user(self, user_id: str) -> None:
+        """Revoke every token issued to the user so far"""
+        await self._revoke(user_id, not_before=self._clock())
+
+    async def _revoke(self, user_id: str, sessions: Optional[Dict[str, float]] = None,
+                      not_before: float = 0.0) -> None:
+        """Add session ids (-> expiry) and raise the cutoff in the user's shared record"""
+        now = self._clock()
+
+        def change(record: Dict[str, Any]) -> Dict[str, Any]:
+            live = {sid: expires for sid, expires in (record.get("sessions") or {}).items() if expires > now}
+            live.update(sessions or {})
+            return {"sessions": live, "not_before": max(record.get("not_before") or 0, not_before)}
+
+        # Make sure the record exists, then change it under its lock
+        await self.revocations.adjust(REVOCATION_SCOPE, {user_id: {}}, create=True)
+        _, record = await self.revocations.modify(REVOCATION_SCOPE, user_id, change)
+        self._revocation_cache.set(user_id, record)
+
+    async def _revocations_of(self, user_id: str) -> Dict[str, Any]:
+        record = self._revocation_cache.get(user_id)
+        if record is MISSING:
+            record = await self.revocations.get(REVOCATION_SCOPE, user_id) or {}
+            self._revocation_cache.set(user_id, record)
+        return record
+
+    def _encode(self, user: Dict[str, Any], kind: str, session_id: str) -> str:
+        now = self._clock()
+        claims = {claim: user.get(claim) for claim in USER_CLAIMS}
+        claims.update({
+            "sub": user.get("id"),
+            "typ": kind,
+            "sid": session_id,
+            "jti": secrets.token_urlsafe(8),
+            # Sub-second iat so a revoke_user right after a login is ordered
+            "iat": now,
+            "exp": now + self.ttls[kind],
+        })
+        return jwt.encode(claims, self.secret, algorithm=self.algorithm)
@@ -1,57 +1,96 @@
 """Logging configuration"""
+import atexit
 import logging
+import os
+import queue
 import sys
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
 
-from ..config.settings import settings
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "%(asctime)s %(levelname)s %(name)s: %(message)s")
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+# Set to 0 to log to the console only (e.g. in containers)
+LOG_TO_FILE = os.getenv("LOG_TO_FILE", "1") != "0"
 
+_listener: Optional[QueueListener] = None
 
-def setup_logging() -> None:
-    """Setup application logging"""
-    
-    # Create logs directory if it doesn't exist
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
-    # Get root logger
+
+def setup_logging(level: str = LOG_LEVEL, log_dir: Optional[str] = LOG_DIR) -> QueueListener:
+    """Setup application logging.
+
+    The root logger only gets a QueueHandler: records are put on a queue
+    and a QueueListener thread writes them to the console and log files,
+    so file I/O never runs on the event loop. Calling it again replaces
+    the previous configuration.
+    """
+    global _listener
+    shutdown_logging()
+
+    log_level = getattr(logging, level)
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    # Console handler
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(formatter)
+    handlers = [console_handler]
+
+    if LOG_TO_FILE and log_dir:
+        # Create logs directory if it doesn't exist
+        path = Path(log_dir)
+        path.mkdir(parents=True, exist_ok=True)
+
+        # File handler
+        file_handler = RotatingFileHandler(
+            path / "app.log",
+            maxBytes=10 * 1024 * 1024,  # 10MB
+            backupCount=5,
+            encoding="utf-8"
+        )
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+        # Error file handler
+        error_handler = RotatingFileHandler(
+            path / "error.log",
+            maxBytes=10 * 1024 * 1024,  # 10MB
+            backupCount=5,
+            encoding="utf-8"
+        )
+        error_handler.setLevel(logging.ERROR)
+        error_handler.setFormatter(formatter)
+        handlers.append(error_handler)
+
+    # Get root logger; the level is checked before a record is even built,
+    # so disabled debug calls cost one comparison
     root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, settings.LOG_LEVEL))
-    
+    root_logger.setLevel(log_level)
+
     # Remove existing handlers
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
-    
-    # Create formatter
-    formatter = logging.Formatter(settings.LOG_FORMAT)
-    
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, settings.LOG_LEVEL))
-    console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
-    
-    # File handler
-    file_handler = RotatingFileHandler(
-        log_dir / "app.log",
-        maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
-    )
-    file_handler.setLevel(getattr(logging, settings.LOG_LEVEL))
-    file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
-    
-    # Error file handler
-    error_handler = RotatingFileHandler(
-        log_dir / "error.log",
-        maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
-    )
-    error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(formatter)
-    root_logger.addHandler(error_handler)
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+    root_logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
 
 
 def get_logger(name: str) -> logging.Logger:
     """Get logger instance"""
     return logging.getLogger(name)
+
+
+atexit.register(shutdown_logging)
@@ -1,5 +1,5 @@
 """Database Models using SQLAlchemy"""
-from sqlalchemy import Column, String, Float, Integer, Boolean, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, String, Float, Integer, Boolean, DateTime, ForeignKey, Text, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -10,6 +10,9 @@ Base = declarative_base()
 class UserModel(Base):
     """User database model"""
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_business_created", "business_id", "created_at", "id"),
+    )
     
     id = Column(String(36), primary_key=True)
     username = Column(String(50), unique=True, nullable=False)
@@ -31,7 +34,7 @@ class BusinessModel(Base):
     
     id = Column(String(36), primary_key=True)
     name = Column(String(200), nullable=False)
-    owner_id = Column(String(36), ForeignKey("users.id"))
+    owner_id = Column(String(36), ForeignKey("users.id", use_alter=True, name="fk_businesses_owner_id"))
     phone = Column(String(20))
     email = Column(String(100))
     address = Column(String(255))
@@ -49,6 +52,12 @@ class BusinessModel(Base):
 class ProductModel(Base):
     """Product database model"""
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_business_sku", "business_id", "sku"),
+        Index("ix_products_business_barcode", "business_id", "barcode"),
+        Index("ix_products_business_category", "business_id", "category"),
+        Index("ix_products_business_created", "business_id", "created_at", "id"),
+    )
     
     id = Column(String(36), primary_key=True)
     business_id = Column(String(36), ForeignKey("businesses.id"), nullable=False)
@@ -69,6 +78,10 @@ class ProductModel(Base):
 class InventoryModel(Base):
     """Inventory database model"""
     __tablename__ = "inventory"
+    __table_args__ = (
+        Index("ix_inventory_product", "product_id"),
+        Index("ix_inventory_business", "business_id"),
+    )
     
     id = Column(String(36), primary_key=True)
     product_id = Column(String(36), ForeignKey("products.id"), nullable=False)
@@ -82,6 +95,13 @@ class InventoryModel(Base):
 class CustomerModel(Base):
     """Customer database model"""
     __tablename__ = "customers"
+    __table_args__ = (
+        Index("ix_customers_business_phone", "business_id", "phone"),
+        Index("ix_customers_business_email", "business_id", "email"),
+        Index("ix_customers_business_created", "business_id", "created_at", "id"),
+        Index("ix_customers_business_debt", "business_id", "outstanding_debt"),
+        Index("ix_customers_business_purchases", "business_id", "total_purchases"),
+    )
     
     id = Column(String(36), primary_key=True)
     business_id = Column(String(36), ForeignKey("businesses.id"), nullable=False)
@@ -101,6 +121,12 @@ class CustomerModel(Base):
 class OrderModel(Base):
     """Order database model"""
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_business_created", "business_id", "created_at", "id"),
+        Index("ix_orders_business_status_created", "business_id", "status", "created_at"),
+        Index("ix_orders_business_payment_created", "business_id", "payment_status", "created_at"),
+        Index("ix_orders_customer_created", "customer_id", "created_at"),
+    )
     
     id = Column(String(36), primary_key=True)
     business_id = Column(String(36), ForeignKey("businesses.id"), nullable=False)
@@ -122,6 +148,10 @@ class OrderModel(Base):
 class OrderItemModel(Base):
     """Order item database model"""
     __tablename__ = "order_items"
+    __table_args__ = (
+        Index("ix_order_items_order", "order_id"),
+        Index("ix_order_items_product", "product_id"),
+    )
     
     id = Column(String(36), primary_key=True)
     order_id = Column(String(36), ForeignKey("orders.id"), nullable=False)
@@ -137,6 +167,11 @@ class OrderItemModel(Base):
 class DebtModel(Base):
     """Debt database model"""
     __tablename__ = "debts"
+    __table_args__ = (
+        Index("ix_debts_business_paid", "business_id", "is_paid"),
+        Index("ix_debts_customer_paid", "customer_id", "is_paid"),
+        Index("ix_debts_business_created", "business_id", "created_at", "id"),
+    )
     
     id = Column(String(36), primary_key=True)
     business_id = Column(String(36), ForeignKey("businesses.id"), nullable=False)
@@ -183,3 +218,45 @@ class AccountingRecordModel(Base):
     recorded_date = Column(DateTime)
     created_at = Column(DateTime, default=datetime.now)
 
+
+
+class RecordModel(Base):
+    """Service record stored as JSON (see infrastructure.storage.sql)"""
+    __tablename__ = "records"
+    __table_args__ = (
+        Index("ix_records_scope_order", "collection", "store_id", "sort_key", "id"),
+    )
+
+    collection = Column(String(32), primary_key=True)
+    store_id = Column(String(64), primary_key=True)
+    id = Column(String(255), primary_key=True)
+    # created_at of the record, normalized; with id it orders every listing
+    sort_key = Column(String(64), nullable=False, default="")
+    data = Column(JSON, nullable=False)
+
+
+# Batch-created orders carry the client's client_ref: one order per ref
+# and store (records without the field index as NULL, which never collide)
+Index(
+    "ux_records_client_ref", RecordModel.collection, RecordModel.store_id,
+    RecordModel.data["client_ref"].as_string(), unique=True,
+)
+# Password reset tokens are looked up by user on issue and revoke; the
+# trailing columns serve the listing order, as in ix_records_scope_order
+Index(
+    "ix_records_user_id", RecordModel.collection, RecordModel.store_id,
+    RecordModel.data["user_id"].as_string(), RecordModel.sort_key, RecordModel.id,
+)
+
+
+class RecordScopeModel(Base):
+    """Id sequence, data version and growth counters of one store's records of one collection"""
+    __tablename__ = "record_scopes"
+
+    collection = Column(String(32), primary_key=True)
+    store_id = Column(String(64), primary_key=True)
+    sequence = Column(Integer, nullable=False, default=0)
+    version = Column(Integer, nullable=False, default=0)
+    # Records added, and writes that changed or removed existing ones
+    inserted = Column(Integer, nullable=False, default=0)
+    rewritten = Column(Integer, nullable=False, default=0)
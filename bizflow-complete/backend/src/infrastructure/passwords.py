@@ -0,0 +1,94 @@
+"""Password hashing with bcrypt, kept off the event loop"""
+import asyncio
+import hashlib
+import hmac
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+import bcrypt
+
+# bcrypt cost factor; each +1 doubles the time of a hash
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Threads hashing at once; more logins than this wait in the queue
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+_SHA256_HEX = re.compile(r"[0-9a-f]{64}")
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords in a bounded thread pool.
+
+    A bcrypt hash at cost 12 takes a few hundred milliseconds of CPU; run on
+    the event loop it would stall every other request for that long. bcrypt
+    releases the GIL while hashing, so a small thread pool keeps the loop
+    responsive and bounds how much CPU a login storm can take.
+
+    Besides bcrypt, verify accepts the formats stored before it: the
+    unsalted SHA-256 hex digests of the SQL use cases and the plaintext
+    passwords of the in-memory users. When one of those (or a bcrypt hash
+    below the configured cost) matches, verify also returns a fresh hash so
+    the caller can store it; legacy hashes disappear as users log in.
+    """
+
+    def __init__(self, rounds: int = BCRYPT_ROUNDS, workers: int = PASSWORD_HASH_WORKERS):
+        self.rounds = rounds
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def hash(self, password: str) -> str:
+        """bcrypt hash of the password at the configured cost"""
+        return await self._run(self._hash_sync, password)
+
+    async def verify(self, password: str, stored: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """Check a password against its stored hash.
+
+        Returns (matches, new_hash); new_hash is set when the password
+        matched a hash that should be replaced.
+        """
+        if not password or not stored:
+            return False, None
+        if stored.startswith(_BCRYPT_PREFIXES):
+            matches = await self._run(bcrypt.checkpw, _secret(password), stored.encode())
+        elif _SHA256_HEX.fullmatch(stored):
+            matches = hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored)
+        else:
+            matches = hmac.compare_digest(password.encode(), stored.encode())
+        if not matches:
+            return False, None
+        new_hash = await self.hash(password) if self.needs_rehash(stored) else None
+        return True, new_hash
+
+    def needs_rehash(self, stored: str) -> bool:
+        """Whether a stored hash is a legacy format or below the configured cost"""
+        if not stored.startswith(_BCRYPT_PREFIXES):
+            return True
+        try:
+            return int(stored.split("$")[2]) < self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def shutdown(self) -> None:
+        """Stop the hashing threads; they are started again on next use"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _hash_sync(self, password: str) -> str:
+        return bcrypt.hashpw(_secret(password), bcrypt.gensalt(self.rounds)).decode()
+
+    async def _run(self, func, *args):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="password-hash")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+
+def _secret(password: str) -> bytes:
+    # bcrypt only uses the first 72 bytes; bcrypt>=5 raises instead of
+    # truncating, so truncate here as earlier versions did
+    return password.encode()[:72]
+
+
+PASSWORD_HASHER = PasswordHasher()
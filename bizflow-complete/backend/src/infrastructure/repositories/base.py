@@ -0,0 +1,32 @@
+"""Shared base for the SQLAlchemy repositories"""
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class SessionRepository:
+    """Repository bound to an AsyncSession.
+
+    Standalone repositories commit each write, as before. Repositories handed
+    out by a UnitOfWork are built with auto_commit=False: writes are only
+    flushed, and the unit of work commits (or rolls back) once for the whole
+    business operation.
+    """
+
+    def __init__(self, session: AsyncSession, auto_commit: bool = True):
+        self.session = session
+        self.auto_commit = auto_commit
+
+    async def _commit(self, *models: Any) -> None:
+        """Commit the write, or just flush it inside a unit of work.
+
+        The commit expires the written models, so they are reloaded after
+        it; a flush leaves them loaded (defaults included), which saves a
+        unit of work one SELECT per entity written.
+        """
+        if self.auto_commit:
+            await self.session.commit()
+            for model in models:
+                await self.session.refresh(model)
+        else:
+            await self.session.flush()
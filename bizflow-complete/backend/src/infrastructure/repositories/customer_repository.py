@@ -1,19 +1,17 @@
 """Customer Repository Implementation"""
 from typing import Optional
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func
 from ...domain.entities import Customer
 from ...domain.repositories import ICustomerRepository
 from ..models import CustomerModel
+from ..pagination import keyset_page, split_page
+from .base import SessionRepository
 
 
 
-class CustomerRepository(ICustomerRepository):
+class CustomerRepository(SessionRepository, ICustomerRepository):
     """Customer repository implementation"""
 
-    def __init__(self, session: AsyncSession):
-        self.session = session
-
     
     async def get_by_id(self, customer_id: str) -> Optional[Customer]:
         """Get customer by ID"""
@@ -47,16 +45,14 @@ class CustomerRepository(ICustomerRepository):
         """Create new customer"""
         model = self._to_model(customer)
         self.session.add(model)
-        await self.session.commit()
-        await self.session.refresh(model)
+        await self._commit(model)
         return self._to_entity(model)
 
     
     async def update(self, customer: Customer) -> Customer:
         """Update customer"""
         model = await self.session.merge(self._to_model(customer))
-        await self.session.commit()
-        await self.session.refresh(model)
+        await self._commit(model)
         return self._to_entity(model)
 
     
@@ -67,7 +63,7 @@ class CustomerRepository(ICustomerRepository):
         model = result.scalar_one_or_none()
         if model:
             await self.session.delete(model)
-            await self.session.commit()
+            await self._commit()
             return True
         return False
 
@@ -86,6 +82,23 @@ class CustomerRepository(ICustomerRepository):
         models = result.scalars().all()
         return [self._to_entity(model) for model in models]
 
+    async def get_page_by_business(
+        self, business_id: str, limit: int = 100, cursor: Optional[str] = None
+    ) -> tuple[list[Customer], Optional[str]]:
+        """Get a keyset page of customers by business, ordered by (created_at, id)"""
+        stmt = keyset_page(
+            select(CustomerModel).where(CustomerModel.business_id == business_id), CustomerModel, cursor, limit
+        )
+        result = await self.session.execute(stmt)
+        models, next_cursor = split_page(result.scalars().all(), limit)
+        return [self._to_entity(model) for model in models], next_cursor
+
+    async def count_by_business(self, business_id: str) -> int:
+        """Count customers by business"""
+        stmt = select(func.count()).select_from(CustomerModel).where(CustomerModel.business_id == business_id)
+        result = await self.session.execute(stmt)
+        return result.scalar() or 0
+
     
     async def search(
         self, business_id: str, query: str, skip: int = 0, limit: int = 100
@@ -1,18 +1,16 @@
 """Debt Repository Implementation"""
 from typing import Optional
-from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func
 from ...domain.entities import Debt
 from ...domain.repositories import IDebtRepository
 from ..models import DebtModel
+from ..pagination import keyset_page, split_page
+from .base import SessionRepository
 
 
-class DebtRepository(IDebtRepository):
+class DebtRepository(SessionRepository, IDebtRepository):
     """Debt repository implementation"""
 
-    def __init__(self, session: AsyncSession):
-        self.session = session
-
     
     async def get_by_id(self, debt_id: str) -> Optional[Debt]:
         """Get debt by ID"""
@@ -27,16 +25,14 @@ class DebtRepository(IDebtRepository):
         """Create new debt"""
         model = self._to_model(debt)
         self.session.add(model)
-        await self.session.commit()
-        await self.session.refresh(model)
+        await self._commit(model)
         return self._to_entity(model)
 
     
     async def update(self, debt: Debt) -> Debt:
         """Update debt"""
         model = await self.session.merge(self._to_model(debt))
-        await self.session.commit()
-        await self.session.refresh(model)
+        await self._commit(model)
         return self._to_entity(model)
 
     
@@ -47,7 +43,7 @@ class DebtRepository(IDebtRepository):
         model = result.scalar_one_or_none()
         if model:
             await self.session.delete(model)
-            await self.session.commit()
+            await self._commit()
             return True
         return False
 
@@ -84,6 +80,23 @@ class DebtRepository(IDebtRepository):
         models = result.scalars().all()
         return [self._to_entity(model) for model in models]
 
+    async def get_page_by_business(
+        self, business_id: str, limit: int = 100, cursor: Optional[str] = None
+    ) -> tuple[list[Debt], Optional[str]]:
+        """Get a keyset page of debts by business, ordered by (created_at, id)"""
+        stmt = keyset_page(
+            select(DebtModel).where(DebtModel.business_id == business_id), DebtModel, cursor, limit
+        )
+        result = await self.session.execute(stmt)
+        models, next_cursor = split_page(result.scalars().all(), limit)
+        return [self._to_entity(model) for model in models], next_cursor
+
+    async def count_by_business(self, business_id: str) -> int:
+        """Count debts by business"""
+        stmt = select(func.count()).select_from(DebtModel).where(DebtModel.business_id == business_id)
+        result = await self.session.execute(stmt)
+        return result.scalar() or 0
+
     
     async def get_unpaid_by_business(self, business_id: str) -> list[Debt]:
         """Get all unpaid debts by business"""
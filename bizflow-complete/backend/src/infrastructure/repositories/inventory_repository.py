@@ -1,19 +1,16 @@
 """Inventory Repository Implementation"""
-from typing import Optional
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from typing import Mapping, Optional
+from sqlalchemy import select, update, case, and_, func
+from ...application.exceptions import InsufficientInventoryException
 from ...domain.entities import Inventory
 from ...domain.repositories import IInventoryRepository
 from ..models import InventoryModel, ProductModel
+from .base import SessionRepository
 
 
-class InventoryRepository(IInventoryRepository):
+class InventoryRepository(SessionRepository, IInventoryRepository):
     """Inventory repository implementation"""
 
-    
-    def __init__(self, session: AsyncSession):
-        self.session = session
-
    
     async def get_by_id(self, inventory_id: str) -> Optional[Inventory]:
         """Get inventory by ID"""
@@ -35,16 +32,14 @@ class InventoryRepository(IInventoryRepository):
         """Create new inventory"""
         model = self._to_model(inventory)
         self.session.add(model)
-        await self.session.commit()
-        await self.session.refresh(model)
+        await self._commit(model)
         return self._to_entity(model)
 
     
     async def update(self, inventory: Inventory) -> Inventory:
         """Update inventory"""
         model = await self.session.merge(self._to_model(inventory))
-        await self.session.commit()
-        await self.session.refresh(model)
+        await self._commit(model)
         return self._to_entity(model)
 
     
@@ -55,7 +50,7 @@ class InventoryRepository(IInventoryRepository):
         model = result.scalar_one_or_none()
         if model:
             await self.session.delete(model)
-            await self.session.commit()
+            await self._commit()
             return True
         return False
 
@@ -90,18 +85,77 @@ class InventoryRepository(IInventoryRepository):
     
     async def update_quantity(self, product_id: str, quantity_change: float) -> Inventory:
         """Update inventory quantity"""
-        stmt = select(InventoryModel).where(InventoryModel.product_id == product_id)
+        # Applied in the UPDATE itself so concurrent changes can't overwrite each other
+        stmt = (
+            update(InventoryModel)
+            .where(InventoryModel.product_id == product_id)
+            .values(quantity=InventoryModel.quantity + quantity_change)
+            .returning(InventoryModel)
+            .execution_options(populate_existing=True)
+        )
         result = await self.session.execute(stmt)
         model = result.scalar_one_or_none()
         
         if model:
-            model.quantity += quantity_change
-            await self.session.commit()
-            await self.session.refresh(model)
+            await self._commit()
             return self._to_entity(model)
         
         raise ValueError(f"Inventory not found for product {product_id}")
 
+    async def decrement_stock(self, business_id: str, product_id: str, quantity: float) -> Inventory:
+        """Take quantity out of stock if, and only if, enough is available.
+
+        One conditional UPDATE ... WHERE quantity >= :q RETURNING, so two
+        checkouts racing for the last units can't both succeed.
+        """
+        return (await self.decrement_stock_bulk(business_id, {product_id: quantity}))[0]
+
+    async def decrement_stock_bulk(self, business_id: str, lines: Mapping[str, float]) -> list[Inventory]:
+        """Take every line of an order out of stock in one statement.
+
+        lines maps product_id -> quantity; quantities must be positive.
+        Only the business's own inventory rows are touched.
+        Either all lines are taken or none: the statement runs in a
+        SAVEPOINT, rolled back if any product is short, and
+        InsufficientInventoryException is raised for it.
+        """
+        wanted = {product_id: float(quantity) for product_id, quantity in lines.items()}
+        for product_id, quantity in wanted.items():
+            if not quantity > 0:
+                raise ValueError(f"Quantity for product {product_id} must be positive, got {quantity}")
+        if not wanted:
+            return []
+        per_product = case(wanted, value=InventoryModel.product_id)
+        stmt = (
+            update(InventoryModel)
+            .where(
+                InventoryModel.business_id == business_id,
+                InventoryModel.product_id.in_(wanted),
+                InventoryModel.quantity >= per_product,
+            )
+            .values(quantity=InventoryModel.quantity - per_product)
+            .returning(InventoryModel)
+            .execution_options(populate_existing=True)
+        )
+        savepoint = await self.session.begin_nested()
+        result = await self.session.execute(stmt)
+        models = result.scalars().all()
+        
+        taken = {model.product_id for model in models}
+        if len(taken) < len(wanted):
+            await savepoint.rollback()
+            short = next(product_id for product_id in wanted if product_id not in taken)
+            available = await self.session.execute(
+                select(InventoryModel.quantity).where(
+                    and_(InventoryModel.business_id == business_id, InventoryModel.product_id == short)
+                )
+            )
+            raise InsufficientInventoryException(short, wanted[short], available.scalar() or 0)
+        
+        await savepoint.commit()
+        await self._commit()
+        return [self._to_entity(model) for model in models]
+
     
     async def get_total_stock_value(self, business_id: str) -> float:
         """Calculate total stock value"""
@@ -1,18 +1,20 @@
 """Order Repository Implementation"""
+from collections import defaultdict
 from typing import Optional
 from datetime import datetime
-from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func
 from ...domain.entities import Order, OrderStatus, OrderItem
 from ...domain.repositories import IOrderRepository
 from ..models import OrderModel, OrderItemModel
+from ..pagination import keyset_page, split_page
+from .base import SessionRepository
 
+# Order ids per item query when loading a page of orders
+ITEMS_BATCH_SIZE = 500
 
-class OrderRepository(IOrderRepository):
-    """Order repository implementation"""
 
-    def __init__(self, session: AsyncSession):
-        self.session = session
+class OrderRepository(SessionRepository, IOrderRepository):
+    """Order repository implementation"""
 
     async def get_by_id(self, order_id: str) -> Optional[Order]:
         """Get order by ID"""
@@ -36,22 +38,11 @@ class OrderRepository(IOrderRepository):
         await self.session.flush()
         
         # Add order items
-        for item in order.items:
-            item_model = OrderItemModel(
-                id=item.id,
-                order_id=order.id,
-                product_id=item.product_id,
-                product_name=item.product_name,
-                quantity=item.quantity,
-                unit=item.unit,
-                unit_price=item.unit_price,
-                subtotal=item.subtotal,
-            )
-            self.session.add(item_model)
+        item_models = [self._item_model(order.id, item) for item in order.items]
+        self.session.add_all(item_models)
         
-        await self.session.commit()
-        await self.session.refresh(model)
-        return await self.get_by_id(model.id)
+        await self._commit()
+        return await self._written(model, item_models)
 
     async def update(self, order: Order) -> Order:
         """Update order"""
@@ -66,21 +57,11 @@ class OrderRepository(IOrderRepository):
             await self.session.delete(item_model)
         
         # Add new items
-        for item in order.items:
-            item_model = OrderItemModel(
-                id=item.id,
-                order_id=order.id,
-                product_id=item.product_id,
-                product_name=item.product_name,
-                quantity=item.quantity,
-                unit=item.unit,
-                unit_price=item.unit_price,
-                subtotal=item.subtotal,
-            )
-            self.session.add(item_model)
+        item_models = [self._item_model(order.id, item) for item in order.items]
+        self.session.add_all(item_models)
         
-        await self.session.commit()
-        return await self.get_by_id(order.id)
+        await self._commit()
+        return await self._written(model, item_models)
 
     async def delete(self, order_id: str) -> bool:
         """Delete order"""
@@ -96,7 +77,7 @@ class OrderRepository(IOrderRepository):
                 await self.session.delete(item_model)
             
             await self.session.delete(model)
-            await self.session.commit()
+            await self._commit()
             return True
         return False
 
@@ -111,16 +92,24 @@ class OrderRepository(IOrderRepository):
             .limit(limit)
         )
         result = await self.session.execute(stmt)
-        models = result.scalars().all()
-        
-        orders = []
-        for model in models:
-            items_stmt = select(OrderItemModel).where(OrderItemModel.order_id == model.id)
-            items_result = await self.session.execute(items_stmt)
-            items_models = items_result.scalars().all()
-            orders.append(self._to_entity(model, items_models))
-        
-        return orders
+        return await self._with_items(result.scalars().all())
+
+    async def get_page_by_business(
+        self, business_id: str, limit: int = 100, cursor: Optional[str] = None
+    ) -> tuple[list[Order], Optional[str]]:
+        """Get a keyset page of orders by business, ordered by (created_at, id)"""
+        stmt = keyset_page(
+            select(OrderModel).where(OrderModel.business_id == business_id), OrderModel, cursor, limit
+        )
+        result = await self.session.execute(stmt)
+        models, next_cursor = split_page(result.scalars().all(), limit)
+        return await self._with_items(models), next_cursor
+
+    async def count_by_business(self, business_id: str) -> int:
+        """Count orders by business"""
+        stmt = select(func.count()).select_from(OrderModel).where(OrderModel.business_id == business_id)
+        result = await self.session.execute(stmt)
+        return result.scalar() or 0
 
     async def get_by_status(
         self, business_id: str, status: str, skip: int = 0, limit: int = 100
@@ -136,16 +125,7 @@ class OrderRepository(IOrderRepository):
             .limit(limit)
         )
         result = await self.session.execute(stmt)
-        models = result.scalars().all()
-        
-        orders = []
-        for model in models:
-            items_stmt = select(OrderItemModel).where(OrderItemModel.order_id == model.id)
-            items_result = await self.session.execute(items_stmt)
-            items_models = items_result.scalars().all()
-            orders.append(self._to_entity(model, items_models))
-        
-        return orders
+        return await self._with_items(result.scalars().all())
 
     async def get_by_date_range(
         self, business_id: str, start_date: datetime, end_date: datetime
@@ -159,16 +139,7 @@ class OrderRepository(IOrderRepository):
             )
         )
         result = await self.session.execute(stmt)
-        models = result.scalars().all()
-        
-        orders = []
-        for model in models:
-            items_stmt = select(OrderItemModel).where(OrderItemModel.order_id == model.id)
-            items_result = await self.session.execute(items_stmt)
-            items_models = items_result.scalars().all()
-            orders.append(self._to_entity(model, items_models))
-        
-        return orders
+        return await self._with_items(result.scalars().all())
 
     async def get_by_customer(
         self, customer_id: str, skip: int = 0, limit: int = 100
@@ -181,16 +152,7 @@ class OrderRepository(IOrderRepository):
             .limit(limit)
         )
         result = await self.session.execute(stmt)
-        models = result.scalars().all()
-        
-        orders = []
-        for model in models:
-            items_stmt = select(OrderItemModel).where(OrderItemModel.order_id == model.id)
-            items_result = await self.session.execute(items_stmt)
-            items_models = items_result.scalars().all()
-            orders.append(self._to_entity(model, items_models))
-        
-        return orders
+        return await self._with_items(result.scalars().all())
 
     async def get_daily_revenue(self, business_id: str, date: datetime) -> float:
         """Calculate daily revenue"""
@@ -209,6 +171,52 @@ class OrderRepository(IOrderRepository):
         total = result.scalar()
         return float(total or 0)
 
+    async def get_revenue_summary(self, business_id: str) -> tuple[int, float]:
+        """Count and total of completed orders, aggregated in the database"""
+        stmt = select(func.count(), func.sum(OrderModel.total_amount)).where(
+            and_(
+                OrderModel.business_id == business_id,
+                OrderModel.status == OrderStatus.COMPLETED.value,
+            )
+        )
+        count, total = (await self.session.execute(stmt)).one()
+        return count or 0, float(total or 0)
+
+    async def _with_items(self, models: list[OrderModel]) -> list[Order]:
+        """Load the items of all orders in batched IN queries and convert to entities"""
+        items_by_order: dict[str, list[OrderItemModel]] = defaultdict(list)
+        order_ids = [model.id for model in models]
+        # Chunked to stay under the bound-parameter limit of SQLite and friends
+        for start in range(0, len(order_ids), ITEMS_BATCH_SIZE):
+            items_stmt = select(OrderItemModel).where(
+                OrderItemModel.order_id.in_(order_ids[start:start + ITEMS_BATCH_SIZE])
+            )
+            items_result = await self.session.execute(items_stmt)
+            for item_model in items_result.scalars():
+                items_by_order[item_model.order_id].append(item_model)
+        
+        return [self._to_entity(model, items_by_order[model.id]) for model in models]
+
+    async def _written(self, model: OrderModel, items_models: list[OrderItemModel]) -> Order:
+        """The order just written: read back after a commit (which expired
+        it), straight from the flushed models inside a unit of work"""
+        if self.auto_commit:
+            return await self.get_by_id(model.id)
+        return self._to_entity(model, items_models)
+
+    @staticmethod
+    def _item_model(order_id: str, item: OrderItem) -> OrderItemModel:
+        return OrderItemModel(
+            id=item.id,
+            order_id=order_id,
+            product_id=item.product_id,
+            product_name=item.product_name,
+            quantity=item.quantity,
+            unit=item.unit,
+            unit_price=item.unit_price,
+            subtotal=item.subtotal,
+        )
+
     @staticmethod
     def _to_entity(model: OrderModel, items_models: list[OrderItemModel]) -> Order:
         """Convert model to entity"""
@@ -228,7 +236,6 @@ class OrderRepository(IOrderRepository):
         
         return Order(
             id=model.id,
-            order_number=model.order_number,
             business_id=model.business_id,
             customer_id=model.customer_id,
             customer_name=model.customer_name or "",
@@ -250,7 +257,6 @@ class OrderRepository(IOrderRepository):
         """Convert entity to model"""
         return OrderModel(
             id=entity.id,
-            order_number=entity.order_number,
             business_id=entity.business_id,
             customer_id=entity.customer_id,
             customer_name=entity.customer_name,
@@ -1,18 +1,16 @@
 """Product Repository Implementation"""
 from typing import Optional
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from ...domain.entities import Product
 from ...domain.repositories import IProductRepository
 from ..models import ProductModel
+from ..pagination import keyset_page, split_page
+from .base import SessionRepository
 
 
-class ProductRepository(IProductRepository):
+class ProductRepository(SessionRepository, IProductRepository):
     """Product repository implementation"""
 
-    def __init__(self, session: AsyncSession):
-        self.session = session
-
     async def get_by_id(self, product_id: str) -> Optional[Product]:
         """Get product by ID"""
         stmt = select(ProductModel).where(ProductModel.id == product_id)
@@ -33,15 +31,13 @@ class ProductRepository(IProductRepository):
         """Create new product"""
         model = self._to_model(product)
         self.session.add(model)
-        await self.session.commit()
-        await self.session.refresh(model)
+        await self._commit(model)
         return self._to_entity(model)
 
     async def update(self, product: Product) -> Product:
         """Update product"""
         model = await self.session.merge(self._to_model(product))
-        await self.session.commit()
-        await self.session.refresh(model)
+        await self._commit(model)
         return self._to_entity(model)
 
     async def delete(self, product_id: str) -> bool:
@@ -51,7 +47,7 @@ class ProductRepository(IProductRepository):
         model = result.scalar_one_or_none()
         if model:
             await self.session.delete(model)
-            await self.session.commit()
+            await self._commit()
             return True
         return False
 
@@ -69,6 +65,23 @@ class ProductRepository(IProductRepository):
         models = result.scalars().all()
         return [self._to_entity(model) for model in models]
 
+    async def get_page_by_business(
+        self, business_id: str, limit: int = 100, cursor: Optional[str] = None
+    ) -> tuple[list[Product], Optional[str]]:
+        """Get a keyset page of products by business, ordered by (created_at, id)"""
+        stmt = keyset_page(
+            select(ProductModel).where(ProductModel.business_id == business_id), ProductModel, cursor, limit
+        )
+        result = await self.session.execute(stmt)
+        models, next_cursor = split_page(result.scalars().all(), limit)
+        return [self._to_entity(model) for model in models], next_cursor
+
+    async def count_by_business(self, business_id: str) -> int:
+        """Count products by business"""
+        stmt = select(func.count()).select_from(ProductModel).where(ProductModel.business_id == business_id)
+        result = await self.session.execute(stmt)
+        return result.scalar() or 0
+
     async def get_by_category(
         self, business_id: str, category: str, skip: int = 0, limit: int = 100
     ) -> list[Product]:
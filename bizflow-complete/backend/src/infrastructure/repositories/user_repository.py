@@ -1,18 +1,16 @@
 """User Repository Implementation"""
 from typing import Optional
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from ...domain.entities import User, UserRole
 from ...domain.repositories import IUserRepository
 from ..models import UserModel
+from ..pagination import keyset_page, split_page
+from .base import SessionRepository
 
 
-class UserRepository(IUserRepository):
+class UserRepository(SessionRepository, IUserRepository):
     """User repository implementation"""
 
-    def __init__(self, session: AsyncSession):
-        self.session = session
-
     async def get_by_id(self, user_id: str) -> Optional[User]:
         """Get user by ID"""
         stmt = select(UserModel).where(UserModel.id == user_id)
@@ -38,15 +36,13 @@ class UserRepository(IUserRepository):
         """Create new user"""
         model = self._to_model(user)
         self.session.add(model)
-        await self.session.commit()
-        await self.session.refresh(model)
+        await self._commit(model)
         return self._to_entity(model)
 
     async def update(self, user: User) -> User:
         """Update user"""
         model = await self.session.merge(self._to_model(user))
-        await self.session.commit()
-        await self.session.refresh(model)
+        await self._commit(model)
         return self._to_entity(model)
 
     async def delete(self, user_id: str) -> bool:
@@ -56,7 +52,7 @@ class UserRepository(IUserRepository):
         model = result.scalar_one_or_none()
         if model:
             await self.session.delete(model)
-            await self.session.commit()
+            await self._commit()
             return True
         return False
 
@@ -72,6 +68,23 @@ class UserRepository(IUserRepository):
         models = result.scalars().all()
         return [self._to_entity(model) for model in models]
 
+    async def get_page_by_business(
+        self, business_id: str, limit: int = 100, cursor: Optional[str] = None
+    ) -> tuple[list[User], Optional[str]]:
+        """Get a keyset page of users by business, ordered by (created_at, id)"""
+        stmt = keyset_page(
+            select(UserModel).where(UserModel.business_id == business_id), UserModel, cursor, limit
+        )
+        result = await self.session.execute(stmt)
+        models, next_cursor = split_page(result.scalars().all(), limit)
+        return [self._to_entity(model) for model in models], next_cursor
+
+    async def count_by_business(self, business_id: str) -> int:
+        """Count users by business"""
+        stmt = select(func.count()).select_from(UserModel).where(UserModel.business_id == business_id)
+        result = await self.session.execute(stmt)
+        return result.scalar() or 0
+
     @staticmethod
     def _to_entity(model: UserModel) -> User:
         """Convert model to entity"""
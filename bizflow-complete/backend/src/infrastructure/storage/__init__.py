@@ -0,0 +1,39 @@
+"""Storage backends for the api_routes services.
+
+STORAGE_BACKEND selects where records live: "memory" (default) keeps them
+in the worker process, "sql" keeps them in the DATABASE_URL database so
+every worker shares them.
+"""
+import logging
+import os
+
+from .base import Record, RecordCollection, StorageBackend, UserDirectory
+from .memory import MemoryBackend, MemoryCollection, MemoryUserDirectory
+
+logger = logging.getLogger(__name__)
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "memory").lower()
+
+
+def build_storage(memory_backend: MemoryBackend, kind: str = STORAGE_BACKEND) -> StorageBackend:
+    """Backend named by kind; memory_backend serves "memory" (and unknown kinds)"""
+    if kind == "sql":
+        from ..database import AsyncSessionLocal
+        from .sql import SQLBackend
+        return SQLBackend(AsyncSessionLocal)
+    if kind != "memory":
+        logger.warning("Unknown STORAGE_BACKEND %r; keeping records in memory", kind)
+    return memory_backend
+
+
+__all__ = [
+    "Record",
+    "RecordCollection",
+    "UserDirectory",
+    "StorageBackend",
+    "MemoryBackend",
+    "MemoryCollection",
+    "MemoryUserDirectory",
+    "STORAGE_BACKEND",
+    "build_storage",
+]
@@ -0,0 +1,187 @@
+"""Storage backend interface behind the api_routes services"""
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+Record = Dict[str, Any]
+# Computes the changes to a record from its current contents
+Change = Callable[[Record], Mapping[str, Any]]
+
+
+class RecordCollection(ABC):
+    """Records of one kind (products, orders, ...), partitioned by store.
+
+    Records are JSON-ready dicts keyed by their "id" and listed in
+    (created_at, id) order. Criteria are equality filters on record fields
+    (or fields an implementation derives, such as an order's "day"); None
+    criteria are ignored so optional query params can pass through.
+
+    Returned records may be live (in memory) or copies (SQL): callers must
+    write through the collection, never by mutating a record they read.
+    """
+
+    @abstractmethod
+    async def get(self, store_id: str, record_id: Optional[str]) -> Optional[Record]:
+        """Record by id, or None"""
+        pass
+
+    @abstractmethod
+    async def get_many(self, store_id: str, record_ids: Iterable[str]) -> Dict[str, Record]:
+        """Records by id in one read; ids with no record are left out"""
+        pass
+
+    @abstractmethod
+    async def add(self, store_id: str, record: Record) -> Record:
+        """Insert a record, or replace the one with its id"""
+        pass
+
+    @abstractmethod
+    async def update(self, store_id: str, record_id: str, changes: Mapping[str, Any]) -> Optional[Record]:
+        """Apply changes to a record and return it, or None if missing"""
+        pass
+
+    @abstractmethod
+    async def modify(self, store_id: str, record_id: str, change: Change) -> Optional[Tuple[Record, Record]]:
+        """Atomically read a record, compute changes from it and apply them.
+
+        change gets a copy of the current record while no other writer can
+        touch it, and may raise to abort. Returns (before, after), or None
+        if the record is missing.
+        """
+        pass
+
+    @abstractmethod
+    async def remove(self, store_id: str, record_id: str) -> Optional[Record]:
+        """Delete a record and return it, or None if missing"""
+        pass
+
+    @abstractmethod
+    async def find(self, store_id: str, skip: int = 0, limit: Optional[int] = None,
+                   **criteria: Any) -> List[Record]:
+        """Matching records in order, sliced by skip/limit"""
+        pass
+
+    @abstractmethod
+    async def paginate(self, store_id: str, skip: int = 0, limit: int = 50,
+                       cursor: Optional[str] = None, with_total: bool = True,
+                       **criteria: Any) -> Dict[str, Any]:
+        """{"items", "total", "next_cursor"} page of matching records.
+
+        With a cursor the page starts after the record it points at and skip
+        is ignored. Counting the matches can cost as much as a scan, so the
+        total is None unless with_total. Raises InvalidCursorError for a
+        cursor that can't be decoded.
+        """
+        pass
+
+    @abstractmethod
+    async def count(self, store_id: str, **criteria: Any) -> int:
+        """Number of matching records"""
+        pass
+
+    @abstractmethod
+    async def adjust(self, store_id: str, deltas: Mapping[str, Mapping[str, float]],
+                     floor: Optional[float] = None, create: bool = False) -> Dict[str, Record]:
+        """Atomically add deltas to numeric fields of several records.
+
+        deltas maps record id -> field -> amount. With floor, results below
+        it are clamped to it. Missing records are skipped, or with create
+        inserted with the deltas as their values. Returns the records after
+        the change, by id.
+        """
+        pass
+
+    @abstractmethod
+    async def replace(self, store_id: str, records: Iterable[Record]) -> None:
+        """Swap all of a store's records for the given ones"""
+        pass
+
+    @abstractmethod
+    async def reserve_sequence(self, store_id: str) -> int:
+        """Number of records ever added to the store, for generating ids.
+
+        Never hands out a number twice to writers that each add a record
+        after reserving it, even across workers.
+        """
+        pass
+
+    @abstractmethod
+    async def version(self, store_id: str) -> str:
+        """Token that changes with every write to the store's records"""
+        pass
+
+    @abstractmethod
+    async def growth(self, store_id: str) -> Tuple[str, int]:
+        """(rewrite token, records added) of the store, for append-only readers.
+
+        The token changes whenever a record is changed or removed, but not
+        when a new one is added; the count goes up by one per added record.
+        While the token holds, the store has only grown, by the difference
+        in counts.
+        """
+        pass
+
+    @abstractmethod
+    async def store_ids(self) -> List[str]:
+        """Every store that has held records of this kind"""
+        pass
+
+
+class UserDirectory(ABC):
+    """User accounts keyed by lowercased email"""
+
+    @abstractmethod
+    async def get(self, email: str) -> Optional[Record]:
+        """User by email, or None"""
+        pass
+
+    @abstractmethod
+    async def add(self, user: Record) -> bool:
+        """Insert a user; False if the email is taken"""
+        pass
+
+    @abstractmethod
+    async def update(self, email: str, changes: Mapping[str, Any],
+                     remove: Iterable[str] = ()) -> Optional[Record]:
+        """Apply changes (and drop the fields in remove); None if missing"""
+        pass
+
+    @abstractmethod
+    async def reserve_sequence(self) -> int:
+        """Number of users ever registered, for generating user/store ids"""
+        pass
+
+
+class StorageBackend(ABC):
+    """The collections the services keep their state in"""
+
+    name = ""
+    products: RecordCollection
+    customers: RecordCollection
+    orders: RecordCollection
+    debts: RecordCollection
+    journal: RecordCollection
+    # Running per-customer order totals; records are keyed by customer id
+    customer_totals: RecordCollection
+    # Sales totals by day/month bucket (see SalesRollups)
+    sales_rollups: RecordCollection
+    # Quantity and revenue sold per product, one record per bucket (see ProductSales)
+    product_sales: RecordCollection
+    # Auth state every worker must see, partitioned by kind (see JWTAuthenticator)
+    tokens: RecordCollection
+    users: UserDirectory
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """Commit the writes made inside the block together, or none of them.
+
+        Collections called in the block join the transaction; nested blocks
+        join the outer one.
+        """
+        yield
+
+    async def start(self) -> None:
+        """Prepare the backend (create tables, ...)"""
+
+    async def close(self) -> None:
+        """Release connections"""
@@ -0,0 +1,157 @@
+"""In-process storage backend over EntityStore (one worker, no persistence)"""
+import copy
+import os
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from ..entity_store import EntityStore
+from .base import Change, Record, RecordCollection, StorageBackend, UserDirectory
+
+# Versions restart with the process; tagging them keeps a version seen
+# before a restart from matching the new data
+_PROCESS_TAG = os.urandom(4).hex()
+
+
+class MemoryCollection(RecordCollection):
+    """RecordCollection over an EntityStore's per-store collections"""
+
+    def __init__(self, stores: EntityStore):
+        self.stores = stores
+
+    async def get(self, store_id: str, record_id: Optional[str]) -> Optional[Record]:
+        return self.stores.collection(store_id).get(record_id)
+
+    async def get_many(self, store_id: str, record_ids: Iterable[str]) -> Dict[str, Record]:
+        records = self.stores.collection(store_id)
+        return {record_id: records.get(record_id) for record_id in record_ids if record_id in records}
+
+    async def add(self, store_id: str, record: Record) -> Record:
+        return self.stores.collection(store_id, create=True).add(record)
+
+    async def update(self, store_id: str, record_id: str, changes: Mapping[str, Any]) -> Optional[Record]:
+        return self.stores.collection(store_id).update(record_id, dict(changes))
+
+    async def modify(self, store_id: str, record_id: str, change: Change) -> Optional[Tuple[Record, Record]]:
+        # No await between the read and the write, so no other writer runs
+        records = self.stores.collection(store_id)
+        record = records.get(record_id)
+        if record is None:
+            return None
+        before = copy.deepcopy(record)
+        return before, records.update(record_id, dict(change(copy.deepcopy(before))))
+
+    async def remove(self, store_id: str, record_id: str) -> Optional[Record]:
+        return self.stores.collection(store_id).remove(record_id)
+
+    async def find(self, store_id: str, skip: int = 0, limit: Optional[int] = None,
+                   **criteria: Any) -> List[Record]:
+        return self.stores.collection(store_id).find(skip, limit, **criteria)
+
+    async def paginate(self, store_id: str, skip: int = 0, limit: int = 50,
+                       cursor: Optional[str] = None, with_total: bool = True,
+                       **criteria: Any) -> Dict[str, Any]:
+        return self.stores.collection(store_id).paginate(skip, limit, cursor, with_total, **criteria)
+
+    async def count(self, store_id: str, **criteria: Any) -> int:
+        return self.stores.collection(store_id).count(**criteria)
+
+    async def adjust(self, store_id: str, deltas: Mapping[str, Mapping[str, float]],
+                     floor: Optional[float] = None, create: bool = False) -> Dict[str, Record]:
+        records = self.stores.collection(store_id, create=create)
+        changed = {}
+        rewrote = False
+        for record_id, fields in deltas.items():
+            record = records.get(record_id)
+            if record is None:
+                if not create:
+                    continue
+                record = records.add({"id": record_id, **{field: 0 for field in fields}})
+            else:
+                rewrote = True
+            for field, amount in fields.items():
+                value = (record.get(field) or 0) + amount
+                record[field] = value if floor is None else max(floor, value)
+            changed[record_id] = record
+        if rewrote:
+            records.touch()
+        return changed
+
+    async def replace(self, store_id: str, records: Iterable[Record]) -> None:
+        self.stores[store_id] = list(records)
+
+    async def reserve_sequence(self, store_id: str) -> int:
+        # add() advances the sequence as well, so hand out the next number
+        # past both: ids reserved before their records are added stay unique
+        records = self.stores.collection(store_id, create=True)
+        records.reserved = max(records.reserved, records.sequence) + 1
+        return records.reserved - 1
+
+    async def version(self, store_id: str) -> str:
+        return f"{_PROCESS_TAG}.{self.stores.version(store_id)}"
+
+    async def growth(self, store_id: str) -> Tuple[str, int]:
+        found = self.stores.get(store_id)
+        if found is None:
+            return f"{_PROCESS_TAG}.0", 0
+        return f"{_PROCESS_TAG}.{found.rewritten}", found.sequence
+
+    async def store_ids(self) -> List[str]:
+        return list(self.stores)
+
+
+class MemoryUserDirectory(UserDirectory):
+    """UserDirectory over a dict of email -> user"""
+
+    def __init__(self, users: Dict[str, Record]):
+        self.users = users
+
+    async def get(self, email: str) -> Optional[Record]:
+        return self.users.get(email.lower())
+
+    async def add(self, user: Record) -> bool:
+        email = user["email"].lower()
+        if email in self.users:
+            return False
+        self.users[email] = user
+        return True
+
+    async def update(self, email: str, changes: Mapping[str, Any],
+                     remove: Iterable[str] = ()) -> Optional[Record]:
+        user = self.users.get(email.lower())
+        if user is None:
+            return None
+        user.update(changes)
+        for field in remove:
+            user.pop(field, None)
+        return user
+
+    async def reserve_sequence(self) -> int:
+        return len(self.users)
+
+
+class MemoryBackend(StorageBackend):
+    """Every collection held in this process.
+
+    Built over the module-level mock stores, so seeding them directly
+    (demo data, tests) keeps working. Each worker gets its own copy: only
+    for development and single-worker deployments. transaction() does not
+    roll back: each call is atomic on its own, but a block that raises
+    half-way keeps the writes it made.
+    """
+
+    name = "memory"
+
+    def __init__(self, products: EntityStore, customers: EntityStore, orders: EntityStore,
+                 debts: EntityStore, journal: EntityStore, customer_totals: EntityStore,
+                 sales_rollups: EntityStore, product_sales: EntityStore, tokens: EntityStore,
+                 users: Dict[str, Record]):
+        self.products = MemoryCollection(products)
+        self.customers = MemoryCollection(customers)
+        self.orders = MemoryCollection(orders)
+        self.debts = MemoryCollection(debts)
+        self.journal = MemoryCollection(journal)
+        self.customer_totals = MemoryCollection(customer_totals)
+        self.sales_rollups = MemoryCollection(sales_rollups)
+        self.product_sales = MemoryCollection(product_sales)
+        self.tokens = MemoryCollection(tokens)
+        self.users = MemoryUserDirectory(users)
+
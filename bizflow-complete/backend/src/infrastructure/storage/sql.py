@@ -0,0 +1,367 @@
+"""SQL storage backend: service records as JSON rows shared by every worker"""
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import BindParameter
+from sqlalchemy.sql.visitors import replacement_traverse
+
+from ..models import RecordModel, RecordScopeModel
+from ..pagination import created_at_key, decode_cursor, encode_cursor
+from .base import Change, Record, RecordCollection, StorageBackend, UserDirectory
+
+SessionFactory = Callable[[], AsyncSession]
+# Builds the SQL expression of a derived criterion from the JSON data column
+Derived = Callable[[Any], Any]
+
+# Session of the SQLBackend.transaction() block the current task is in,
+# with the factory it came from (so another backend doesn't join it)
+_ambient: ContextVar[Optional[Tuple[SessionFactory, AsyncSession]]] = ContextVar("sql_storage_session", default=None)
+
+
+@asynccontextmanager
+async def _session(sessions: SessionFactory) -> AsyncIterator[AsyncSession]:
+    """The enclosing transaction's session, or a new one committed on exit"""
+    ambient = _ambient.get()
+    if ambient is not None and ambient[0] is sessions:
+        yield ambient[1]
+        return
+    async with sessions() as session, session.begin():
+        yield session
+
+
+class SQLCollection(RecordCollection):
+    """RecordCollection stored in the records table.
+
+    Each record is one row keyed by (collection, store_id, id) with its
+    JSON in data and its normalized created_at in sort_key, so listings and
+    cursors follow the same (created_at, id) order as the in-memory
+    collections. Criteria compare string fields extracted from the JSON.
+    Every write bumps the store's version in record_scopes in the same
+    transaction. Read-modify-writes claim the rows they change with a no-op
+    UPDATE before reading them: a row lock where the database has them, the
+    database write lock on SQLite (whose SELECT ... FOR UPDATE is a no-op),
+    so a concurrent writer waits instead of overwriting what it read.
+    """
+
+    def __init__(self, sessions: SessionFactory, name: str, derived: Optional[Dict[str, Derived]] = None):
+        self.sessions = sessions
+        self.name = name
+        self.derived = dict(derived or {})
+
+    async def get(self, store_id: str, record_id: Optional[str]) -> Optional[Record]:
+        if record_id is None:
+            return None
+        async with _session(self.sessions) as session:
+            result = await session.execute(select(RecordModel.data).where(self._key(store_id, record_id)))
+            return result.scalar_one_or_none()
+
+    async def get_many(self, store_id: str, record_ids: Iterable[str]) -> Dict[str, Record]:
+        record_ids = {record_id for record_id in record_ids if record_id is not None}
+        if not record_ids:
+            return {}
+        async with _session(self.sessions) as session:
+            stmt = select(RecordModel.id, RecordModel.data).where(
+                and_(self._scope(store_id), RecordModel.id.in_(record_ids))
+            )
+            return {row.id: row.data for row in await session.execute(stmt)}
+
+    async def add(self, store_id: str, record: Record) -> Record:
+        record = dict(record)
+        async with _session(self.sessions) as session:
+            row = await self._row(session, store_id, record["id"])
+            if row is None:
+                session.add(RecordModel(collection=self.name, store_id=store_id, id=record["id"],
+                                        sort_key=created_at_key(record), data=record))
+                await self._touch(session, store_id, added=1, rewrote=False)
+            else:
+                row.data, row.sort_key = record, created_at_key(record)
+                await self._touch(session, store_id)
+        return record
+
+    async def update(self, store_id: str, record_id: str, changes: Mapping[str, Any]) -> Optional[Record]:
+        async with _session(self.sessions) as session:
+            row = await self._row(session, store_id, record_id)
+            if row is None:
+                return None
+            record = {**row.data, **changes}
+            row.data, row.sort_key = record, created_at_key(record)
+            await self._touch(session, store_id)
+        return record
+
+    async def modify(self, store_id: str, record_id: str, change: Change) -> Optional[Tuple[Record, Record]]:
+        async with _session(self.sessions) as session:
+            row = await self._row(session, store_id, record_id)
+            if row is None:
+                return None
+            before = row.data
+            record = {**before, **change(dict(before))}
+            row.data, row.sort_key = record, created_at_key(record)
+            await self._touch(session, store_id)
+        return before, record
+
+    async def remove(self, store_id: str, record_id: str) -> Optional[Record]:
+        async with _session(self.sessions) as session:
+            row = await self._row(session, store_id, record_id)
+            if row is None:
+                return None
+            record = row.data
+            await session.delete(row)
+            await self._touch(session, store_id)
+        return record
+
+    async def find(self, store_id: str, skip: int = 0, limit: Optional[int] = None,
+                   **criteria: Any) -> List[Record]:
+        stmt = self._ordered(store_id, criteria).offset(skip)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        async with _session(self.sessions) as session:
+            return list((await session.execute(stmt)).scalars())
+
+    async def paginate(self, store_id: str, skip: int = 0, limit: int = 50,
+                       cursor: Optional[str] = None, with_total: bool = True,
+                       **criteria: Any) -> Dict[str, Any]:
+        after = decode_cursor(cursor)
+        stmt = self._ordered(store_id, criteria, RecordModel.sort_key, RecordModel.id)
+        if after is not None:
+            sort_key, record_id = after
+            # The redundant >= bound lets the database seek the index
+            stmt = stmt.where(and_(
+                RecordModel.sort_key >= sort_key,
+                or_(RecordModel.sort_key > sort_key, RecordModel.id > record_id),
+            ))
+        else:
+            stmt = stmt.offset(skip)
+        async with _session(self.sessions) as session:
+            # One extra row tells whether another page follows
+            rows = (await session.execute(stmt.limit(limit + 1))).all()
+            total = await self._count(session, store_id, criteria) if with_total else None
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].sort_key, rows[-1].id)
+        return {"items": [row.data for row in rows], "total": total, "next_cursor": next_cursor}
+
+    async def count(self, store_id: str, **criteria: Any) -> int:
+        async with _session(self.sessions) as session:
+            return await self._count(session, store_id, criteria)
+
+    async def adjust(self, store_id: str, deltas: Mapping[str, Mapping[str, float]],
+                     floor: Optional[float] = None, create: bool = False) -> Dict[str, Record]:
+        if not deltas:
+            return {}
+        changed: Dict[str, Record] = {}
+        created = 0
+        async with _session(self.sessions) as session:
+            rows = and_(self._scope(store_id), RecordModel.id.in_(list(deltas)))
+            await self._claim(session, rows)
+            stmt = select(RecordModel).where(rows).with_for_update()
+            rows = {row.id: row for row in (await session.execute(stmt)).scalars()}
+            for record_id, fields in deltas.items():
+                row = rows.get(record_id)
+                if row is None and not create:
+                    continue
+                record = dict(row.data) if row is not None else {"id": record_id}
+                for field, amount in fields.items():
+                    value = (record.get(field) or 0) + amount
+                    record[field] = value if floor is None else max(floor, value)
+                if row is None:
+                    session.add(RecordModel(collection=self.name, store_id=store_id, id=record_id,
+                                            sort_key=created_at_key(record), data=record))
+                    created += 1
+                else:
+                    row.data = record
+                changed[record_id] = record
+            if changed:
+                await self._touch(session, store_id, added=created, rewrote=len(changed) > created)
+        return changed
+
+    async def replace(self, store_id: str, records: Iterable[Record]) -> None:
+        records = [dict(record) for record in records]
+        async with _session(self.sessions) as session:
+            await session.execute(delete(RecordModel).where(self._scope(store_id)))
+            session.add_all(
+                RecordModel(collection=self.name, store_id=store_id, id=record["id"],
+                            sort_key=created_at_key(record), data=record)
+                for record in records
+            )
+            # Keep the sequence past every id handed out before the swap
+            sequence = RecordScopeModel.sequence
+            await self._touch(session, store_id, sequence=case((sequence < len(records), len(records)), else_=sequence))
+
+    async def reserve_sequence(self, store_id: str) -> int:
+        async with _session(self.sessions) as session:
+            await self._touch(session, store_id, bump=False, sequence=RecordScopeModel.sequence + 1)
+            sequence = await session.scalar(select(RecordScopeModel.sequence).where(self._scope_row(store_id)))
+        return sequence - 1
+
+    async def version(self, store_id: str) -> str:
+        async with _session(self.sessions) as session:
+            version = await session.scalar(select(RecordScopeModel.version).where(self._scope_row(store_id)))
+        return str(version or 0)
+
+    async def growth(self, store_id: str) -> Tuple[str, int]:
+        async with _session(self.sessions) as session:
+            row = (await session.execute(
+                select(RecordScopeModel.rewritten, RecordScopeModel.inserted).where(self._scope_row(store_id))
+            )).first()
+        if row is None:
+            return "0", 0
+        return str(row.rewritten or 0), row.inserted or 0
+
+    async def store_ids(self) -> List[str]:
+        stmt = select(RecordModel.store_id).where(RecordModel.collection == self.name).distinct()
+        async with _session(self.sessions) as session:
+            return list((await session.execute(stmt)).scalars())
+
+    def _scope(self, store_id: str):
+        return and_(RecordModel.collection == self.name, RecordModel.store_id == store_id)
+
+    def _key(self, store_id: str, record_id: str):
+        return and_(self._scope(store_id), RecordModel.id == record_id)
+
+    def _scope_row(self, store_id: str):
+        return and_(RecordScopeModel.collection == self.name, RecordScopeModel.store_id == store_id)
+
+    def _field(self, name: str):
+        derive = self.derived.get(name)
+        if derive:
+            return derive(RecordModel.data)
+        # The JSON path goes into the SQL text rather than a parameter, so
+        # the criterion matches expression indexes on the field
+        return replacement_traverse(
+            RecordModel.data[name].as_string(), {},
+            lambda element: element.render_literal_execute() if isinstance(element, BindParameter) else None,
+        )
+
+    def _filtered(self, stmt, store_id: str, criteria: Mapping[str, Any]):
+        stmt = stmt.where(self._scope(store_id))
+        for name, value in criteria.items():
+            if value is not None:
+                stmt = stmt.where(self._field(name) == value)
+        return stmt
+
+    def _ordered(self, store_id: str, criteria: Mapping[str, Any], *columns):
+        stmt = select(*columns, RecordModel.data) if columns else select(RecordModel.data)
+        return self._filtered(stmt, store_id, criteria).order_by(RecordModel.sort_key, RecordModel.id)
+
+    async def _count(self, session: AsyncSession, store_id: str, criteria: Mapping[str, Any]) -> int:
+        stmt = self._filtered(select(func.count()).select_from(RecordModel), store_id, criteria)
+        return (await session.scalar(stmt)) or 0
+
+    async def _row(self, session: AsyncSession, store_id: str, record_id: str) -> Optional[RecordModel]:
+        await self._claim(session, self._key(store_id, record_id))
+        stmt = select(RecordModel).where(self._key(store_id, record_id)).with_for_update()
+        return (await session.execute(stmt)).scalar_one_or_none()
+
+    @staticmethod
+    async def _claim(session: AsyncSession, where) -> None:
+        """Write-lock rows before they are read for a read-modify-write"""
+        stmt = update(RecordModel).where(where).values(sort_key=RecordModel.sort_key)
+        await session.execute(stmt.execution_options(synchronize_session=False))
+
+    async def _touch(self, session: AsyncSession, store_id: str, bump: bool = True,
+                     added: int = 0, rewrote: bool = True, **values: Any) -> None:
+        """Update the store's scope row (bumping its version), creating it first if needed
+
+        ``added`` counts newly inserted records; ``rewrote`` marks that existing
+        records were changed or removed, which is what ``growth`` reports.
+        """
+        if bump:
+            values["version"] = RecordScopeModel.version + 1
+            if added:
+                values["inserted"] = RecordScopeModel.inserted + added
+            if rewrote:
+                values["rewritten"] = RecordScopeModel.rewritten + 1
+        stmt = update(RecordScopeModel).where(self._scope_row(store_id)).values(**values)
+        if (await session.execute(stmt)).rowcount:
+            return
+        await session.flush()
+        try:
+            async with session.begin_nested():
+                session.add(RecordScopeModel(collection=self.name, store_id=store_id, sequence=0, version=0,
+                                             inserted=0, rewritten=0))
+        except IntegrityError:
+            pass  # Another worker created it first
+        await session.execute(stmt)
+
+
+class SQLUserDirectory(UserDirectory):
+    """UserDirectory in the records table, one row per email"""
+
+    SCOPE = ""
+
+    def __init__(self, sessions: SessionFactory):
+        self.sessions = sessions
+        self.records = SQLCollection(sessions, "users")
+
+    async def get(self, email: str) -> Optional[Record]:
+        return await self.records.get(self.SCOPE, email.lower())
+
+    async def add(self, user: Record) -> bool:
+        email = user["email"].lower()
+        try:
+            async with _session(self.sessions) as session:
+                session.add(RecordModel(collection=self.records.name, store_id=self.SCOPE, id=email,
+                                        sort_key=created_at_key(user), data=dict(user)))
+                await session.flush()
+                await self.records._touch(session, self.SCOPE)
+        except IntegrityError:
+            return False
+        return True
+
+    async def update(self, email: str, changes: Mapping[str, Any],
+                     remove: Iterable[str] = ()) -> Optional[Record]:
+        async with _session(self.sessions) as session:
+            row = await self.records._row(session, self.SCOPE, email.lower())
+            if row is None:
+                return None
+            user = {**row.data, **changes}
+            for field in remove:
+                user.pop(field, None)
+            row.data = user
+            await self.records._touch(session, self.SCOPE)
+        return user
+
+    async def reserve_sequence(self) -> int:
+        return await self.records.reserve_sequence(self.SCOPE)
+
+
+def _order_day(data):
+    """SQL for an order's calendar day, as the in-memory "day" index derives it"""
+    return func.substr(data["created_at"].as_string(), 1, 10)
+
+
+class SQLBackend(StorageBackend):
+    """Every collection in the application database, shared by all workers"""
+
+    name = "sql"
+
+    def __init__(self, sessions: SessionFactory):
+        self.sessions = sessions
+        self.products = SQLCollection(sessions, "products")
+        self.customers = SQLCollection(sessions, "customers")
+        self.orders = SQLCollection(sessions, "orders", derived={"day": _order_day})
+        self.debts = SQLCollection(sessions, "debts")
+        self.journal = SQLCollection(sessions, "journal")
+        self.customer_totals = SQLCollection(sessions, "customer_totals")
+        self.sales_rollups = SQLCollection(sessions, "sales_rollups")
+        self.product_sales = SQLCollection(sessions, "product_sales")
+        self.tokens = SQLCollection(sessions, "tokens")
+        self.users = SQLUserDirectory(sessions)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        ambient = _ambient.get()
+        if ambient is not None and ambient[0] is self.sessions:
+            yield
+            return
+        async with self.sessions() as session, session.begin():
+            token = _ambient.set((self.sessions, session))
+            try:
+                yield
+            finally:
+                _ambient.reset(token)
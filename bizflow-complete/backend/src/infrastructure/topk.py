@@ -0,0 +1,85 @@
+"""Top-k helpers: exact over counters, approximate over a stream.
+
+``top_k`` picks the k largest counters with a heap, without sorting
+them all. ``HeavyHitters`` keeps an approximate top-k of a stream of
+(key, amount) pairs in fixed memory: amounts go into a count-min sketch
+and a k-entry min-heap holds the keys with the largest estimates.
+"""
+import hashlib
+import heapq
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+Ranked = List[Tuple[str, float]]
+
+
+def top_k(counters: Iterable[Tuple[str, float]], k: int) -> Ranked:
+    """The k (key, value) pairs with the largest values, largest first"""
+    return heapq.nlargest(k, counters, key=lambda pair: pair[1])
+
+
+class CountMinSketch:
+    """Approximate per-key sums in depth x width counters.
+
+    For non-negative amounts an estimate never undercounts, and it
+    overcounts by more than e/width of the stream total with probability
+    at most e**-depth.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width))
+        self._rows = np.arange(depth)
+
+    def _columns(self, key: str) -> np.ndarray:
+        # One digest split into a 32-bit hash per row
+        digest = hashlib.blake2b(key.encode(), digest_size=4 * self.depth).digest()
+        return np.frombuffer(digest, dtype=np.uint32) % self.width
+
+    def add(self, key: str, amount: float = 1.0) -> float:
+        """Count amount for key; returns the key's new estimate"""
+        cells = (self._rows, self._columns(key))
+        self.table[cells] += amount
+        return float(self.table[cells].min())
+
+    def estimate(self, key: str) -> float:
+        return float(self.table[self._rows, self._columns(key)].min())
+
+
+class HeavyHitters:
+    """Approximate top-k of a stream in O(k + width * depth) memory"""
+
+    def __init__(self, k: int, width: int = 2048, depth: int = 4):
+        self.k = k
+        self.sketch = CountMinSketch(width, depth)
+        self.top: Dict[str, float] = {}
+        # Min-heap over top; entries whose estimate has since grown are
+        # stale and skipped (and compacted away once they pile up)
+        self._heap: List[Tuple[float, str]] = []
+
+    def add(self, key: str, amount: float = 1.0) -> None:
+        estimate = self.sketch.add(key, amount)
+        if key not in self.top and len(self.top) >= self.k:
+            smallest, victim = self._smallest()
+            if estimate <= smallest:
+                return
+            heapq.heappop(self._heap)
+            del self.top[victim]
+        self.top[key] = estimate
+        heapq.heappush(self._heap, (estimate, key))
+        if len(self._heap) > 4 * self.k + 16:
+            self._heap = [(value, key) for key, value in self.top.items()]
+            heapq.heapify(self._heap)
+
+    def _smallest(self) -> Tuple[float, str]:
+        while True:
+            value, key = self._heap[0]
+            if self.top.get(key) == value:
+                return value, key
+            heapq.heappop(self._heap)
+
+    def result(self) -> Ranked:
+        """The tracked keys and their estimates, largest first"""
+        return top_k(self.top.items(), self.k)
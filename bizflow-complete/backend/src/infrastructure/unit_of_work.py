@@ -0,0 +1,97 @@
+"""Unit of work: one transaction per business operation"""
+from typing import AsyncGenerator, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import AsyncSessionLocal
+from .repositories import (
+    UserRepository, ProductRepository, OrderRepository,
+    CustomerRepository, DebtRepository, InventoryRepository
+)
+
+
+class UnitOfWork:
+    """Transaction scope shared by the repositories of one operation.
+
+    Repositories taken from a unit of work only flush their writes; nothing
+    is committed until commit() is called, which happens once per request.
+    Leaving the ``async with`` block without committing, or with an
+    exception, rolls every write back together.
+
+        async with UnitOfWork(session) as uow:
+            await PayDebtUseCase(uow.debts, uow.customers).execute(...)
+            await uow.commit()
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.committed = False
+        self._users: Optional[UserRepository] = None
+        self._products: Optional[ProductRepository] = None
+        self._orders: Optional[OrderRepository] = None
+        self._customers: Optional[CustomerRepository] = None
+        self._debts: Optional[DebtRepository] = None
+        self._inventory: Optional[InventoryRepository] = None
+
+    async def __aenter__(self) -> "UnitOfWork":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None or not self.committed:
+            await self.rollback()
+
+    @property
+    def users(self) -> UserRepository:
+        if self._users is None:
+            self._users = UserRepository(self.session, auto_commit=False)
+        return self._users
+
+    @property
+    def products(self) -> ProductRepository:
+        if self._products is None:
+            self._products = ProductRepository(self.session, auto_commit=False)
+        return self._products
+
+    @property
+    def orders(self) -> OrderRepository:
+        if self._orders is None:
+            self._orders = OrderRepository(self.session, auto_commit=False)
+        return self._orders
+
+    @property
+    def customers(self) -> CustomerRepository:
+        if self._customers is None:
+            self._customers = CustomerRepository(self.session, auto_commit=False)
+        return self._customers
+
+    @property
+    def debts(self) -> DebtRepository:
+        if self._debts is None:
+            self._debts = DebtRepository(self.session, auto_commit=False)
+        return self._debts
+
+    @property
+    def inventory(self) -> InventoryRepository:
+        if self._inventory is None:
+            self._inventory = InventoryRepository(self.session, auto_commit=False)
+        return self._inventory
+
+    async def flush(self) -> None:
+        """Send pending writes to the database without committing"""
+        await self.session.flush()
+
+    async def commit(self) -> None:
+        """Commit everything written through this unit of work"""
+        await self.session.commit()
+        self.committed = True
+
+    async def rollback(self) -> None:
+        """Discard everything written through this unit of work"""
+        await self.session.rollback()
+
+
+async def get_unit_of_work() -> AsyncGenerator[UnitOfWork, None]:
+    """Dependency injection for a request-scoped unit of work"""
+    async with AsyncSessionLocal() as session:
+        async with UnitOfWork(session) as uow:
+            yield uow
@@ -3,13 +3,23 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
+import asyncio
+import logging
 import os
 import json
-import traceback
+import time
 
 from .infrastructure.database import init_db, close_db
+from .infrastructure.logging import setup_logging, shutdown_logging
+from .infrastructure.metrics import (
+    REGISTRY, CONTENT_TYPE, HTTP_REQUESTS, HTTP_LATENCY, HTTP_IN_FLIGHT
+)
+from .presentation.compression import CompressionMiddleware
+from .application.business_logic import CACHE, STORAGE, PasswordResets, seed_storage
+
+logger = logging.getLogger(__name__)
 
 
 def get_cors_origins():
@@ -41,18 +51,36 @@ CORS_ORIGINS = get_cors_origins()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
-    print("Starting BizFlow API...")
+    setup_logging()
+    logger.info("Starting BizFlow API...")
     try:
         await init_db()
     except Exception as e:
-        print(f"Warning: Database initialization failed: {e}")
-        print("Continuing with app startup anyway...")
+        logger.warning("Database initialization failed: %s; continuing with app startup anyway", e)
+    try:
+        await STORAGE.start()
+        await seed_storage()
+    except Exception as e:
+        logger.warning("%s storage failed to start: %s", STORAGE.name, e)
+    try:
+        await CACHE.start()
+    except Exception as e:
+        logger.warning("Cache invalidation listener failed to start: %s; relying on TTL expiry", e)
+    sweeper = asyncio.create_task(PasswordResets.sweep_periodically())
     yield
-    print("Shutting down BizFlow API...")
+    logger.info("Shutting down BizFlow API...")
+    sweeper.cancel()
+    try:
+        await sweeper
+    except asyncio.CancelledError:
+        pass
+    await STORAGE.close()
     try:
         await close_db()
     except Exception as e:
-        print(f"Warning: Database shutdown failed: {e}")
+        logger.warning("Database shutdown failed: %s", e)
+    await CACHE.close()
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -71,6 +99,8 @@ app.add_middleware(
     allow_headers=["*"],
     expose_headers=["*"],
 )
+# Added last, so it wraps everything else and compresses the final body
+app.add_middleware(CompressionMiddleware)
 
 
 @app.get("/health")
@@ -82,6 +112,12 @@ async def health():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Metrics in the Prometheus text exposition format"""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 @app.get("/")
 async def root():
     """API root endpoint"""
@@ -100,9 +136,7 @@ async def validation_exception_handler(
     exc: RequestValidationError
 ):
     """Handle validation errors"""
-    print(f"Validation error on {request.method} {request.url.path}")
-    print(exc.errors())
-    traceback.print_exc()
+    logger.info("Validation error on %s %s: %s", request.method, request.url.path, exc.errors())
     return JSONResponse(
         status_code=422,
         content={"detail": exc.errors()},
@@ -111,14 +145,31 @@ async def validation_exception_handler(
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    print(f">>> Incoming {request.method} {request.url.path}")
+    # One record per request at DEBUG (uvicorn already writes an access log),
+    # so with the default INFO level this costs a level check
+    start = time.perf_counter()
+    status_code = 500
+    HTTP_IN_FLIGHT.inc()
     try:
         response = await call_next(request)
-        print(f"<<< Response {request.method} {request.url.path} -> {response.status_code}")
-        return response
-    except Exception as e:
-        print(f"!!! Error on {request.method} {request.url.path}: {e}")
+        status_code = response.status_code
+    except Exception:
+        logger.exception("Error on %s %s", request.method, request.url.path)
         raise
+    finally:
+        elapsed = time.perf_counter() - start
+        HTTP_IN_FLIGHT.dec()
+        # Label by route template (/api/orders/{order_id}), not the raw path,
+        # so the number of series stays fixed
+        route = request.scope.get("route")
+        template = getattr(route, "path", "unmatched")
+        HTTP_REQUESTS.labels(request.method, template, str(status_code)).inc()
+        HTTP_LATENCY.labels(request.method, template).observe(elapsed)
+    logger.debug(
+        "%s %s -> %d (%.1f ms)",
+        request.method, request.url.path, status_code, elapsed * 1000
+    )
+    return response
 
 
 from .presentation.api_routes import router as api_router
@@ -1,22 +1,26 @@
 """Complete API route implementations with business logic"""
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Body
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Body, Response
+from datetime import date, datetime
+import logging
 from typing import List, Optional
 from ..application.business_logic import (
     AuthService, ProductService, OrderService, CustomerService,
-    DebtService, ReportService, DraftOrderService, AccountingService,
-    MOCK_ORDERS_DB, MOCK_USERS_DB, MOCK_EMPLOYEES_DB
+    DebtService, ReportService, DraftOrderService, AccountingService, StoreService,
+    MOCK_EMPLOYEES_DB
 )
 from ..application.dtos import (
     LoginRequest, LoginResponse, UserResponse, RegisterRequest,
     ForgotPasswordRequest, ResetPasswordRequest,
     ProductCreateRequest, ProductResponse,
-    OrderCreateRequest, OrderResponse, OrderItemResponse,
+    OrderCreateRequest, OrderBatchRequest, OrderResponse, OrderItemResponse,
     CustomerCreateRequest, CustomerResponse,
     DebtResponse, DraftOrderResponse, AnalyticsResponse
 )
+from ..infrastructure.pagination import InvalidCursorError
+from .responses import cache_headers, etag_matches, json_response, make_etag, not_modified
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # ============ DEPENDENCIES ============
 async def get_optional_user(authorization: Optional[str] = Header(None, alias="Authorization")):
@@ -93,15 +97,24 @@ async def register(request: RegisterRequest):
             raise HTTPException(status_code=400, detail="Email already registered or registration failed")
         return result
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Registration failed")
         raise HTTPException(status_code=400, detail=f"Registration error: {str(e)}")
 
 @router.post("/auth/logout", tags=["Authentication"])
-async def logout(current_user: dict = Depends(get_current_user)):
-    """Logout user"""
+async def logout(
+    authorization: Optional[str] = Header(None, alias="Authorization"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Logout user, revoking the tokens of this session"""
+    await AuthService.logout(authorization.split()[1])
     return {"message": "Logged out successfully"}
 
+@router.post("/auth/logout-all", tags=["Authentication"])
+async def logout_all(current_user: dict = Depends(get_current_user)):
+    """Logout user from every session"""
+    await AuthService.revoke_all_tokens(current_user["id"])
+    return {"message": "Logged out from all sessions"}
+
 @router.get("/auth/profile", response_model=UserResponse, tags=["Authentication"])
 async def get_profile(current_user: dict = Depends(get_current_user)):
     """Get current user profile"""
@@ -153,28 +166,7 @@ async def get_store_info(
     if not resolved_store:
         raise HTTPException(status_code=400, detail="store_id is required")
     
-    # Return store info - use current user's data if authenticated, otherwise return generic store info
-    if current_user:
-        return {
-            "store_id": resolved_store,
-            "store_name": current_user.get("store_name", "BizFlow Store"),
-            "owner_name": current_user.get("full_name", "Store Owner"),
-            "email": current_user.get("email", ""),
-            "phone": current_user.get("phone", ""),
-            "address": current_user.get("address", ""),
-            "created_at": "2024-01-01"
-        }
-    else:
-        # Fallback for unauthenticated requests
-        return {
-            "store_id": resolved_store,
-            "store_name": "BizFlow Store",
-            "owner_name": "Store Owner",
-            "email": "",
-            "phone": "",
-            "address": "",
-            "created_at": "2024-01-01"
-        }
+    return await StoreService.get_info(resolved_store, current_user)
 
 
 @router.put("/store/info", tags=["Store"])
@@ -190,36 +182,16 @@ async def update_store_info(
     """Update store information (for registered accounts only)"""
     resolved_store = resolve_store_id(store_id, None, current_user)
     
-    # Update the user's store info in MOCK_USERS_DB
-    user_email = current_user.get("email", "").lower()
-    
-    if user_email in MOCK_USERS_DB:
-        user = MOCK_USERS_DB[user_email]
-        
-        # Update fields
-        if store_name is not None:
-            user["store_name"] = store_name
-        if owner_name is not None:
-            user["full_name"] = owner_name
-        if email is not None:
-            user["email"] = email
-        if phone is not None:
-            user["phone"] = phone
-        if address is not None:
-            user["address"] = address
-        
-        return {
-            "message": "Store information updated successfully",
-            "store_id": resolved_store,
-            "store_name": user.get("store_name", "BizFlow Store"),
-            "owner_name": user.get("full_name", "Store Owner"),
-            "email": user.get("email", ""),
-            "phone": user.get("phone", ""),
-            "address": user.get("address", ""),
-            "created_at": "2024-01-01"
-        }
-    else:
+    info = await StoreService.update_info(resolved_store, current_user, {
+        "store_name": store_name,
+        "owner_name": owner_name,
+        "email": email,
+        "phone": phone,
+        "address": address,
+    })
+    if info is None:
         raise HTTPException(status_code=403, detail="Store information cannot be updated for test accounts")
+    return {"message": "Store information updated successfully", **info}
 
 
 # ============ PRODUCT ENDPOINTS ============
@@ -229,20 +201,29 @@ async def list_products(
     business_id: Optional[str] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
     current_user: Optional[dict] = Depends(get_optional_user)
 ):
     """List all products for store"""
     try:
         resolved_store = resolve_store_id(store_id, business_id, current_user)
-        products = await ProductService.list_products(resolved_store, skip, limit)
-        result = products if products else []
-        print(f"DEBUG: Returning {len(result)} products for store {resolved_store}")
-        print(f"DEBUG: Sample product: {result[0] if result else 'empty'}")
-        return {"products": result, "total": len(result)}
+        # Answer an unchanged catalog before building the page
+        etag = make_etag("products", resolved_store, await ProductService.version(resolved_store), skip, limit, cursor)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        # Count the catalog once, for the first page; later pages send total=null
+        page = await ProductService.page_products(resolved_store, skip, limit, cursor, with_total=cursor is None)
+        result = page["items"]
+        logger.debug("Returning %d products for store %s", len(result), resolved_store)
+        return json_response(
+            {"products": result, "total": page["total"], "next_cursor": page["next_cursor"]},
+            headers=cache_headers(etag),
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"ERROR in list_products: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("list_products failed")
         # Return empty list instead of crashing
         return {"products": [], "total": 0}
 
@@ -278,18 +259,19 @@ async def get_product(
 async def list_users(
     store_id: str = Query(...),
     skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100)
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None)
 ):
     """List all users/employees for store"""
     try:
-        users = MOCK_EMPLOYEES_DB.get(store_id, [])
-        users = users[skip:skip + limit]
-        print(f"DEBUG: Returning {len(users)} users for store {store_id}")
-        return {"users": users, "total": len(users)}
+        page = MOCK_EMPLOYEES_DB.collection(store_id).paginate(skip, limit, cursor)
+        users = page["items"]
+        logger.debug("Returning %d users for store %s", len(users), store_id)
+        return json_response({"users": users, "total": page["total"], "next_cursor": page["next_cursor"]})
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"ERROR in list_users: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("list_users failed")
         return {"users": [], "total": 0}
 
 
@@ -305,11 +287,11 @@ async def create_user(payload: dict = Body(...)):
     if not email or not name:
         raise HTTPException(status_code=400, detail="name and email are required")
 
-    employees = MOCK_EMPLOYEES_DB.setdefault(store_id, [])
-    if any(u.get("email") == email for u in employees):
+    employees = MOCK_EMPLOYEES_DB.collection(store_id, create=True)
+    if employees.count(email=email):
         raise HTTPException(status_code=400, detail="Email already exists")
 
-    employee_id = f"emp_{len(employees) + 1:03d}"
+    employee_id = f"emp_{employees.sequence + 1:03d}"
     employee = {
         "id": employee_id,
         "store_id": store_id,
@@ -325,7 +307,7 @@ async def create_user(payload: dict = Body(...)):
         "shift": payload.get("shift"),
         "created_at": datetime.now().isoformat()
     }
-    employees.append(employee)
+    employees.add(employee)
     return {"message": "Employee created", "employee": employee}
 
 
@@ -336,24 +318,24 @@ async def update_user(user_id: str, payload: dict = Body(...)):
     if not store_id:
         raise HTTPException(status_code=400, detail="store_id is required")
 
-    employees = MOCK_EMPLOYEES_DB.get(store_id, [])
-    for idx, user in enumerate(employees):
-        if user.get("id") == user_id:
-            updated = {
-                **user,
-                "name": payload.get("name", user.get("name")),
-                "email": payload.get("email", user.get("email")),
-                "phone": payload.get("phone", user.get("phone")),
-                "role": payload.get("role", user.get("role")),
-                "status": payload.get("status", user.get("status")),
-                "address": payload.get("address", user.get("address")),
-                "citizen_id": payload.get("citizen_id", user.get("citizen_id")),
-                "salary": payload.get("salary", user.get("salary")),
-                "start_date": payload.get("start_date", user.get("start_date")),
-                "shift": payload.get("shift", user.get("shift"))
-            }
-            employees[idx] = updated
-            return {"message": "Employee updated", "employee": updated}
+    employees = MOCK_EMPLOYEES_DB.collection(store_id)
+    user = employees.get(user_id)
+    if user:
+        updated = {
+            **user,
+            "name": payload.get("name", user.get("name")),
+            "email": payload.get("email", user.get("email")),
+            "phone": payload.get("phone", user.get("phone")),
+            "role": payload.get("role", user.get("role")),
+            "status": payload.get("status", user.get("status")),
+            "address": payload.get("address", user.get("address")),
+            "citizen_id": payload.get("citizen_id", user.get("citizen_id")),
+            "salary": payload.get("salary", user.get("salary")),
+            "start_date": payload.get("start_date", user.get("start_date")),
+            "shift": payload.get("shift", user.get("shift"))
+        }
+        employees.add(updated)
+        return {"message": "Employee updated", "employee": updated}
 
     raise HTTPException(status_code=404, detail="Employee not found")
 
@@ -364,11 +346,8 @@ async def delete_user(
     store_id: str = Query(...)
 ):
     """Delete employee"""
-    employees = MOCK_EMPLOYEES_DB.get(store_id, [])
-    for idx, user in enumerate(employees):
-        if user.get("id") == user_id:
-            employees.pop(idx)
-            return {"message": "Employee deleted"}
+    if MOCK_EMPLOYEES_DB.collection(store_id).remove(user_id):
+        return {"message": "Employee deleted"}
 
     raise HTTPException(status_code=404, detail="Employee not found")
 
@@ -380,8 +359,7 @@ async def reset_user_password(user_id: str, payload: dict = Body(...)):
     if not store_id:
         raise HTTPException(status_code=400, detail="store_id is required")
 
-    employees = MOCK_EMPLOYEES_DB.get(store_id, [])
-    if any(user.get("id") == user_id for user in employees):
+    if user_id in MOCK_EMPLOYEES_DB.collection(store_id):
         return {"message": "Password reset"}
 
     raise HTTPException(status_code=404, detail="Employee not found")
@@ -459,32 +437,35 @@ async def list_orders(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     status: Optional[str] = None,
+    payment_status: Optional[str] = None,
+    customer_id: Optional[str] = None,
+    cursor: Optional[str] = Query(None),
     current_user: Optional[dict] = Depends(get_optional_user)
 ):
     """List all orders"""
     try:
         resolved_store = resolve_store_id(store_id, business_id, current_user)
-        orders = await OrderService.list_orders(resolved_store, skip, limit)
-        if status:
-            orders = [o for o in orders if o.get("status") == status]
-        result = orders if orders else []
-        print(f"DEBUG: Returning {len(result)} orders for store {resolved_store}")
-        
-        # Debug: Show all orders with payment_status
-        paid_count = sum(1 for o in result if o.get("payment_status") == "paid")
-        pending_count = sum(1 for o in result if o.get("payment_status") != "paid")
-        paid_total = sum(o.get("total_amount", 0) for o in result if o.get("payment_status") == "paid")
-        pending_total = sum(o.get("total_amount", 0) for o in result if o.get("payment_status") != "paid")
-        print(f"DEBUG: Paid orders: {paid_count}, total={paid_total}")
-        print(f"DEBUG: Unpaid orders: {pending_count}, total={pending_total}")
-        for o in result:
-            print(f"  - {o.get('order_number')}: {o.get('payment_status', 'unknown')}, {o.get('total_amount', 0)}đ")
+        page = await OrderService.page_orders(
+            resolved_store, skip, limit, cursor,
+            status=status, payment_status=payment_status, customer_id=customer_id, with_total=cursor is None
+        )
+        result = page["items"]
+        if logger.isEnabledFor(logging.DEBUG):
+            # Page summary by payment status; only computed when it is logged
+            paid = [o for o in result if o.get("payment_status") == "paid"]
+            logger.debug(
+                "Returning %d orders for store %s: %d paid (total=%s), %d unpaid (total=%s)",
+                len(result), resolved_store,
+                len(paid), sum(o.get("total_amount", 0) for o in paid),
+                len(result) - len(paid),
+                sum(o.get("total_amount", 0) for o in result) - sum(o.get("total_amount", 0) for o in paid),
+            )
         
-        return {"orders": result, "total": len(result)}
+        return json_response({"orders": result, "total": page["total"], "next_cursor": page["next_cursor"]})
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"ERROR in list_orders: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("list_orders failed")
         return {"orders": [], "total": 0}
 
 @router.post("/orders", tags=["Orders"])
@@ -496,9 +477,6 @@ async def create_order(
 ):
     """Create new order"""
     try:
-        print(f"=== CREATE ORDER REQUEST ===")
-        print(f"DEBUG: status from request: {request.status}")
-        print(f"DEBUG: payment_status from request: {request.payment_status}")
         resolved_store = resolve_store_id(store_id, business_id, current_user)
         
         # Convert Pydantic OrderItemRequest objects to dicts
@@ -518,13 +496,29 @@ async def create_order(
             notes=request.notes
         )
         
-        print(f"SUCCESS: Order created with status={order.get('status')}, payment_status={order.get('payment_status')}")
+        logger.debug(
+            "Order %s created with status=%s, payment_status=%s",
+            order.get("id"), order.get("status"), order.get("payment_status")
+        )
         return order
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("create_order failed")
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/orders/batch", tags=["Orders"])
+async def create_orders_batch(
+    request: OrderBatchRequest,
+    store_id: Optional[str] = Query(None),
+    business_id: Optional[str] = Query(None),
+    current_user: Optional[dict] = Depends(get_optional_user)
+):
+    """Create many orders in one request; each order succeeds or fails on its own"""
+    resolved_store = resolve_store_id(store_id, business_id, current_user)
+    return await OrderService.create_orders_batch(
+        resolved_store,
+        [order.dict() for order in request.orders]
+    )
+
 @router.get("/orders/{order_id}", tags=["Orders"])
 async def get_order(
     order_id: str,
@@ -590,38 +584,19 @@ async def delete_order(
     current_user: dict = Depends(get_current_user)
 ):
     """Delete order"""
-    print(f"=== DELETE /orders/{order_id} called with store_id={store_id} ===")
     try:
         resolved_store = resolve_store_id(store_id, business_id, current_user)
-        print(f"DEBUG: order_id type={type(order_id)}, value='{order_id}'")
-        print(f"DEBUG: store_id type={type(store_id)}, value='{store_id}'")
-        print(f"DEBUG: MOCK_ORDERS_DB keys: {list(MOCK_ORDERS_DB.keys())}")
-        
-        # Get orders for this store
-        if resolved_store not in MOCK_ORDERS_DB:
-            print(f"ERROR: Store {resolved_store} not found in MOCK_ORDERS_DB")
-            raise HTTPException(status_code=404, detail="Store not found")
-        
-        orders = MOCK_ORDERS_DB[resolved_store]
-        print(f"DEBUG: Found {len(orders)} orders for store {resolved_store}")
-        print(f"DEBUG: Order IDs: {[o.get('id') for o in orders]}")
         
         # Find and remove the order
-        original_count = len(orders)
-        MOCK_ORDERS_DB[resolved_store] = [o for o in orders if o.get("id") != order_id]
-        
-        if len(MOCK_ORDERS_DB[resolved_store]) == original_count:
-            print(f"ERROR: Order {order_id} not found")
+        if not await OrderService.delete_order(order_id, resolved_store):
             raise HTTPException(status_code=404, detail="Order not found")
         
-        print(f"SUCCESS: Deleted order {order_id}. Orders count: {original_count} -> {len(MOCK_ORDERS_DB[resolved_store])}")
+        logger.debug("Deleted order %s from store %s", order_id, resolved_store)
         return {"message": "Order deleted successfully", "id": order_id}
     except HTTPException:
         raise
     except Exception as e:
-        print(f"ERROR in delete_order: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("delete_order failed")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/orders/{order_id}", tags=["Orders"])
@@ -640,8 +615,7 @@ async def update_order(
             raise HTTPException(status_code=404, detail="Order not found")
         return order
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("update_order failed")
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.delete("/orders/{order_id}/cancel", tags=["Orders"])
@@ -667,20 +641,28 @@ async def list_customers(
     business_id: Optional[str] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
     current_user: Optional[dict] = Depends(get_optional_user)
 ):
     """List all customers"""
     try:
         resolved_store = resolve_store_id(store_id, business_id, current_user)
-        customers = await CustomerService.list_customers(resolved_store, skip, limit)
-        result = customers if customers else []
-        print(f"DEBUG: Returning {len(result)} customers for store {resolved_store}")
-        print(f"DEBUG: Sample customer: {result[0] if result else 'empty'}")
-        return {"customers": result, "total": len(result)}
+        # Answer unchanged customers before paging and normalizing them
+        etag = make_etag("customers", resolved_store, await CustomerService.version(resolved_store), skip, limit, cursor)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        page = await CustomerService.page_customers(resolved_store, skip, limit, cursor, with_total=cursor is None)
+        result = page["items"]
+        logger.debug("Returning %d customers for store %s", len(result), resolved_store)
+        return json_response(
+            {"customers": result, "total": page["total"], "next_cursor": page["next_cursor"]},
+            headers=cache_headers(etag),
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"ERROR in list_customers: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("list_customers failed")
         return {"customers": [], "total": 0}
 
 @router.post("/customers", response_model=CustomerResponse, tags=["Customers"])
@@ -778,19 +760,27 @@ async def get_customer_history(
 # ============ DEBT & PAYMENT ENDPOINTS ============
 @router.get("/debts", response_model=List[DebtResponse], tags=["Debts"])
 async def list_debts(
+    response: Response,
     store_id: Optional[str] = Query(None),
     business_id: Optional[str] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     status: Optional[str] = None,
+    cursor: Optional[str] = Query(None),
     current_user: dict = Depends(get_current_user)
 ):
-    """List customer debts"""
+    """List customer debts; total (first page only) and next cursor are sent as X-Total-Count/X-Next-Cursor"""
     resolved_store = resolve_store_id(store_id, business_id, current_user)
-    debts = await DebtService.list_debts(resolved_store, skip, limit)
-    if status:
-        debts = [d for d in debts if d.status == status]
-    return debts
+    try:
+        page = await DebtService.page_debts(resolved_store, skip, limit, cursor, status=status,
+                                            with_total=cursor is None)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page["total"] is not None:
+        response.headers["X-Total-Count"] = str(page["total"])
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return page["items"]
 
 @router.post("/debts", response_model=DebtResponse, tags=["Debts"])
 async def create_debt(
@@ -860,6 +850,63 @@ async def get_monthly_report(
     report = await ReportService.get_monthly_report(resolved_store, year, month)
     return report
 
+@router.get("/analytics", tags=["Reports"])
+async def get_analytics(
+    store_id: Optional[str] = Query(None),
+    business_id: Optional[str] = Query(None),
+    current_user: dict = Depends(get_current_user)
+):
+    """Dashboard analytics"""
+    resolved_store = resolve_store_id(store_id, business_id, current_user)
+    return await ReportService.get_analytics(resolved_store)
+
+@router.post("/reports/rollups/rebuild", tags=["Reports"])
+async def rebuild_sales_rollups(
+    store_id: Optional[str] = Query(None),
+    business_id: Optional[str] = Query(None),
+    current_user: dict = Depends(require_roles(["owner", "admin"]))
+):
+    """Regenerate the daily/monthly sales rollups from the store's orders"""
+    resolved_store = resolve_store_id(store_id, business_id, current_user)
+    return await ReportService.rebuild_rollups(resolved_store)
+
+@router.get("/reports/pivot", tags=["Reports"])
+async def get_pivot_report(
+    store_id: Optional[str] = Query(None),
+    business_id: Optional[str] = Query(None),
+    rows: str = Query(...),
+    cols: Optional[str] = Query(None),
+    measure: str = Query("revenue"),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    paid_only: bool = Query(True),
+    current_user: dict = Depends(get_current_user)
+):
+    """Order items grouped by rows (and optionally cols) dimensions, e.g. revenue by category by hour"""
+    resolved_store = resolve_store_id(store_id, business_id, current_user)
+    try:
+        return await ReportService.get_pivot(resolved_store, rows, cols, measure, start, end, paid_only)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/reports/top-products", tags=["Reports"])
+async def get_top_products(
+    store_id: Optional[str] = Query(None),
+    business_id: Optional[str] = Query(None),
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    by: str = Query("quantity"),
+    limit: int = Query(10, ge=1, le=100),
+    approximate: bool = Query(False),
+    current_user: dict = Depends(get_current_user)
+):
+    """Best-selling products from start to end (inclusive; all time without them)"""
+    resolved_store = resolve_store_id(store_id, business_id, current_user)
+    try:
+        return await ReportService.get_top_products(resolved_store, start, end, by, limit, approximate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/reports/revenue", tags=["Reports"])
 async def get_revenue_report(
     store_id: Optional[str] = Query(None),
@@ -918,7 +965,7 @@ async def list_journal(
 ):
     resolved_store = resolve_store_id(store_id, business_id, current_user)
     entries = await AccountingService.list_journal_entries(resolved_store, start_date, end_date)
-    return {"entries": entries, "total": len(entries)}
+    return json_response({"entries": entries, "total": len(entries)})
 
 
 @router.post("/bookkeeping/journal", tags=["Bookkeeping"])
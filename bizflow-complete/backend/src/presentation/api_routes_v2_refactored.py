@@ -1,10 +1,12 @@
 """Refactored API Routes - Clean Architecture Version"""
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
 
 from ..infrastructure.database import get_session
+from ..infrastructure.unit_of_work import UnitOfWork, get_unit_of_work
+from ..infrastructure.pagination import InvalidCursorError
 from ..infrastructure.repositories import (
     UserRepository, ProductRepository, OrderRepository,
     CustomerRepository, DebtRepository, InventoryRepository
@@ -21,6 +23,7 @@ from ..application.commands import (
     CreateProductCommand, UpdateProductCommand, CreateOrderCommand, ConfirmOrderCommand,
     CreateCustomerCommand, UpdateCustomerCommand, RecordDebtCommand, PayDebtCommand
 )
+from ..application.exceptions import InsufficientInventoryException
 from ..application.responses import (
     LoginResponse, UserResponse, ProductResponse, OrderResponse,
     CustomerResponse, DebtResponse, AnalyticsResponse
@@ -28,6 +31,18 @@ from ..application.responses import (
 
 router = APIRouter(tags=["API v2"])
 
+
+def set_page_headers(response: Response, total: Optional[int], next_cursor: Optional[str] = None):
+    """Expose list totals and the keyset cursor without changing list bodies.
+
+    Keyset pages only count on the first page (no cursor): a COUNT(*) per
+    page would cost as much as the scan the cursor avoids.
+    """
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
 # ============ DEPENDENCY INJECTION ============
 async def get_current_user(
     session: AsyncSession = Depends(get_session),
@@ -192,24 +207,39 @@ async def create_product(
 
 @router.get("/products", response_model=List[ProductResponse], tags=["Products"])
 async def get_products(
+    response: Response,
     business_id: str = Query(...),
     category: Optional[str] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
     session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user)
 ):
     """Get products"""
+    # The category listing pages by skip only; don't hand back a page that ignored the cursor
+    if category and cursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cursor paging is not supported together with category; page with skip instead",
+        )
     try:
         product_repo = ProductRepository(session)
         use_case = GetProductsUseCase(product_repo)
         
         if category:
             products = await use_case.get_by_category(business_id, category, skip, limit)
+        elif cursor or not skip:
+            products, next_cursor = await use_case.get_page(business_id, limit, cursor)
+            total = await use_case.count(business_id) if cursor is None else None
+            set_page_headers(response, total, next_cursor)
         else:
             products = await use_case.get_all(business_id, skip, limit)
+            set_page_headers(response, await use_case.count(business_id))
         
         return [ProductResponse.from_orm(p) for p in products]
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -317,14 +347,12 @@ async def delete_product(
 @router.post("/orders", response_model=OrderResponse, tags=["Orders"])
 async def create_order(
     command: CreateOrderCommand,
-    session: AsyncSession = Depends(get_session),
+    uow: UnitOfWork = Depends(get_unit_of_work),
     current_user: dict = Depends(get_current_user)
 ):
     """Create new order"""
     try:
-        order_repo = OrderRepository(session)
-        product_repo = ProductRepository(session)
-        use_case = CreateOrderUseCase(order_repo, product_repo)
+        use_case = CreateOrderUseCase(uow.orders, uow.products, uow.inventory)
         
         order = await use_case.execute(
             business_id=command.business_id,
@@ -335,6 +363,7 @@ async def create_order(
             is_credit=command.is_credit,
             notes=command.notes
         )
+        await uow.commit()
         
         return OrderResponse.from_orm(order)
     except ValueError as e:
@@ -342,6 +371,11 @@ async def create_order(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except InsufficientInventoryException as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.message
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -376,24 +410,39 @@ async def confirm_order(
 
 @router.get("/orders", response_model=List[OrderResponse], tags=["Orders"])
 async def get_orders(
+    response: Response,
     business_id: str = Query(...),
     status: Optional[str] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
     session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user)
 ):
     """Get orders"""
+    # The status listing pages by skip only; don't hand back a page that ignored the cursor
+    if status and cursor:
+        raise HTTPException(
+            status_code=400,
+            detail="cursor paging is not supported together with status; page with skip instead",
+        )
     try:
         order_repo = OrderRepository(session)
         use_case = GetOrdersUseCase(order_repo)
         
         if status:
             orders = await use_case.get_by_status(business_id, status, skip, limit)
+        elif cursor or not skip:
+            orders, next_cursor = await use_case.get_page(business_id, limit, cursor)
+            total = await use_case.count(business_id) if cursor is None else None
+            set_page_headers(response, total, next_cursor)
         else:
             orders = await use_case.get_all(business_id, skip, limit)
+            set_page_headers(response, await use_case.count(business_id))
         
         return [OrderResponse.from_orm(o) for o in orders]
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -484,24 +533,39 @@ async def create_customer(
 
 @router.get("/customers", response_model=List[CustomerResponse], tags=["Customers"])
 async def get_customers(
+    response: Response,
     business_id: str = Query(...),
     search: Optional[str] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
     session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user)
 ):
     """Get customers"""
+    # The search listing pages by skip only; don't hand back a page that ignored the cursor
+    if search and cursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cursor paging is not supported together with search; page with skip instead",
+        )
     try:
         customer_repo = CustomerRepository(session)
         use_case = GetCustomersUseCase(customer_repo)
         
         if search:
             customers = await use_case.search(business_id, search, skip, limit)
+        elif cursor or not skip:
+            customers, next_cursor = await use_case.get_page(business_id, limit, cursor)
+            total = await use_case.count(business_id) if cursor is None else None
+            set_page_headers(response, total, next_cursor)
         else:
             customers = await use_case.get_all(business_id, skip, limit)
+            set_page_headers(response, await use_case.count(business_id))
         
         return [CustomerResponse.from_orm(c) for c in customers]
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -567,14 +631,12 @@ async def update_customer(
 @router.post("/debts", response_model=DebtResponse, tags=["Debts"])
 async def record_debt(
     command: RecordDebtCommand,
-    session: AsyncSession = Depends(get_session),
+    uow: UnitOfWork = Depends(get_unit_of_work),
     current_user: dict = Depends(get_current_user)
 ):
     """Record customer debt"""
     try:
-        debt_repo = DebtRepository(session)
-        customer_repo = CustomerRepository(session)
-        use_case = RecordDebtUseCase(debt_repo, customer_repo)
+        use_case = RecordDebtUseCase(uow.debts, uow.customers)
         
         debt = await use_case.execute(
             business_id=command.business_id,
@@ -583,6 +645,7 @@ async def record_debt(
             amount=command.amount,
             due_date=command.due_date
         )
+        await uow.commit()
         
         return DebtResponse.from_orm(debt)
     except ValueError as e:
@@ -601,16 +664,15 @@ async def record_debt(
 async def pay_debt(
     debt_id: str,
     command: PayDebtCommand,
-    session: AsyncSession = Depends(get_session),
+    uow: UnitOfWork = Depends(get_unit_of_work),
     current_user: dict = Depends(get_current_user)
 ):
     """Pay debt"""
     try:
-        debt_repo = DebtRepository(session)
-        customer_repo = CustomerRepository(session)
-        use_case = PayDebtUseCase(debt_repo, customer_repo)
+        use_case = PayDebtUseCase(uow.debts, uow.customers)
         
         debt = await use_case.execute(debt_id, command.payment_amount)
+        await uow.commit()
         return DebtResponse.from_orm(debt)
     except ValueError as e:
         raise HTTPException(
@@ -626,18 +688,27 @@ async def pay_debt(
 
 @router.get("/debts", response_model=List[DebtResponse], tags=["Debts"])
 async def get_debts(
+    response: Response,
     business_id: str = Query(...),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
     session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user)
 ):
     """Get debts"""
     try:
         debt_repo = DebtRepository(session)
-        debts = await debt_repo.get_all_by_business(business_id, skip, limit)
+        if cursor or not skip:
+            debts, next_cursor = await debt_repo.get_page_by_business(business_id, limit, cursor)
+        else:
+            debts, next_cursor = await debt_repo.get_all_by_business(business_id, skip, limit), None
+        total = await debt_repo.count_by_business(business_id) if cursor is None else None
+        set_page_headers(response, total, next_cursor)
         
         return [DebtResponse.from_orm(d) for d in debts]
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -658,20 +729,16 @@ async def get_analytics(
         customer_repo = CustomerRepository(session)
         debt_repo = DebtRepository(session)
         
-        # Get data
-        orders = await order_repo.get_all_by_business(business_id)
-        customers = await customer_repo.get_all_by_business(business_id)
+        # Aggregate in the database instead of loading every order
+        completed, total_revenue = await order_repo.get_revenue_summary(business_id)
+        total_customers = await customer_repo.count_by_business(business_id)
         total_debt = await debt_repo.get_total_outstanding_debt(business_id)
-        
-        # Calculate metrics
-        completed_orders = [o for o in orders if o.status.value == "completed"]
-        total_revenue = sum(o.total_amount for o in completed_orders)
-        avg_order = total_revenue / len(completed_orders) if completed_orders else 0
+        avg_order = total_revenue / completed if completed else 0
         
         return AnalyticsResponse(
             total_revenue=total_revenue,
-            total_orders=len(completed_orders),
-            total_customers=len(customers),
+            total_orders=completed,
+            total_customers=total_customers,
             outstanding_debt=total_debt,
             average_order_value=avg_order
         )
@@ -0,0 +1,158 @@
+"""Response compression middleware (gzip/deflate)"""
+import os
+import zlib
+from typing import Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Responses smaller than this are sent as is; compressing them saves little
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+# zlib level 1-9; 6 is the usual size/CPU balance for JSON
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+
+# zlib window bits per content coding ("deflate" in HTTP is the zlib format)
+WBITS = {"gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+
+# Media that is already compressed, or must reach the client unbuffered
+SKIP_MEDIA_PREFIXES = (
+    "image/", "video/", "audio/", "font/woff",
+    "application/zip", "application/gzip", "application/x-gzip", "application/x-7z",
+    "application/x-rar", "application/x-bzip2", "application/pdf", "application/octet-stream",
+    "text/event-stream",
+)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Best of gzip/deflate the client accepts, honouring q-values"""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding] = q
+    best, best_q = None, 0.0
+    for coding in ("gzip", "deflate"):
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressionMiddleware:
+    """Compress response bodies above a size threshold.
+
+    The coding is picked from Accept-Encoding (gzip preferred, then
+    deflate). Bodies sent in one piece are compressed whole. Streamed
+    bodies (StreamingResponse) are buffered only until they pass the
+    threshold, then compressed chunk by chunk, each chunk flushed so the
+    client still receives data as it is produced. Responses that already
+    have a Content-Encoding, or whose media is already compressed, pass
+    through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE,
+                 level: int = COMPRESSION_LEVEL):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        responder = _CompressingResponder(send, encoding, self.minimum_size, self.level)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    def __init__(self, send: Send, encoding: Optional[str], minimum_size: int, level: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.level = level
+        self.start: Optional[Message] = None
+        # None until decided; then True (compress) or False (pass through)
+        self.compressing: Optional[bool] = None
+        self.buffer: List[bytes] = []
+        self.buffered = 0
+        self.compressor = None
+
+    async def send(self, message: Message) -> None:
+        kind = message["type"]
+        if kind == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            if not self._eligible(message["status"], headers):
+                self.compressing = False
+                await self._send(message)
+            elif self.encoding is None:
+                self.compressing = False
+                MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+                await self._send(message)
+            return
+        if kind != "http.response.body" or self.compressing is False:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressing is None:
+            self.buffer.append(body)
+            self.buffered += len(body)
+            if self.buffered < self.minimum_size:
+                if more_body:
+                    return
+                # Whole body is below the threshold: send it unchanged
+                self.compressing = False
+                MutableHeaders(raw=self.start["headers"]).add_vary_header("Accept-Encoding")
+                await self._send(self.start)
+                await self._send({"type": "http.response.body", "body": b"".join(self.buffer)})
+                return
+            body, self.buffer = b"".join(self.buffer), []
+            await self._begin(streaming=more_body, body=body)
+            return
+
+        await self._send_chunk(body, more_body)
+
+    def _eligible(self, status: int, headers: Headers) -> bool:
+        if status < 200 or status in (204, 304) or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").lower()
+        return not content_type.startswith(SKIP_MEDIA_PREFIXES)
+
+    async def _begin(self, streaming: bool, body: bytes) -> None:
+        self.compressing = True
+        self.compressor = zlib.compressobj(self.level, zlib.DEFLATED, WBITS[self.encoding])
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if "content-length" in headers:
+            del headers["content-length"]
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # The encoded bytes differ from the body the tag was made for
+            headers["ETag"] = "W/" + etag
+        if streaming:
+            await self._send(self.start)
+            await self._send_chunk(body, more_body=True)
+            return
+        compressed = self.compressor.compress(body) + self.compressor.flush()
+        headers["Content-Length"] = str(len(compressed))
+        await self._send(self.start)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    async def _send_chunk(self, body: bytes, more_body: bool) -> None:
+        data = self.compressor.compress(body)
+        data += self.compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
@@ -1,6 +1,7 @@
 """Product, Customer, Order, Debt endpoints"""
 from fastapi import APIRouter, HTTPException, Query, Body
 from typing import List
+import logging
 from ..application.business_logic import (
     AuthService, ProductService, CustomerService, OrderService, 
     DebtService, ReportService, MOCK_PRODUCTS_DB,
@@ -9,6 +10,7 @@ from ..application.business_logic import (
 from ..application.dtos import LoginRequest, RegisterRequest, ProductCreateRequest
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # ============ AUTHENTICATION ============
 @router.post("/auth/login", tags=["Authentication"])
@@ -111,12 +113,7 @@ async def delete_customer(customer_id: str, store_id: str = Query(...)):
 @router.get("/orders", tags=["Orders"])
 async def list_orders(store_id: str = Query(...), skip: int = Query(0), limit: int = Query(50), status: str = Query(None)):
     """List all orders with optional status filter"""
-    orders = await OrderService.list_orders(store_id, skip, limit)
-    
-    # Filter by status if provided
-    if status:
-        orders = [o for o in orders if o.get("status") == status]
-    
+    orders = await OrderService.list_orders(store_id, skip, limit, status=status)
     return {"orders": orders, "total": len(orders)}
 
 @router.get("/orders/{order_id}", tags=["Orders"])
@@ -130,8 +127,7 @@ async def get_order(order_id: str, store_id: str = Query(...)):
 @router.post("/orders", tags=["Orders"])
 async def create_order(request: dict = Body(...), store_id: str = Query(...)):
     """Create new order"""
-    print(f"DEBUG: Received request body: {request}")
-    print(f"DEBUG: Received status: {request.get('status')}")
+    logger.debug("Create order request: %s", request)
     order = await OrderService.create_order(
         store_id=store_id,
         customer_id=request.get("customer_id"),
@@ -145,7 +141,7 @@ async def create_order(request: dict = Body(...), store_id: str = Query(...)):
         payment_status=request.get("payment_status", "pending"),
         notes=request.get("notes")
     )
-    print(f"DEBUG: Created order with status: {order.get('status')}")
+    logger.debug("Created order %s with status %s", order.get("id"), order.get("status"))
     return order
 
 @router.put("/orders/{order_id}", tags=["Orders"])
@@ -0,0 +1,128 @@
+"""Fast JSON responses for large list payloads.
+
+Returning a plain dict from a route makes FastAPI walk it with
+jsonable_encoder, rebuilding every nested dict and list, before
+JSONResponse runs json.dumps over the copy. For pages of orders with
+nested items that walk dominates the request. The helpers here encode the
+service output in one pass, with orjson when it is installed.
+"""
+import dataclasses
+import hashlib
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional
+from uuid import UUID
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+# Clients keep the list but must revalidate it (cheaply, via If-None-Match)
+REVALIDATE = "private, no-cache"
+
+
+def _default(value: Any) -> Any:
+    """Encode the types jsonable_encoder would, for values JSON can't hold"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(content: Any) -> bytes:
+        """Encode content as compact UTF-8 JSON"""
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+else:
+    def dumps(content: Any) -> bytes:
+        """Encode content as compact UTF-8 JSON"""
+        return json.dumps(
+            content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that encodes with orjson (or compact json) in one pass"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def type_adapter(tp: Any) -> TypeAdapter:
+    """TypeAdapter for a response type, built once per type"""
+    return TypeAdapter(tp)
+
+
+def json_response(
+    content: Any,
+    response_type: Any = None,
+    *,
+    trusted: bool = True,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Respond with service output without FastAPI's encode/validate pass.
+
+    Output of the in-memory services is trusted: it is already made of
+    JSON-ready values, so it is encoded as is. Pass trusted=False with a
+    response_type to validate it once through a cached TypeAdapter (and
+    drop fields the type doesn't declare) before encoding.
+    """
+    if not trusted and response_type is not None:
+        adapter = type_adapter(response_type)
+        body = adapter.dump_json(adapter.validate_python(content))
+        return Response(body, status_code=status_code, headers=headers, media_type="application/json")
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag for a representation identified by parts.
+
+    Pass the data version together with everything else that shapes the
+    body (store, page parameters): equal parts mean an equal body.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether If-None-Match names etag, compared weakly as RFC 9110 requires.
+
+    A W/ prefix is ignored, so the weak tag the compression middleware puts
+    on encoded bodies still validates.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": REVALIDATE}
+
+
+def not_modified(etag: str) -> Response:
+    """304 for a client whose copy is current; no body is built"""
+    return Response(status_code=304, headers=cache_headers(etag))
@@ -0,0 +1,47 @@
+"""Shared test setup"""
+import pytest
+
+from src.application.business_logic import (
+    CACHE, ReportCache, SalesAnalytics,
+    MOCK_PRODUCTS_DB, MOCK_CUSTOMERS_DB, MOCK_ORDERS_DB, MOCK_DEBTS_DB, MOCK_JOURNAL_DB,
+    MOCK_DRAFT_ORDERS_DB, MOCK_EMPLOYEES_DB, CUSTOMER_TOTALS, SALES_ROLLUPS, PRODUCT_SALES, AUTH_TOKENS
+)
+
+# Every per-store collection a test store can leave records in
+STORES = (
+    MOCK_PRODUCTS_DB, MOCK_CUSTOMERS_DB, MOCK_ORDERS_DB, MOCK_DEBTS_DB, MOCK_JOURNAL_DB,
+    MOCK_DRAFT_ORDERS_DB, MOCK_EMPLOYEES_DB, CUSTOMER_TOTALS, SALES_ROLLUPS, PRODUCT_SALES, AUTH_TOKENS
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_read_cache():
+    """Tests reseed stores directly, bypassing the writes that invalidate the cache"""
+    CACHE.clear()
+    ReportCache._results.clear()
+    yield
+    CACHE.clear()
+    ReportCache._results.clear()
+
+
+@pytest.fixture
+def store(request):
+    """Isolated store seeded with products, customers and orders; yields its id.
+
+    The seed comes from the test module's STORE_ID, PRODUCTS, CUSTOMERS and
+    ORDERS, and an indirect parametrization can override any of them
+    (lowercase keys). Afterwards the store is dropped from every
+    collection, derived ones included. Modules whose every test needs it
+    set ``pytestmark = pytest.mark.usefixtures("store")``.
+    """
+    seed = {name: getattr(request.module, name.upper(), None)
+            for name in ("store_id", "products", "customers", "orders")}
+    seed.update(getattr(request, "param", {}))
+    store_id = seed["store_id"]
+    MOCK_PRODUCTS_DB[store_id] = [dict(product) for product in seed["products"] or ()]
+    MOCK_CUSTOMERS_DB[store_id] = [dict(customer) for customer in seed["customers"] or ()]
+    MOCK_ORDERS_DB[store_id] = [dict(order) for order in seed["orders"] or ()]
+    yield store_id
+    SalesAnalytics._projections.delete(store_id)
+    for db in STORES:
+        db.pop(store_id, None)
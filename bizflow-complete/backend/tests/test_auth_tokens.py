@@ -0,0 +1,38 @@
+"""Tests for session revocation and password reset tokens"""
+import time
+
+import pytest
+
+from src.application.business_logic import AUTH_TOKENS, AuthService, PasswordResets, RESET_TOKEN_TTL
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_session_pair():
+    """Logout drops the access and refresh token of that session only"""
+    first = await AuthService.login("admin@bizflow.com", "Admin@123")
+    second = await AuthService.login("admin@bizflow.com", "Admin@123")
+    assert await AuthService.logout(first["access_token"])
+    assert await AuthService.get_current_user(first["access_token"]) is None
+    assert await AuthService.refresh(first["refresh_token"]) is None
+    assert await AuthService.get_current_user(second["access_token"]) is not None
+
+    user_id = first["user"]["id"]
+    reset = await AuthService.request_password_reset("admin@bizflow.com")
+    await AuthService.revoke_all_tokens(user_id)
+    assert await AuthService.get_current_user(second["access_token"]) is None
+    assert not await AuthService.reset_password(reset["reset_token"], "Other@123")
+
+
+@pytest.mark.asyncio
+async def test_reset_tokens_are_indexed_by_user_and_swept():
+    """Pending tokens are found through the user_id index; the sweep drops expired ones"""
+    AUTH_TOKENS.pop(PasswordResets.SCOPE, None)
+    for user_id in ("u1", "u2"):
+        await PasswordResets.issue({"id": user_id, "email": f"{user_id}@example.com"})
+    pending = AUTH_TOKENS[PasswordResets.SCOPE]
+    assert set(pending._buckets["user_id"]) == {"u1", "u2"}
+    assert [record["email"] for record in pending.find(user_id="u2")] == ["u2@example.com"]
+
+    assert await PasswordResets.sweep() == 0
+    assert await PasswordResets.sweep(time.time() + RESET_TOKEN_TTL) == 2
+    assert len(AUTH_TOKENS[PasswordResets.SCOPE]) == 0
@@ -0,0 +1,225 @@
+"""Tests for the two-tier read cache"""
+import asyncio
+from typing import Dict, List, Optional
+
+import pytest
+
+from src.application.business_logic import (
+    CustomerService, OrderService, ProductService, StoreService,
+    MOCK_USERS_DB
+)
+from src.infrastructure.cache import MISSING, LocalCache, TieredCache, build_cache
+
+STORE_ID = "store_cache_test"
+
+
+class FakeRedis:
+    """In-process stand-in for the redis.asyncio client calls the cache makes"""
+
+    def __init__(self):
+        self.data: Dict[str, bytes] = {}
+        self.subscribers: List["FakePubSub"] = []
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> None:
+        self.data[key] = value.encode()
+
+    async def delete(self, *keys: str) -> int:
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def publish(self, channel: str, message: str) -> int:
+        receivers = [s for s in self.subscribers if channel in s.channels]
+        for subscriber in receivers:
+            subscriber.queue.put_nowait({"type": "message", "channel": channel, "data": message.encode()})
+        return len(receivers)
+
+    def pubsub(self) -> "FakePubSub":
+        return FakePubSub(self)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class FakePubSub:
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.channels = set()
+        self.queue: "asyncio.Queue[dict]" = asyncio.Queue()
+
+    async def subscribe(self, channel: str) -> None:
+        self.channels.add(channel)
+        self.redis.subscribers.append(self)
+
+    async def unsubscribe(self, channel: str) -> None:
+        self.channels.discard(channel)
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def aclose(self) -> None:
+        self.redis.subscribers.remove(self)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+PRODUCTS = [{"id": "p1", "name": "P1", "price": 1000, "quantity_in_stock": 10}]
+CUSTOMERS = [{"id": "c1", "name": "C1", "phone": "1", "address": "HN"}]
+
+
+def test_local_cache_expires_and_evicts_least_recently_used():
+    clock = Clock()
+    cache = LocalCache(maxsize=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    clock.now = 10
+    assert cache.get("a") is MISSING
+    assert len(cache) == 1
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+@pytest.mark.asyncio
+async def test_shared_storage_without_redis_caches_nothing():
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return {"id": "p1"}
+
+    for shared, loads in ((False, 1), (True, 2)):
+        calls.clear()
+        cache = build_cache("", shared=shared)
+        for _ in range(2):
+            assert await cache.get_or_load("product:s:p1", loader) == {"id": "p1"}
+        assert len(calls) == loads
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_reads_through_both_tiers():
+    redis = FakeRedis()
+    first, second = TieredCache(redis=redis), TieredCache(redis=redis)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return {"id": "p1", "price": 1000}
+
+    assert await first.get_or_load("product:s:p1", load) == {"id": "p1", "price": 1000}
+    # A second worker is filled from Redis, not the loader
+    assert await second.get_or_load("product:s:p1", load) == {"id": "p1", "price": 1000}
+    assert len(calls) == 1
+
+    async def load_none():
+        return None
+
+    assert await first.get_or_load("product:s:missing", load_none) is None
+    assert await first.get("product:s:missing") is MISSING
+
+
+@pytest.mark.asyncio
+async def test_load_invalidated_midway_is_not_cached():
+    cache = TieredCache()
+    loading, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_load():
+        loading.set()
+        await release.wait()
+        return {"price": 1000}
+
+    task = asyncio.create_task(cache.get_or_load("product:s:p1", slow_load))
+    await loading.wait()
+    # A write lands after the loader read the old price
+    cache.invalidate("product:s:p1")
+    release.set()
+    assert await task == {"price": 1000}
+    assert await cache.get("product:s:p1") is MISSING
+
+    async def load():
+        return {"price": 1500}
+
+    assert await cache.get_or_load("product:s:p1", load) == {"price": 1500}
+    assert await cache.get("product:s:p1") == {"price": 1500}
+    assert cache._loads == {}
+
+
+@pytest.mark.asyncio
+async def test_invalidation_reaches_other_workers():
+    redis = FakeRedis()
+    first, second = TieredCache(redis=redis), TieredCache(redis=redis)
+    await first.start()
+    await second.start()
+    try:
+        await first.set("customer:s:c1", {"name": "Old"})
+        assert await second.get("customer:s:c1") == {"name": "Old"}
+
+        first.invalidate("customer:s:c1")
+        await first.flush()
+        await asyncio.sleep(0)
+        assert await first.get("customer:s:c1") is MISSING
+        assert second.local.get("customer:s:c1") is MISSING
+        assert redis.data == {}
+    finally:
+        await first.close()
+        await second.close()
+    assert redis.subscribers == []
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_local():
+    class BrokenRedis(FakeRedis):
+        async def get(self, key):
+            raise ConnectionError("down")
+
+        async def set(self, key, value, ex=None):
+            raise ConnectionError("down")
+
+    cache = TieredCache(redis=BrokenRedis())
+
+    async def load():
+        return {"id": "p1"}
+
+    assert await cache.get_or_load("product:s:p1", load) == {"id": "p1"}
+    assert cache.local.get("product:s:p1") == {"id": "p1"}
+
+
+@pytest.mark.asyncio
+async def test_service_writes_invalidate_cached_reads(store):
+    assert (await ProductService.get_product("p1", STORE_ID))["price"] == 1000
+    await ProductService.update_product("p1", STORE_ID, {"price": 1500})
+    assert (await ProductService.get_product("p1", STORE_ID))["price"] == 1500
+
+    await OrderService.create_order(STORE_ID, "c1", [{"product_id": "p1", "quantity": 4}], payment_status="paid")
+    assert (await ProductService.get_product("p1", STORE_ID))["quantity_in_stock"] == 6
+
+    customer = await CustomerService.get_customer("c1", STORE_ID)
+    assert customer["total_purchases"] == 6000
+    await OrderService.create_order(STORE_ID, "c1", [{"product_id": "p1", "quantity": 1}])
+    assert (await CustomerService.get_customer("c1", STORE_ID))["outstanding_debt"] == 1500
+
+    await CustomerService.update_customer("c1", STORE_ID, {"name": "Renamed"})
+    assert (await CustomerService.get_customer("c1", STORE_ID))["name"] == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_store_info_follows_profile_updates(monkeypatch):
+    email = "cache-owner@example.com"
+    monkeypatch.setitem(MOCK_USERS_DB, email, {"email": email, "full_name": "Owner", "store_name": "Old"})
+    user = {"email": email, "store_id": STORE_ID, "store_name": "Old"}
+    assert (await StoreService.get_info(STORE_ID, user))["store_name"] == "Old"
+
+    updated = await StoreService.update_info(STORE_ID, user, {"store_name": "New", "phone": None})
+    assert updated["store_name"] == "New"
+    assert (await StoreService.get_info(STORE_ID, user))["store_name"] == "New"
+    assert await StoreService.update_info(STORE_ID, {"email": "nobody@example.com"}, {}) is None
@@ -0,0 +1,154 @@
+"""Tests for the columnar order projection and the reports built on it"""
+from datetime import datetime
+
+import numpy as np
+import pytest
+from src.application.business_logic import OrderService, ReportService, SalesAnalytics, STORAGE
+from src.infrastructure.columnar import OrderColumns, cross_tab, to_seconds
+
+STORE_ID = "store_columnar_test"
+
+
+def _order(order_id, created_at, total, customer="c1", paid=True, status="delivered", items=()):
+    return {
+        "id": order_id, "customer_id": customer, "created_at": created_at, "total_amount": total,
+        "payment_status": "paid" if paid else "pending", "status": status, "order_type": "counter",
+        "payment_method": "cash", "employee_id": "e1",
+        "items": [{"product_id": pid, "quantity": qty, "subtotal": qty * 100} for pid, qty in items],
+    }
+
+
+ORDERS = [
+    _order("o1", "2026-01-15T10:00:00", 300, items=[("p1", 1), ("p2", 2)]),
+    _order("o2", "2026-01-15T18:00:00", 200, customer="c2", paid=False, items=[("p1", 2)]),
+    _order("o3", "2026-01-17T09:00:00", 500, items=[("p2", 5)]),
+    _order("o4", "2026-01-18T09:00:00", 900, customer="c2", status="cancelled", items=[("p1", 9)]),
+]
+
+
+PRODUCTS = [
+    {"id": "p1", "name": "P1", "price": 100, "cost": 60, "category": "Drinks", "quantity_in_stock": 10, "min_quantity_alert": 2},
+    {"id": "p2", "name": "P2", "price": 100, "cost": 40, "category": "Snacks", "quantity_in_stock": 1, "min_quantity_alert": 2},
+    {"id": "p3", "name": "P3", "price": 100, "cost": 50, "category": "Drinks", "quantity_in_stock": 4, "min_quantity_alert": 2},
+]
+CUSTOMERS = [{"id": "c1", "name": "C1"}, {"id": "c2", "name": "C2"}]
+
+pytestmark = pytest.mark.usefixtures("store")
+
+
+@pytest.mark.parametrize("chunks", [[ORDERS], [ORDERS[:1], ORDERS[1:3], ORDERS[3:]], [ORDERS[2:], ORDERS[:2]]])
+def test_windows_and_group_bys(chunks):
+    columns = OrderColumns()
+    for chunk in chunks:
+        columns.append(chunk)
+    assert (columns.order_count, columns.item_count) == (4, 5)
+
+    assert columns.revenue() == 800
+    assert columns.revenue("2026-01-15", "2026-01-16") == 300
+    assert columns.revenue("2026-01-15", "2026-01-16", paid_only=False) == 500
+    assert columns.order_count_between("2026-01-15T12:00:00") == 2
+    assert columns.average_order_value() == 400
+
+    by_customer = columns.group_orders("customer", size=len(columns.customers))
+    assert dict(zip(columns.customers.labels, by_customer)) == {"c1": 800, "c2": 0}
+    sold = columns.group_items("product", "quantity", end="2026-01-17", paid_only=False)
+    assert dict(zip(columns.products.labels, sold)) == {"p1": 3, "p2": 2}
+
+    days, daily = columns.daily_revenue("2026-01-15", "2026-01-18")
+    assert list(days) == [to_seconds(f"2026-01-{d}") for d in (15, 16, 17)]
+    assert list(daily) == [300, 0, 500]
+
+
+def test_extend_with_arrays():
+    columns = OrderColumns()
+    for offset in (0, 3):
+        columns.extend(
+            {
+                "created": np.arange(3, dtype=np.int64) + offset,
+                "total": np.full(3, 10.0),
+                "discount": np.zeros(3),
+                "paid": np.ones(3, dtype=bool),
+                "active": np.ones(3, dtype=bool),
+                **{name: np.zeros(3, dtype=np.int32)
+                   for name in ("customer", "employee", "order_type", "payment_method")},
+            },
+            {"order": np.array([0, 2]), "product": np.array([0, 1], dtype=np.int32),
+             "quantity": np.ones(2), "amount": np.array([1.0, 2.0])},
+        )
+    assert list(columns.item_column("order")) == [0, 2, 3, 5]
+    assert columns.revenue(1, 4) == 30
+    assert list(columns.group_items("product", start=2, end=4, size=2)) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_reports_and_refresh_after_writes():
+    report = await ReportService.get_revenue_report(STORE_ID, datetime(2026, 1, 15), datetime(2026, 1, 17))
+    assert (report["total_revenue"], report["total_orders"], report["average_order_value"]) == (800, 2, 400)
+    # Paid items: p1 x1 at 60, p2 x7 at 40
+    assert (report["total_cost"], report["total_profit"]) == (340, 460)
+    assert [day["revenue"] for day in report["daily"]] == [300, 0, 500]
+
+    customers = await ReportService.get_customer_report(STORE_ID)
+    assert (customers["buying_customers"], customers["repeat_customers"]) == (2, 1)
+    assert customers["top_customers"] == [{"customer_id": "c1", "total_spent": 800, "orders": 2}]
+
+    inventory = await ReportService.get_inventory_report(STORE_ID, slow_days=100000)
+    assert (inventory["total_quantity"], inventory["total_value"], inventory["low_stock_count"]) == (15, 840, 1)
+    assert [p["product_id"] for p in inventory["slow_moving"]] == ["p3"]
+
+    before = await SalesAnalytics.columns(STORE_ID)
+    assert await SalesAnalytics.columns(STORE_ID) is before
+    await OrderService.create_order(STORE_ID, "c2", [{"product_id": "p3", "quantity": 2, "unit": "cái"}],
+                                    payment_status="paid")
+    after = await SalesAnalytics.columns(STORE_ID)
+    assert after.order_count == 5
+    assert (await ReportService.get_analytics(STORE_ID))["total_revenue"] == 1000
+
+
+@pytest.mark.asyncio
+async def test_new_orders_are_appended_and_rewrites_rebuild():
+    before = await SalesAnalytics.columns(STORE_ID)
+    created = await OrderService.create_order(STORE_ID, "c2", [{"product_id": "p3", "quantity": 2, "unit": "cái"}],
+                                              payment_status="paid")
+    appended = await SalesAnalytics.columns(STORE_ID)
+    assert appended is before and appended.order_count == 5
+
+    # Added behind the projection's last (created_at, id): caught by the count
+    await STORAGE.orders.add(STORE_ID, _order("o0", "2026-01-01T08:00:00", 100))
+    behind = await SalesAnalytics.columns(STORE_ID)
+    assert behind is not appended and behind.order_count == 6
+
+    await OrderService.update_order(created["id"], STORE_ID, {"status": "cancelled"})
+    rebuilt = await SalesAnalytics.columns(STORE_ID)
+    assert rebuilt is not behind and rebuilt.order_count == 6
+    assert rebuilt.order_column("active").sum() == 4
+
+
+def test_cross_tab_counts_distinct_groups():
+    rows, cols = np.array([0, 0, 1, 1]), np.array([1, 1, 0, 1])
+    assert cross_tab(rows, 2, cols, 2).tolist() == [[0, 2], [1, 1]]
+    assert cross_tab(rows, 2, cols, 2, weights=np.array([1.0, 2, 3, 4])).tolist() == [[0, 3], [3, 4]]
+    assert cross_tab(rows, 2, cols, 2, groups=np.array([7, 7, 8, 9])).tolist() == [[0, 1], [1, 1]]
+
+
+@pytest.mark.asyncio
+async def test_pivot():
+    pivot = await ReportService.get_pivot(STORE_ID, "category", "hour")
+    assert (pivot["row_labels"], pivot["col_labels"]) == (["Drinks", "Snacks"], [9, 10])
+    assert (pivot["values"], pivot["total"]) == ([[0, 100], [500, 200]], 800)
+
+    # 2026-01-15 is a Thursday, 2026-01-17 a Saturday
+    pivot = await ReportService.get_pivot(STORE_ID, "customer", "weekday", "orders", paid_only=False)
+    assert (pivot["row_labels"], pivot["col_labels"]) == (["c1", "c2"], [3, 5])
+    assert (pivot["values"], pivot["total"]) == ([[1, 1], [1, 0]], 3)
+
+    pivot = await ReportService.get_pivot(STORE_ID, "product", None, "quantity", datetime(2026, 1, 15),
+                                          datetime(2026, 1, 15), paid_only=False)
+    assert (pivot["row_labels"], pivot["col_labels"], pivot["values"]) == (["p1", "p2"], ["quantity"], [[3], [2]])
+    pivot = await ReportService.get_pivot(STORE_ID, "day", "payment_method", start_date=datetime(2026, 2, 1))
+    assert (pivot["row_labels"], pivot["values"], pivot["total"]) == ([], [], 0)
+
+    with pytest.raises(ValueError):
+        await ReportService.get_pivot(STORE_ID, "colour")
+    with pytest.raises(ValueError):
+        await ReportService.get_pivot(STORE_ID, "product", measure="margin")
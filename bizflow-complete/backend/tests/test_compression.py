@@ -0,0 +1,103 @@
+"""Tests for the response compression middleware"""
+import gzip
+import zlib
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from src.presentation.compression import CompressionMiddleware, choose_encoding
+
+BIG = b'{"id":"prod_001","name":"Xi mang Ha Tien"},' * 200
+
+
+async def big(request):
+    return Response(BIG, media_type="application/json")
+
+
+async def small(request):
+    return PlainTextResponse("ok")
+
+
+async def image(request):
+    return Response(BIG, media_type="image/png")
+
+
+async def encoded(request):
+    return Response(gzip.compress(BIG), headers={"Content-Encoding": "gzip"}, media_type="application/json")
+
+
+async def stream(request):
+    async def chunks():
+        for i in range(50):
+            yield b'{"line":%d,"account":"4000"},' % i * 10
+    return StreamingResponse(chunks(), media_type="application/json")
+
+
+app = CompressionMiddleware(
+    Starlette(routes=[Route(f"/{f.__name__}", f) for f in (big, small, image, encoded, stream)]),
+    minimum_size=500,
+)
+
+
+async def fetch(path, accept_encoding):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        # Read the raw bytes, as httpx would otherwise decode them for us
+        async with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+            return response, b"".join([chunk async for chunk in response.aiter_raw()])
+
+
+def test_choose_encoding_honours_q_values():
+    """gzip is preferred; q=0 refuses a coding and * stands in for the rest"""
+    assert choose_encoding("gzip, deflate, br") == "gzip"
+    assert choose_encoding("deflate") == "deflate"
+    assert choose_encoding("gzip;q=0, deflate") == "deflate"
+    assert choose_encoding("gzip;q=0.2, deflate;q=0.8") == "deflate"
+    assert choose_encoding("*") == "gzip"
+    assert choose_encoding("identity") is None
+    assert choose_encoding("") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("coding, decompress", [("gzip", gzip.decompress), ("deflate", zlib.decompress)])
+async def test_large_response_is_compressed(coding, decompress):
+    response, body = await fetch("/big", coding)
+    assert response.headers["content-encoding"] == coding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(body) < len(BIG)
+    assert decompress(body) == BIG
+
+
+@pytest.mark.asyncio
+async def test_small_or_unaccepted_response_is_sent_as_is():
+    response, body = await fetch("/small", "gzip")
+    assert "content-encoding" not in response.headers
+    assert body == b"ok"
+
+    response, body = await fetch("/big", "identity")
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert body == BIG
+
+
+@pytest.mark.asyncio
+async def test_compressed_media_is_skipped():
+    response, body = await fetch("/image", "gzip")
+    assert "content-encoding" not in response.headers
+    assert body == BIG
+
+    response, body = await fetch("/encoded", "deflate")
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body) == BIG
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_is_compressed_in_chunks():
+    response, body = await fetch("/stream", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    expected = b"".join(b'{"line":%d,"account":"4000"},' % i * 10 for i in range(50))
+    assert gzip.decompress(body) == expected
@@ -0,0 +1,112 @@
+"""Tests for ETag / If-None-Match on the product and customer lists"""
+import httpx
+import pytest
+
+from src.application.business_logic import (
+    CustomerService, OrderService, ProductService,
+    MOCK_PRODUCTS_DB
+)
+from src.infrastructure.entity_store import EntityCollection
+from src.main import app
+from src.presentation.responses import etag_matches
+
+STORE_ID = "store_etag_test"
+
+
+PRODUCTS = [{"id": "p1", "name": "P1", "price": 1000, "quantity_in_stock": 100}]
+CUSTOMERS = [{"id": "c1", "name": "C1", "phone": "1", "address": "HN"}]
+
+pytestmark = pytest.mark.usefixtures("store")
+
+
+async def fetch(path, **headers):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path, params={"store_id": STORE_ID}, headers=headers)
+
+
+def test_collection_version_changes_on_every_write():
+    collection = EntityCollection([{"id": "a"}])
+    versions = [collection.version]
+    collection.add({"id": "b"})
+    versions.append(collection.version)
+    collection.update("a", {"name": "A"})
+    versions.append(collection.version)
+    collection.remove("b")
+    versions.append(collection.version)
+    collection.touch()
+    versions.append(collection.version)
+    assert len(set(versions)) == len(versions)
+    # A replacement collection never reuses an earlier version
+    assert EntityCollection([{"id": "a"}]).version not in versions
+
+
+def test_if_none_match_uses_weak_comparison():
+    assert etag_matches('"x"', '"x"')
+    assert etag_matches('W/"x"', '"x"')
+    assert etag_matches('"y", W/"x"', '"x"')
+    assert etag_matches("*", '"x"')
+    assert not etag_matches('"y"', '"x"')
+    assert not etag_matches(None, '"x"')
+
+
+@pytest.mark.asyncio
+async def test_unchanged_products_answer_304_until_a_write():
+    first = await fetch("/api/products")
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    cached = await fetch("/api/products", **{"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    await ProductService.update_product("p1", STORE_ID, {"price": 1200})
+    changed = await fetch("/api/products", **{"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["products"][0]["price"] == 1200
+
+
+@pytest.mark.asyncio
+async def test_stock_moved_by_an_order_changes_the_product_etag():
+    etag = (await fetch("/api/products")).headers["etag"]
+    await OrderService.create_order(STORE_ID, "c1", [{"product_id": "p1", "quantity": 2}], payment_status="paid")
+    response = await fetch("/api/products", **{"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["products"][0]["quantity_in_stock"] == 98
+
+
+@pytest.mark.asyncio
+async def test_customer_304_skips_normalization(monkeypatch):
+    etag = (await fetch("/api/customers")).headers["etag"]
+
+    def fail(*args):
+        raise AssertionError("list built for an unchanged store")
+
+    monkeypatch.setattr(CustomerService, "_normalize_customer", staticmethod(fail))
+    response = await fetch("/api/customers", **{"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_order_events_change_the_customer_etag():
+    """Customer reads carry order totals, so orders invalidate them too"""
+    etag = (await fetch("/api/customers")).headers["etag"]
+    await OrderService.create_order(STORE_ID, "c1", [{"product_id": "p1", "quantity": 1}])
+    response = await fetch("/api/customers", **{"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["customers"][0]["outstanding_debt"] == 1000
+
+
+@pytest.mark.asyncio
+async def test_compressed_list_validates_with_its_weak_etag():
+    big = [{"id": f"p{i}", "name": f"Product {i}", "price": 1000, "quantity_in_stock": 5} for i in range(100)]
+    MOCK_PRODUCTS_DB[STORE_ID] = big
+    first = await fetch("/api/products", **{"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["etag"].startswith('W/"')
+
+    cached = await fetch("/api/products", **{"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]})
+    assert cached.status_code == 304
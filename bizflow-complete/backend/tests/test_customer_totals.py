@@ -0,0 +1,100 @@
+"""Tests for incrementally maintained customer totals"""
+import pytest
+from src.application.business_logic import (
+    CustomerService, OrderService, CustomerTotals, SalesRollups, STORAGE,
+    MOCK_CUSTOMERS_DB
+)
+
+STORE_ID = "store_totals_test"
+
+
+PRODUCTS = [{"id": "p1", "name": "P1", "price": 1000, "quantity_in_stock": 100}]
+CUSTOMERS = [{"id": "c1", "name": "C1", "phone": "1", "address": "HN"}]
+
+pytestmark = pytest.mark.usefixtures("store")
+
+
+def _items(quantity):
+    return [{"product_id": "p1", "quantity": quantity, "unit": "cái"}]
+
+
+@pytest.mark.asyncio
+async def test_totals_follow_order_events():
+    """Create, pay and delete orders move the customer's totals"""
+    unpaid = await OrderService.create_order(STORE_ID, "c1", _items(2))
+    await OrderService.create_order(STORE_ID, "c1", _items(3), payment_status="paid")
+
+    customer = await CustomerService.get_customer("c1", STORE_ID)
+    assert customer["outstanding_debt"] == 2000
+    assert customer["total_purchases"] == 3000
+    assert customer["total_transactions"] == 2
+
+    await OrderService.update_order(unpaid["id"], STORE_ID, {"payment_status": "paid"})
+    customer = await CustomerService.get_customer("c1", STORE_ID)
+    assert customer["outstanding_debt"] == 0
+    assert customer["total_purchases"] == 5000
+
+    await OrderService.delete_order(unpaid["id"], STORE_ID)
+    customer = await CustomerService.get_customer("c1", STORE_ID)
+    assert customer["total_purchases"] == 3000
+    assert customer["total_transactions"] == 1
+    assert await CustomerService.check_totals(STORE_ID) == []
+
+
+@pytest.mark.asyncio
+async def test_cancelled_orders_count_nowhere():
+    """Cancelling an order clears it from the customer's totals, as from the sales rollups"""
+    unpaid = await OrderService.create_order(STORE_ID, "c1", _items(2))
+    await OrderService.create_order(STORE_ID, "c1", _items(3), payment_status="paid")
+    await OrderService.update_order(unpaid["id"], STORE_ID, {"status": "cancelled"})
+
+    customer = await CustomerService.get_customer("c1", STORE_ID)
+    assert customer["outstanding_debt"] == 0
+    assert customer["total_purchases"] == 3000
+    assert customer["total_transactions"] == 1
+    assert (await SalesRollups.get(STORE_ID, "all"))["unpaid_amount"] == 0
+    assert await CustomerTotals.check_consistency(STORE_ID) == []
+
+    await CustomerTotals.rebuild(STORE_ID)
+    assert (await CustomerService.get_customer("c1", STORE_ID))["outstanding_debt"] == 0
+
+
+@pytest.mark.asyncio
+async def test_consistency_check_detects_drift():
+    """Direct mutation of an order shows up as drift until rebuilt"""
+    order = await OrderService.create_order(STORE_ID, "c1", _items(1))
+    order["total_amount"] = 9999
+
+    drift = await CustomerTotals.check_consistency(STORE_ID)
+    assert drift == [{
+        "customer_id": "c1",
+        "field": "outstanding_debt",
+        "running": 1000,
+        "expected": 9999,
+    }]
+
+    await CustomerTotals.rebuild(STORE_ID)
+    assert await CustomerTotals.check_consistency(STORE_ID) == []
+
+
+@pytest.mark.asyncio
+async def test_customer_pages_read_totals_once(monkeypatch):
+    MOCK_CUSTOMERS_DB[STORE_ID].add({"id": "c2", "name": "C2", "phone": "2", "address": "HCM"})
+    await OrderService.create_order(STORE_ID, "c2", _items(4), payment_status="paid")
+    reads = []
+    get_many = STORAGE.customer_totals.get_many
+
+    async def counted(store_id, customer_ids):
+        reads.append(list(customer_ids))
+        return await get_many(store_id, customer_ids)
+
+    async def per_customer(store_id, customer_id):
+        raise AssertionError("totals read one customer at a time")
+
+    monkeypatch.setattr(STORAGE.customer_totals, "get_many", counted)
+    monkeypatch.setattr(STORAGE.customer_totals, "get", per_customer)
+    page = await CustomerService.page_customers(STORE_ID, limit=10)
+    assert [(c["id"], c["total_purchases"]) for c in page["items"]] == [("c1", 0), ("c2", 4000)]
+    listed = await CustomerService.list_customers(STORE_ID)
+    assert [c["total_transactions"] for c in listed] == [0, 1]
+    assert reads == [["c1", "c2"], ["c1", "c2"]]
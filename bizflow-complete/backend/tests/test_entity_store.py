@@ -0,0 +1,79 @@
+"""Unit tests for the in-memory entity store"""
+import pytest
+from src.infrastructure.entity_store import EntityCollection, EntityStore
+from src.application.business_logic import ProductService, MOCK_PRODUCTS_DB
+
+
+def test_collection_lookup_and_order():
+    """Records are found by id and listed in insertion order"""
+    collection = EntityCollection([{"id": "b"}, {"id": "a"}, {"id": "c"}])
+    assert collection.get("a") == {"id": "a"}
+    assert collection.get("missing") is None
+    assert [r["id"] for r in collection] == ["b", "a", "c"]
+    assert [r["id"] for r in collection.page(1, 5)] == ["a", "c"]
+
+
+def test_collection_remove_keeps_order_and_sequence():
+    """Deleting does not shift other records or reuse the sequence"""
+    collection = EntityCollection([{"id": "1"}, {"id": "2"}, {"id": "3"}])
+    assert collection.remove("2") == {"id": "2"}
+    assert collection.remove("2") is None
+    assert [r["id"] for r in collection] == ["1", "3"]
+    assert len(collection) == 2
+    assert collection.sequence == 3
+
+
+def test_store_wraps_assigned_lists():
+    """Assigning a list to a store id yields an indexed collection"""
+    store = EntityStore({"s1": [{"id": "x"}]})
+    store["s2"] = []
+    assert isinstance(store["s1"], EntityCollection)
+    assert store.collection("s1").get("x") == {"id": "x"}
+    assert len(store.collection("unknown")) == 0
+    assert "unknown" not in store
+
+
+@pytest.mark.asyncio
+async def test_product_ids_stay_unique_after_delete():
+    """Generated ids never collide with existing ones after a delete"""
+    store_id = "store_entity_test"
+    first = await ProductService.create_product(store_id, {"name": "A", "sku": "A"})
+    await ProductService.delete_product(first["id"], store_id)
+    second = await ProductService.create_product(store_id, {"name": "B", "sku": "B"})
+    third = await ProductService.create_product(store_id, {"name": "C", "sku": "C"})
+    assert len({first["id"], second["id"], third["id"]}) == 3
+    assert await ProductService.get_product(second["id"], store_id) == second
+    MOCK_PRODUCTS_DB.pop(store_id)
+
+
+def _indexed_collection():
+    return EntityCollection(
+        [
+            {"id": "o1", "status": "draft", "customer_id": "c1"},
+            {"id": "o2", "status": "paid", "customer_id": "c2"},
+            {"id": "o3", "status": "draft", "customer_id": "c2"},
+            {"id": "o4", "status": "draft", "customer_id": "c1"},
+        ],
+        indexes={"status": lambda r: r.get("status"), "customer_id": lambda r: r.get("customer_id")},
+    )
+
+
+def test_find_filters_before_paginating():
+    """Pagination applies to the filtered records, in insertion order"""
+    collection = _indexed_collection()
+    assert [r["id"] for r in collection.find(0, 2, status="draft")] == ["o1", "o3"]
+    assert [r["id"] for r in collection.find(2, 2, status="draft")] == ["o4"]
+    assert [r["id"] for r in collection.find(status="draft", customer_id="c2")] == ["o3"]
+    assert [r["id"] for r in collection.find(status=None)] == ["o1", "o2", "o3", "o4"]
+    assert collection.count(status="draft") == 3
+
+
+def test_update_and_remove_refresh_indexes():
+    """Changed or deleted records leave their old index buckets"""
+    collection = _indexed_collection()
+    collection.update("o1", {"status": "paid"})
+    collection.remove("o3")
+    assert [r["id"] for r in collection.find(status="draft")] == ["o4"]
+    # o1 keeps its original position among paid orders
+    assert [r["id"] for r in collection.find(status="paid")] == ["o1", "o2"]
+    assert collection.count(customer_id="c2") == 1
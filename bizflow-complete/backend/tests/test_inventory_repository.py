@@ -0,0 +1,109 @@
+"""Tests for atomic stock movements in the SQL inventory repository"""
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.application.exceptions import InsufficientInventoryException
+from src.application.use_cases import CreateOrderUseCase
+from src.domain.entities import Product
+from src.infrastructure.models import Base, InventoryModel, OrderModel
+from src.infrastructure.repositories import InventoryRepository
+from src.infrastructure.unit_of_work import UnitOfWork
+
+
+@pytest_asyncio.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        session.add_all([
+            InventoryModel(id="i1", product_id="p1", business_id="b1", quantity=10),
+            InventoryModel(id="i2", product_id="p2", business_id="b1", quantity=3),
+        ])
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+async def _stock(session):
+    result = await session.execute(select(InventoryModel.product_id, InventoryModel.quantity))
+    return dict(result.all())
+
+
+@pytest.mark.asyncio
+async def test_decrement_stock_only_when_available(session):
+    """A decrement succeeds while stock lasts and raises once it would go negative"""
+    repo = InventoryRepository(session)
+    inventory = await repo.decrement_stock("b1", "p2", 2)
+    assert inventory.quantity == 1
+
+    with pytest.raises(InsufficientInventoryException) as exc:
+        await repo.decrement_stock("b1", "p2", 2)
+    assert exc.value.detail == {"product_id": "p2", "required": 2, "available": 1}
+    assert await _stock(session) == {"p1": 10, "p2": 1}
+
+
+@pytest.mark.asyncio
+async def test_bulk_decrement_is_all_or_nothing(session):
+    """An order line that can't be satisfied leaves every product untouched"""
+    repo = InventoryRepository(session)
+    with pytest.raises(InsufficientInventoryException) as exc:
+        await repo.decrement_stock_bulk("b1", {"p1": 4, "p2": 5})
+    assert exc.value.detail["product_id"] == "p2"
+    assert await _stock(session) == {"p1": 10, "p2": 3}
+
+    taken = await repo.decrement_stock_bulk("b1", {"p1": 4, "p2": 3})
+    assert {i.product_id: i.quantity for i in taken} == {"p1": 6, "p2": 0}
+    assert await _stock(session) == {"p1": 6, "p2": 0}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("quantity", [-5, 0])
+async def test_bulk_decrement_rejects_non_positive_quantities(session, quantity):
+    repo = InventoryRepository(session)
+    with pytest.raises(ValueError):
+        await repo.decrement_stock_bulk("b1", {"p1": 1, "p2": quantity})
+    assert await _stock(session) == {"p1": 10, "p2": 3}
+
+
+@pytest.mark.asyncio
+async def test_decrement_only_touches_the_business_inventory(session):
+    """Another business's row for the same product is neither taken nor read"""
+    session.add(InventoryModel(id="i3", product_id="p2", business_id="b2", quantity=50))
+    await session.commit()
+    repo = InventoryRepository(session)
+    with pytest.raises(InsufficientInventoryException) as exc:
+        await repo.decrement_stock("b1", "p2", 5)
+    assert exc.value.detail["available"] == 3
+
+    taken = await repo.decrement_stock("b2", "p2", 5)
+    assert (taken.id, taken.quantity) == ("i3", 45)
+    assert (await session.get(InventoryModel, "i2")).quantity == 3
+
+
+class Catalog:
+    """Product lookups for the order use case"""
+
+    async def get_by_id(self, product_id):
+        return Product(id=product_id, business_id="b1", name=product_id.upper(), price=100)
+
+
+@pytest.mark.asyncio
+async def test_create_order_takes_stock_in_its_transaction(session):
+    """Order lines are summed per product and taken with the order, or not at all"""
+    items = [{"product_id": "p1", "quantity": 1}, {"product_id": "p2", "quantity": 2},
+             {"product_id": "p2", "quantity": 2}]
+    with pytest.raises(InsufficientInventoryException):
+        async with UnitOfWork(session) as uow:
+            await CreateOrderUseCase(uow.orders, Catalog(), uow.inventory).execute("b1", "e1", "C1", items)
+            await uow.commit()
+    assert await _stock(session) == {"p1": 10, "p2": 3}
+    assert (await session.execute(select(OrderModel))).first() is None
+
+    async with UnitOfWork(session) as uow:
+        order = await CreateOrderUseCase(uow.orders, Catalog(), uow.inventory).execute("b1", "e1", "C1", items[:2])
+        await uow.commit()
+    assert order.total_amount == 300
+    assert await _stock(session) == {"p1": 9, "p2": 1}
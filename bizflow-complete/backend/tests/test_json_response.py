@@ -0,0 +1,45 @@
+"""Tests for the fast JSON response helpers"""
+import json
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from src.application.dtos import CustomerResponse
+from src.presentation.responses import dumps, json_response, type_adapter
+
+
+class Status(str, Enum):
+    PAID = "paid"
+
+
+class Line(BaseModel):
+    sku: str
+    quantity: int
+
+
+def test_dumps_matches_jsonable_encoder():
+    """The one-pass encoder produces the same JSON as FastAPI's default path"""
+    content = {
+        "orders": [
+            {"id": "o1", "created_at": datetime(2026, 1, 2, 3, 4, 5, 6000), "status": Status.PAID,
+             "total": Decimal("12.5"), "items": [Line(sku="A", quantity=2)], "tags": ("x",)},
+        ],
+        "total": 1,
+        "next_cursor": None,
+        "note": "Khách hàng",
+    }
+    assert json.loads(dumps(content)) == jsonable_encoder(content)
+
+
+def test_validated_response_drops_undeclared_fields():
+    """Untrusted output is validated once and serialized by the cached adapter"""
+    customers = [{"id": "c1", "store_id": "s1", "name": "A", "phone": "1", "secret": "x"}]
+    response = json_response(customers, List[CustomerResponse], trusted=False)
+    body = json.loads(response.body)
+    assert body[0]["id"] == "c1" and "secret" not in body[0]
+    assert type_adapter(List[CustomerResponse]) is type_adapter(List[CustomerResponse])
+    assert json.loads(json_response(customers).body) == customers
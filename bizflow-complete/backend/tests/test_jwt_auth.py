@@ -0,0 +1,97 @@
+"""Unit tests for JWT authentication"""
+import pytest
+
+from src.infrastructure.entity_store import EntityStore
+from src.infrastructure import jwt_auth
+from src.infrastructure.jwt_auth import JWTAuthenticator
+from src.infrastructure.storage import MemoryCollection
+
+SECRET = "test-secret-with-at-least-32-bytes!"
+USER = {"id": "user_1", "email": "a@example.com", "role": "owner", "store_id": "store_1"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_any_worker_with_the_secret_verifies():
+    """Tokens verify on another instance with the same secret and nowhere else"""
+    access, refresh, _ = JWTAuthenticator(secret=SECRET).issue_pair(USER)
+    other = JWTAuthenticator(secret=SECRET)
+    assert (await other.verify(access))["sub"] == "user_1"
+    assert (await other.verify(refresh, "refresh"))["store_id"] == "store_1"
+    assert await other.verify(refresh) is None
+    assert await JWTAuthenticator(secret=SECRET[::-1]).verify(access) is None
+    assert await other.verify(access[:-2] + "xx") is None
+
+
+@pytest.mark.asyncio
+async def test_verified_claims_are_cached_but_still_expire():
+    """Repeated verifications hit the LRU; expiry applies to cached claims"""
+    clock = FakeClock()
+    auth = JWTAuthenticator(secret=SECRET, cache_size=2, clock=clock)
+    tokens = [auth.issue_pair(USER)[0] for _ in range(3)]
+    for token in tokens[:1] * 3:
+        assert await auth.verify(token)
+    assert (auth.hits, auth.misses) == (2, 1)
+    for token in tokens:
+        await auth.verify(token)
+    assert len(auth._verified) == 2
+
+    clock.now += auth.ttls["access"]
+    assert await auth.verify(tokens[2]) is None
+
+
+@pytest.mark.asyncio
+async def test_revocation():
+    """Logout revokes one session; revoking a user rejects everything issued before"""
+    clock = FakeClock()
+    auth = JWTAuthenticator(secret=SECRET, clock=clock)
+    a1, r1, _ = auth.issue_pair(USER)
+    a2, _, _ = auth.issue_pair(USER)
+    await auth.revoke_session(await auth.verify(a1))
+    assert await auth.verify(a1) is None and await auth.verify(r1, "refresh") is None
+    assert await auth.verify(a2)
+
+    clock.now += 1
+    await auth.revoke_user("user_1")
+    assert await auth.verify(a2) is None
+    clock.now += 0.001
+    assert await auth.verify(auth.issue_pair(USER)[0])
+
+
+@pytest.mark.asyncio
+async def test_revocations_reach_other_workers():
+    """Workers sharing the revocations collection see each other's logouts once their cache expires"""
+    clock = FakeClock()
+    shared = MemoryCollection(EntityStore())
+    here, there = (JWTAuthenticator(secret=SECRET, clock=clock, revocations=shared, revocation_ttl=5)
+                   for _ in range(2))
+    access, _, _ = here.issue_pair(USER)
+    assert await there.verify(access)
+    await here.revoke_session(await here.verify(access))
+    assert await here.verify(access) is None
+    clock.now += 5
+    assert await there.verify(access) is None
+
+    # Expired session ids are dropped on the next write
+    clock.now += here.ttls["refresh"]
+    await there.revoke_user("user_1")
+    assert (await shared.get("revocations", "user_1"))["sessions"] == {}
+
+
+def test_secret_key_is_required_outside_development(monkeypatch):
+    monkeypatch.delenv("JWT_SECRET_KEY", raising=False)
+    monkeypatch.setattr(jwt_auth, "ENVIRONMENT", "production")
+    with pytest.raises(RuntimeError):
+        jwt_auth._secret_key()
+    monkeypatch.setattr(jwt_auth, "ENVIRONMENT", "development")
+    assert jwt_auth._secret_key() != jwt_auth._secret_key()
+    monkeypatch.setenv("JWT_SECRET_KEY", SECRET)
+    monkeypatch.setattr(jwt_auth, "ENVIRONMENT", "production")
+    assert jwt_auth._secret_key() == SECRET
@@ -0,0 +1,27 @@
+"""Tests for queue-backed logging setup"""
+import logging
+
+from src.infrastructure.logging import setup_logging, shutdown_logging
+
+
+def test_records_reach_files_through_the_queue(tmp_path):
+    """Only a QueueHandler sits on the root logger; files get the records"""
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    try:
+        setup_logging("INFO", str(tmp_path))
+        assert [type(h).__name__ for h in root.handlers] == ["QueueHandler"]
+        log = logging.getLogger("test.logging")
+        log.debug("hidden %s", "debug")
+        log.info("order %s saved", "o1")
+        log.error("boom")
+        shutdown_logging()
+
+        app_log = (tmp_path / "app.log").read_text()
+        assert "order o1 saved" in app_log and "hidden" not in app_log
+        assert "boom" in (tmp_path / "error.log").read_text()
+        assert "order o1" not in (tmp_path / "error.log").read_text()
+    finally:
+        shutdown_logging()
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
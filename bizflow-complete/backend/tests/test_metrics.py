@@ -0,0 +1,47 @@
+"""Tests for the metrics registry and /metrics endpoint"""
+import re
+
+import httpx
+import pytest
+
+from src.infrastructure.metrics import MetricsRegistry
+from src.main import app
+
+
+def test_render_text_exposition_format():
+    """Counters, collected gauges and cumulative histogram buckets render as Prometheus text"""
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("route",))
+    registry.gauge("records", "Records", ("collection",), collector=lambda: [(("orders",), 3)])
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+    requests.labels('/a"b').inc()
+    requests.labels('/a"b').inc(2)
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{route="/a\\"b"} 3' in lines
+    assert 'records{collection="orders"} 3' in lines
+    assert 'latency_seconds_bucket{le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{le="1"} 3' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+    assert "latency_seconds_count 4" in lines
+    assert "latency_seconds_sum 3.65" in lines
+
+
+@pytest.mark.asyncio
+async def test_requests_recorded_by_route_template():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/api/products/prod_missing", params={"store_id": "store_123"})
+        response = await client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    # The template, not the raw path; FastAPI versions differ on keeping the /api prefix
+    assert re.search(r'bizflow_http_requests_total\{method="GET",route="(/api)?/products/\{product_id\}",status="401"\} \d', body)
+    assert re.search(r'bizflow_http_request_duration_seconds_count\{method="GET",route="(/api)?/products/\{product_id\}"\}', body)
+    assert "prod_missing" not in body
+    assert "bizflow_http_requests_in_flight 1" in body
+    assert 'bizflow_store_records{collection="products"}' in body
@@ -0,0 +1,77 @@
+"""Tests for the Alembic migrations and the indexes they create"""
+import asyncio
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.infrastructure.pagination import encode_cursor
+from src.infrastructure.storage.sql import SQLCollection
+from src.infrastructure.repositories import (
+    ProductRepository, CustomerRepository, OrderRepository,
+    DebtRepository, InventoryRepository
+)
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def migrated_db(tmp_path):
+    """SQLite file migrated to head with the project's Alembic scripts"""
+    path = tmp_path / "bizflow.db"
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    config.set_main_option("sqlalchemy.url", f"sqlite+aiosqlite:///{path}")
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+    yield path
+    command.downgrade(config, "base")
+
+
+async def _capture_queries(path, run):
+    """Run repository calls and return every SQL statement they issued"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, sql, params, ctx, many: statements.append((sql, params)))
+    async with AsyncSession(engine) as session:
+        await run(session)
+    await engine.dispose()
+    return statements
+
+
+# Repository call -> index its query plan must use (and how, for an expression index)
+HOT_PATHS = [
+    (lambda s: ProductRepository(s).get_by_sku("SKU1", "b1"), "ix_products_business_sku"),
+    (lambda s: CustomerRepository(s).get_by_phone("0900", "b1"), "ix_customers_business_phone"),
+    (lambda s: OrderRepository(s).get_by_status("b1", "completed"), "ix_orders_business_status_created"),
+    (lambda s: OrderRepository(s).get_daily_revenue("b1", datetime(2026, 1, 1)), "ix_orders_business_status_created"),
+    (lambda s: OrderRepository(s).get_by_customer("c1"), "ix_orders_customer_created"),
+    (lambda s: OrderRepository(s).get_page_by_business("b1", 50, encode_cursor(datetime(2026, 1, 1), "o1")),
+     "ix_orders_business_created"),
+    (lambda s: DebtRepository(s).get_unpaid_by_customer("c1"), "ix_debts_customer_paid"),
+    (lambda s: InventoryRepository(s).get_low_stock("b1"), "ix_inventory_business"),
+    (lambda s: SQLCollection(lambda: s, "orders").find("b1", client_ref="pos-1"),
+     "ux_records_client_ref (collection=? AND store_id=? AND <expr>=?)"),
+    (lambda s: SQLCollection(lambda: s, "tokens").find("reset", user_id="u1"),
+     "ix_records_user_id (collection=? AND store_id=? AND <expr>=?)"),
+]
+
+
+@pytest.mark.parametrize("call,index", HOT_PATHS, ids=[index.split()[0] for _, index in HOT_PATHS])
+def test_hot_queries_use_indexes(migrated_db, call, index):
+    """EXPLAIN QUERY PLAN of each hot repository query shows an index search"""
+    statements = asyncio.run(_capture_queries(migrated_db, call))
+    with sqlite3.connect(migrated_db) as conn:
+        plan = " | ".join(
+            row[-1]
+            for sql, params in statements
+            for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        )
+    assert f"INDEX {index}" in plan, plan
+    assert "SCAN orders" not in plan and "SCAN customers" not in plan, plan
@@ -0,0 +1,96 @@
+"""Tests for bulk order ingestion"""
+import pytest
+from src.application.business_logic import (
+    OrderService, CustomerService,
+    MOCK_PRODUCTS_DB, MOCK_ORDERS_DB
+)
+
+STORE_ID = "store_batch_test"
+
+
+PRODUCTS = [{"id": "p1", "sku": "SKU1", "name": "P1", "price": 500, "quantity_in_stock": 10}]
+CUSTOMERS = [{"id": "c1", "name": "C1", "phone": "1", "address": "HN"}]
+
+pytestmark = pytest.mark.usefixtures("store")
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_partial_failure():
+    """Bad orders are reported per index while the rest are created"""
+    result = await OrderService.create_orders_batch(STORE_ID, [
+        {"client_ref": "a", "customer_id": "c1", "payment_status": "paid",
+         "items": [{"product_id": "p1", "quantity": 2, "unit": "cái"}]},
+        {"client_ref": "b", "customer_id": "c1",
+         "items": [{"product_id": "missing", "quantity": 1, "unit": "cái"}]},
+        {"client_ref": "c", "customer_id": "c1", "items": []},
+        {"client_ref": "d", "customer_id": "c1", "payment_status": "paid",
+         "items": [{"sku": "SKU1", "quantity": 3, "unit": "cái"}]},
+    ])
+
+    assert (result["total"], result["created"], result["failed"]) == (4, 2, 2)
+    assert [r["success"] for r in result["results"]] == [True, False, False, True]
+    assert result["results"][1]["client_ref"] == "b"
+    assert "missing" in result["results"][1]["error"]
+    assert len(MOCK_ORDERS_DB[STORE_ID]) == 2
+
+    # Stock and customer totals reflect only the created orders
+    assert MOCK_PRODUCTS_DB[STORE_ID].get("p1")["quantity_in_stock"] == 5
+    customer = await CustomerService.get_customer("c1", STORE_ID)
+    assert customer["total_purchases"] == 2500
+    assert customer["total_transactions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_non_numeric_quantities():
+    result = await OrderService.create_orders_batch(STORE_ID, [
+        {"customer_id": "c1", "items": [{"product_id": "p1", "quantity": "2", "unit": "cái"}]},
+    ])
+    assert result["results"][0]["error"] == "Invalid quantity for product p1"
+    assert len(MOCK_ORDERS_DB[STORE_ID]) == 0
+
+
+@pytest.mark.asyncio
+async def test_unexpected_errors_fail_the_batch(monkeypatch):
+    """Bugs aren't reported as failed orders, and nothing of the batch is committed"""
+    build = OrderService._build_order
+    calls = []
+
+    async def flaky(store_id, customer_id, lines, kwargs):
+        calls.append(customer_id)
+        if len(calls) == 2:
+            raise KeyError("price")
+        return await build(store_id, customer_id, lines, kwargs)
+
+    monkeypatch.setattr(OrderService, "_build_order", staticmethod(flaky))
+    paid = {"customer_id": "c1", "payment_status": "paid", "items": [{"product_id": "p1", "quantity": 2, "unit": "cái"}]}
+    with pytest.raises(KeyError):
+        await OrderService.create_orders_batch(STORE_ID, [paid, paid, paid])
+    assert len(MOCK_ORDERS_DB[STORE_ID]) == 0
+    assert MOCK_PRODUCTS_DB[STORE_ID].get("p1")["quantity_in_stock"] == 10
+
+
+@pytest.mark.asyncio
+async def test_replayed_batch_returns_the_orders_already_created():
+    """An offline client resending a batch gets its orders back instead of duplicates"""
+    batch = [
+        {"client_ref": "pos-1", "customer_id": "c1", "payment_status": "paid",
+         "items": [{"product_id": "p1", "quantity": 2, "unit": "cái"}]},
+        {"client_ref": "pos-2", "customer_id": "c1",
+         "items": [{"product_id": "p1", "quantity": 1, "unit": "cái"}]},
+    ]
+    first = await OrderService.create_orders_batch(STORE_ID, batch)
+    assert (first["created"], first["failed"]) == (2, 0)
+
+    replay = await OrderService.create_orders_batch(STORE_ID, batch + [
+        {"client_ref": "pos-3", "customer_id": "c1", "items": [{"product_id": "p1", "quantity": 1, "unit": "cái"}]},
+        {"client_ref": "pos-3", "customer_id": "c1", "items": [{"product_id": "p1", "quantity": 1, "unit": "cái"}]},
+    ])
+    assert (replay["created"], replay["failed"]) == (1, 1)
+    assert [r.get("duplicate", False) for r in replay["results"][:2]] == [True, True]
+    assert [r["order"]["id"] for r in replay["results"][:2]] == [r["order"]["id"] for r in first["results"]]
+    assert "Duplicate client_ref" in replay["results"][3]["error"]
+
+    assert len(MOCK_ORDERS_DB[STORE_ID]) == 3
+    assert MOCK_PRODUCTS_DB[STORE_ID].get("p1")["quantity_in_stock"] == 8
+    customer = await CustomerService.get_customer("c1", STORE_ID)
+    assert (customer["total_transactions"], customer["outstanding_debt"]) == (3, 1000)
@@ -0,0 +1,35 @@
+"""Tests for the SQL order repository"""
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.infrastructure.models import Base, OrderModel, OrderItemModel
+from src.infrastructure.repositories import OrderRepository
+
+
+@pytest.mark.asyncio
+async def test_orders_load_items_in_one_query():
+    """Listing orders fetches all of their items with a single batched query"""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        for i in range(20):
+            session.add(OrderModel(id=f"o{i:02d}", business_id="b1", status="completed"))
+            session.add_all([
+                OrderItemModel(id=f"o{i:02d}-{j}", order_id=f"o{i:02d}", quantity=j + 1, unit_price=10, subtotal=10)
+                for j in range(i % 3)
+            ])
+        await session.commit()
+
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute",
+                     lambda *args: statements.append(args[2]))
+        orders = await OrderRepository(session).get_all_by_business("b1", limit=100)
+
+    assert len(statements) == 2
+    assert len(orders) == 20
+    assert {o.id: len(o.items) for o in orders} == {f"o{i:02d}": i % 3 for i in range(20)}
+    assert all(item.order_id == o.id for o in orders for item in o.items)
+    await engine.dispose()
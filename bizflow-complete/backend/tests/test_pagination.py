@@ -0,0 +1,88 @@
+"""Tests for keyset (cursor) pagination"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.infrastructure.entity_store import EntityCollection
+from src.infrastructure.models import Base, CustomerModel
+from src.infrastructure.pagination import InvalidCursorError, created_at_key, decode_cursor
+from src.infrastructure.repositories import CustomerRepository
+
+
+def _orders(n):
+    return EntityCollection(
+        [
+            {"id": f"o{i:02d}", "created_at": f"2026-01-{i % 5 + 1:02d}", "status": "paid" if i % 2 else "draft"}
+            for i in range(n)
+        ],
+        indexes={"status": lambda r: r.get("status")},
+        order_by=created_at_key,
+    )
+
+
+def _walk(collection, limit, **criteria):
+    ids, cursor = [], None
+    while True:
+        page = collection.paginate(limit=limit, cursor=cursor, **criteria)
+        ids += [r["id"] for r in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            return ids, page["total"]
+
+
+def test_cursor_pages_follow_created_at_then_id():
+    """Walking every cursor page yields each record once, in (created_at, id) order"""
+    collection = _orders(23)
+    expected = [r["id"] for r in sorted(collection, key=lambda r: (r["created_at"], r["id"]))]
+    assert [r["id"] for r in collection] == expected
+    assert _walk(collection, 5) == (expected, 23)
+
+    paid = [i for i in expected if collection.get(i)["status"] == "paid"]
+    assert _walk(collection, 4, status="paid") == (paid, 11)
+
+
+def test_cursor_survives_deletes():
+    """Deleting the record a cursor points at doesn't shift the next page"""
+    collection = _orders(10)
+    first = collection.paginate(limit=3)
+    collection.remove(first["items"][-1]["id"])
+    second = collection.paginate(limit=3, cursor=first["next_cursor"])
+    expected = [r["id"] for r in collection][2:5]
+    assert [r["id"] for r in second["items"]] == expected
+    assert second["total"] == 9
+
+
+def test_invalid_cursor_is_rejected():
+    """Garbage cursors raise InvalidCursorError instead of returning a page"""
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
+    with pytest.raises(InvalidCursorError):
+        _orders(3).paginate(cursor="e30")
+
+
+@pytest.mark.asyncio
+async def test_repository_keyset_page():
+    """SQL repositories page by (created_at, id) and count the whole business"""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    start = datetime(2026, 1, 1)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        session.add_all([
+            CustomerModel(id=f"c{i:02d}", business_id="b1", name=f"C{i}", created_at=start + timedelta(days=i // 2))
+            for i in range(7)
+        ])
+        session.add(CustomerModel(id="other", business_id="b2", name="Other", created_at=start))
+        await session.commit()
+
+        repo = CustomerRepository(session)
+        ids, cursor = [], None
+        while True:
+            page, cursor = await repo.get_page_by_business("b1", limit=3, cursor=cursor)
+            ids += [c.id for c in page]
+            if not cursor:
+                break
+        assert ids == [f"c{i:02d}" for i in range(7)]
+        assert await repo.count_by_business("b1") == 7
+    await engine.dispose()
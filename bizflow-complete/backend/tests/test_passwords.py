@@ -0,0 +1,48 @@
+"""Unit tests for bcrypt password hashing"""
+import asyncio
+import hashlib
+import time
+
+import pytest
+
+from src.infrastructure.passwords import PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_bcrypt_round_trip():
+    hasher = PasswordHasher(rounds=4)
+    stored = await hasher.hash("s3cret")
+    assert stored.startswith("$2b$04$")
+    assert await hasher.verify("s3cret", stored) == (True, None)
+    assert await hasher.verify("wrong", stored) == (False, None)
+    assert await hasher.verify("s3cret", None) == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_legacy_hashes_are_upgraded():
+    """SHA-256, plaintext and low-cost bcrypt hashes verify and come back rehashed"""
+    hasher = PasswordHasher(rounds=5)
+    low_cost = await PasswordHasher(rounds=4).hash("pw")
+    for stored in (hashlib.sha256(b"pw").hexdigest(), "pw", low_cost):
+        matches, new_hash = await hasher.verify("pw", stored)
+        assert matches and new_hash.startswith("$2b$05$")
+        assert await hasher.verify("pw", new_hash) == (True, None)
+    assert await hasher.verify("other", hashlib.sha256(b"pw").hexdigest()) == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_hashing_does_not_block_event_loop():
+    """Other coroutines keep running while passwords are hashed"""
+    hasher = PasswordHasher(rounds=10, workers=2)
+    ticks = []
+
+    async def ticker():
+        while len(ticks) < 1000:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.001)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.gather(*(hasher.hash("pw") for _ in range(4)))
+    task.cancel()
+    hasher.shutdown()
+    assert len(ticks) > 5
@@ -0,0 +1,48 @@
+"""Tests for product catalog lookups used by the order paths"""
+import pytest
+from src.application.business_logic import ProductCatalog, ProductService, OrderService
+
+STORE_ID = "store_catalog_test"
+
+
+PRODUCTS = [
+    {"id": "p1", "name": "Water", "sku": "W-1", "barcode": "893001", "price": 10000, "quantity_in_stock": 10},
+    {"id": "p2", "name": "Bread", "sku": "B-1", "barcode": None, "price": 5000, "quantity_in_stock": 5},
+]
+
+pytestmark = pytest.mark.usefixtures("store")
+
+
+@pytest.mark.asyncio
+async def test_lookup_by_id_sku_and_barcode():
+    """The same product is found by any of its keys"""
+    assert (await ProductCatalog.lookup(STORE_ID, "p1"))["id"] == "p1"
+    assert (await ProductCatalog.lookup(STORE_ID, "W-1"))["id"] == "p1"
+    assert (await ProductCatalog.lookup(STORE_ID, "893001"))["id"] == "p1"
+    assert await ProductCatalog.lookup(STORE_ID, "nope") is None
+
+
+@pytest.mark.asyncio
+async def test_sku_change_updates_lookup():
+    """Updating a product's SKU moves it in the catalog"""
+    await ProductService.update_product("p2", STORE_ID, {"sku": "B-2"})
+    assert await ProductCatalog.lookup(STORE_ID, "B-1") is None
+    assert (await ProductCatalog.lookup(STORE_ID, "B-2"))["id"] == "p2"
+
+
+@pytest.mark.asyncio
+async def test_paid_order_resolves_lines_and_moves_stock():
+    """Lines given by SKU/barcode are priced and decrement the catalog stock"""
+    order = await OrderService.create_order(
+        STORE_ID, None,
+        [
+            {"product_id": "W-1", "quantity": 2},
+            {"product_id": "893001", "quantity": 1},
+            {"product_id": "p2", "quantity": 3},
+        ],
+        payment_status="paid",
+    )
+    assert [item["product_id"] for item in order["items"]] == ["p1", "p1", "p2"]
+    assert order["total_amount"] == 3 * 10000 + 3 * 5000
+    assert (await ProductService.get_product("p1", STORE_ID))["quantity_in_stock"] == 7
+    assert (await ProductService.get_product("p2", STORE_ID))["quantity_in_stock"] == 2
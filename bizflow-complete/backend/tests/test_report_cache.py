@@ -0,0 +1,69 @@
+"""Tests for the report cache keyed by the store's data version"""
+from datetime import datetime
+
+import pytest
+from src.application.business_logic import (
+    AccountingService, DebtService, OrderService, ReportCache, ReportService, REPORT_CACHE_REQUESTS
+)
+from src.infrastructure.metrics import REGISTRY
+
+STORE_ID = "store_report_cache_test"
+
+
+PRODUCTS = [{"id": "p1", "name": "P1", "price": 1000, "quantity_in_stock": 100}]
+CUSTOMERS = [{"id": "c1", "name": "C1"}]
+
+pytestmark = pytest.mark.usefixtures("store")
+
+
+def _count(report, result):
+    return REPORT_CACHE_REQUESTS.labels(report, result).value
+
+
+@pytest.mark.asyncio
+async def test_reports_served_until_the_store_changes():
+    hits, misses = _count("daily", "hit"), _count("daily", "miss")
+    first = await ReportService.get_daily_report(STORE_ID, datetime.now())
+    assert await ReportService.get_daily_report(STORE_ID, datetime.now()) is first
+    assert (_count("daily", "hit") - hits, _count("daily", "miss") - misses) == (1, 1)
+
+    version = await ReportCache.data_version(STORE_ID)
+    await OrderService.create_order(STORE_ID, "c1", [{"product_id": "p1", "quantity": 2, "unit": "cái"}])
+    assert await ReportCache.data_version(STORE_ID) != version
+    second = await ReportService.get_daily_report(STORE_ID, datetime.now())
+    assert second["metrics"]["total_orders"] == 1
+
+    # Debt writes move the version too, whatever the report reads
+    await DebtService.create_debt(STORE_ID, {"customer_id": "c1", "amount": 500})
+    assert await ReportService.get_daily_report(STORE_ID, datetime.now()) is not second
+
+
+@pytest.mark.asyncio
+async def test_ledger_and_accounting_follow_journal_writes():
+    ledger = await AccountingService.ledger_summary(STORE_ID)
+    report = await AccountingService.accounting_report(STORE_ID, None, None)
+    assert await AccountingService.ledger_summary(STORE_ID) is ledger
+    assert await AccountingService.accounting_report(STORE_ID, None, None) is report
+    # Other arguments are other entries
+    assert await AccountingService.accounting_report(STORE_ID, "2026-01-01", None) is not report
+
+    await AccountingService.add_journal_entry(STORE_ID, {"account_code": "4000", "credit_amount": 700})
+    assert (await AccountingService.accounting_report(STORE_ID, None, None))["total_revenue"] == 700
+    revenue = next(a for a in await AccountingService.ledger_summary(STORE_ID) if a["account_code"] == "4000")
+    assert revenue["credits"] == 700
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded_and_monitored(monkeypatch):
+    monkeypatch.setattr(ReportCache._results, "maxsize", 2)
+    for month in (1, 2, 3):
+        await ReportService.get_monthly_report(STORE_ID, 2026, month)
+    assert len(ReportCache._results) == 2
+    misses = _count("monthly", "miss")
+    await ReportService.get_monthly_report(STORE_ID, 2026, 1)
+    assert _count("monthly", "miss") == misses + 1
+
+    lines = REGISTRY.render().splitlines()
+    assert "bizflow_report_cache_entries 2" in lines
+    assert any(line.startswith('bizflow_report_cache_requests_total{report="monthly",result="miss"}')
+               for line in lines)
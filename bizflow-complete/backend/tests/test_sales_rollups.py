@@ -0,0 +1,80 @@
+"""Tests for the daily/monthly sales rollups behind the reports"""
+from datetime import datetime
+
+import pytest
+from src.application.business_logic import (
+    OrderService, ReportService, SalesRollups,
+    MOCK_ORDERS_DB, SALES_ROLLUPS
+)
+
+STORE_ID = "store_rollups_test"
+
+
+PRODUCTS = [{"id": "p1", "name": "P1", "price": 1000, "quantity_in_stock": 100}]
+CUSTOMERS = [{"id": "c1", "name": "C1"}, {"id": "c2", "name": "C2"}]
+
+pytestmark = pytest.mark.usefixtures("store")
+
+
+def _items(quantity):
+    return [{"product_id": "p1", "quantity": quantity, "unit": "cái"}]
+
+
+def _stored():
+    return {record["id"]: {k: v for k, v in record.items() if k != "id"} for record in SALES_ROLLUPS[STORE_ID]}
+
+
+@pytest.mark.asyncio
+async def test_reports_follow_order_events():
+    today = datetime.now().date()
+    paid = await OrderService.create_order(STORE_ID, "c1", _items(3), payment_status="paid", discount=500)
+    unpaid = await OrderService.create_order(STORE_ID, "c1", _items(2))
+    await OrderService.create_order(STORE_ID, "c2", _items(1))
+
+    metrics = (await ReportService.get_daily_report(STORE_ID, datetime.now()))["metrics"]
+    assert metrics == {
+        "total_revenue": 3000, "total_orders": 3, "unique_customers": 2,
+        "paid_orders": 1, "unpaid_orders": 2, "unpaid_amount": 3000,
+        "total_discount": 500, "total_debt": 3000,
+    }
+
+    await OrderService.update_order(unpaid["id"], STORE_ID, {"payment_status": "paid"})
+    await OrderService.delete_order(paid["id"], STORE_ID)
+    monthly = await ReportService.get_monthly_report(STORE_ID, today.year, today.month)
+    assert monthly["metrics"]["total_revenue"] == 2000
+    assert monthly["metrics"]["total_orders"] == 2
+    assert monthly["metrics"]["unique_customers"] == 2
+    assert monthly["metrics"]["unpaid_amount"] == 1000
+
+    await OrderService.update_order(unpaid["id"], STORE_ID, {"status": "cancelled"})
+    metrics = (await ReportService.get_daily_report(STORE_ID, today.isoformat()))["metrics"]
+    assert (metrics["total_orders"], metrics["unique_customers"], metrics["total_revenue"]) == (1, 1, 0)
+
+    # The running buckets match a rebuild from the orders
+    running = _stored()
+    await ReportService.rebuild_rollups(STORE_ID)
+    rebuilt = _stored()
+    for bucket, totals in rebuilt.items():
+        assert {k: v for k, v in running[bucket].items() if k in totals} == totals
+
+
+@pytest.mark.asyncio
+async def test_rebuild_buckets_by_created_day():
+    MOCK_ORDERS_DB[STORE_ID] = [
+        {"id": "o1", "customer_id": "c1", "total_amount": 100, "payment_status": "paid",
+         "created_at": "2026-01-15T10:00:00"},
+        {"id": "o2", "customer_id": "c1", "total_amount": 50, "payment_status": "pending",
+         "created_at": "2026-01-15T18:00:00"},
+        {"id": "o3", "customer_id": "c2", "total_amount": 70, "payment_status": "paid",
+         "created_at": "2026-01-20T09:00:00", "status": "delivered"},
+        {"id": "o4", "customer_id": "c2", "total_amount": 999, "payment_status": "paid",
+         "created_at": "2026-02-01T09:00:00", "status": "cancelled"},
+    ]
+    assert await SalesRollups.rebuild(STORE_ID) > 0
+
+    day = (await ReportService.get_daily_report(STORE_ID, "2026-01-15"))["metrics"]
+    assert (day["total_revenue"], day["total_orders"], day["unique_customers"]) == (100, 2, 1)
+    assert day["total_debt"] == 50
+    month = (await ReportService.get_monthly_report(STORE_ID, 2026, 1))["metrics"]
+    assert (month["total_revenue"], month["total_orders"], month["unique_customers"]) == (170, 3, 2)
+    assert (await ReportService.get_monthly_report(STORE_ID, 2026, 2))["metrics"]["total_orders"] == 0
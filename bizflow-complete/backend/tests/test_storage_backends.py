@@ -0,0 +1,278 @@
+"""Tests that the memory and SQL storage backends behave alike"""
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.application import business_logic
+from src.application.business_logic import (
+    AuthService, CustomerService, CustomerTotals, OrderService, PasswordResets, ProductService,
+    DEBT_INDEXES, ORDER_INDEXES, PRODUCT_INDEXES, TOKEN_INDEXES
+)
+from src.infrastructure.entity_store import EntityStore
+from src.infrastructure.models import Base
+from src.infrastructure.pagination import InvalidCursorError, created_at_key
+from src.infrastructure.storage import MemoryBackend
+from src.infrastructure.storage.sql import SQLBackend
+
+STORE_ID = "store_backend_test"
+
+
+def memory_backend():
+    return MemoryBackend(
+        EntityStore(indexes=PRODUCT_INDEXES, order_by=created_at_key),
+        EntityStore(order_by=created_at_key),
+        EntityStore(indexes=ORDER_INDEXES, order_by=created_at_key),
+        EntityStore(indexes=DEBT_INDEXES, order_by=created_at_key),
+        EntityStore(order_by=created_at_key),
+        EntityStore(),
+        EntityStore(),
+        EntityStore(),
+        EntityStore(indexes=TOKEN_INDEXES),
+        {},
+    )
+
+
+@pytest_asyncio.fixture(params=["memory", "sql"])
+async def backend(request, tmp_path):
+    if request.param == "memory":
+        yield memory_backend()
+        return
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'records.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield SQLBackend(async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+    await engine.dispose()
+
+
+def _order(order_id, created_at, **fields):
+    return {"id": order_id, "created_at": created_at, "status": "draft", **fields}
+
+
+@pytest.mark.asyncio
+async def test_crud_bumps_version(backend):
+    products = backend.products
+    start = await products.version(STORE_ID)
+    await products.add(STORE_ID, {"id": "p1", "name": "Water", "price": 1000})
+    added = await products.version(STORE_ID)
+    assert added != start
+    assert await products.get_many(STORE_ID, ["p1", "missing"]) == {
+        "p1": {"id": "p1", "name": "Water", "price": 1000}
+    }
+
+    updated = await products.update(STORE_ID, "p1", {"price": 1500})
+    assert updated == {"id": "p1", "name": "Water", "price": 1500}
+    assert await products.get(STORE_ID, "p1") == updated
+    assert await products.version(STORE_ID) != added
+    assert await products.update(STORE_ID, "missing", {"price": 1}) is None
+
+    before, after = await products.modify(STORE_ID, "p1", lambda p: {"price": p["price"] + 100})
+    assert (before["price"], after["price"]) == (1500, 1600)
+    assert (await products.get(STORE_ID, "p1"))["price"] == 1600
+    assert await products.modify(STORE_ID, "missing", lambda p: {}) is None
+
+    assert (await products.remove(STORE_ID, "p1"))["price"] == 1600
+    assert await products.get(STORE_ID, "p1") is None
+    assert await products.remove(STORE_ID, "p1") is None
+    # Stores are kept apart
+    assert await products.get("other_store", "p1") is None
+
+
+@pytest.mark.asyncio
+async def test_growth_moves_its_token_only_on_rewrites(backend):
+    products = backend.products
+    await products.add(STORE_ID, {"id": "p0", "price": 500})
+    token, added = await products.growth(STORE_ID)
+    await products.add(STORE_ID, {"id": "p1", "price": 1000})
+    await products.adjust(STORE_ID, {"p2": {"quantity_in_stock": 3}}, create=True)
+    assert await products.growth(STORE_ID) == (token, added + 2)
+
+    await products.adjust(STORE_ID, {"p1": {"quantity_in_stock": 1}})
+    adjusted, _ = await products.growth(STORE_ID)
+    assert adjusted != token
+    await products.add(STORE_ID, {"id": "p1", "price": 1200})
+    replaced, _ = await products.growth(STORE_ID)
+    assert replaced != adjusted
+    await products.remove(STORE_ID, "p2")
+    assert (await products.growth(STORE_ID))[0] != replaced
+
+
+@pytest.mark.asyncio
+async def test_criteria_and_cursor_pages(backend):
+    orders = backend.orders
+    for i in range(7):
+        await orders.add(STORE_ID, _order(
+            f"o{i}", f"2026-01-{10 + i % 3:02d}T09:00:00",
+            payment_status="paid" if i % 2 else "pending", customer_id="c1"
+        ))
+
+    everything = await orders.find(STORE_ID)
+    assert [o["id"] for o in everything] == ["o0", "o3", "o6", "o1", "o4", "o2", "o5"]
+    assert [o["id"] for o in await orders.find(STORE_ID, 1, 2)] == ["o3", "o6"]
+    assert [o["id"] for o in await orders.find(STORE_ID, payment_status="paid")] == ["o3", "o1", "o5"]
+    assert [o["id"] for o in await orders.find(STORE_ID, day="2026-01-11")] == ["o1", "o4"]
+    assert await orders.count(STORE_ID, payment_status="pending", customer_id="c1") == 4
+    assert await orders.count(STORE_ID, status=None) == 7
+
+    seen, cursor = [], None
+    while True:
+        page = await orders.paginate(STORE_ID, limit=3, cursor=cursor, with_total=cursor is None)
+        assert page["total"] == (7 if cursor is None else None)
+        seen += [o["id"] for o in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [o["id"] for o in everything]
+
+    page = await orders.paginate(STORE_ID, skip=5, limit=3)
+    assert ([o["id"] for o in page["items"]], page["next_cursor"]) == (["o2", "o5"], None)
+    with pytest.raises(InvalidCursorError):
+        await orders.paginate(STORE_ID, cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_adjust_clamps_and_creates(backend):
+    products = backend.products
+    await products.add(STORE_ID, {"id": "p1", "quantity_in_stock": 5})
+    await products.add(STORE_ID, {"id": "p2", "quantity_in_stock": 1})
+    version = await products.version(STORE_ID)
+
+    changed = await products.adjust(STORE_ID, {
+        "p1": {"quantity_in_stock": -2}, "p2": {"quantity_in_stock": -3}, "gone": {"quantity_in_stock": -1}
+    }, floor=0)
+    assert {k: v["quantity_in_stock"] for k, v in changed.items()} == {"p1": 3, "p2": 0}
+    assert (await products.get(STORE_ID, "p1"))["quantity_in_stock"] == 3
+    assert await products.get(STORE_ID, "gone") is None
+    assert await products.version(STORE_ID) != version
+
+    totals = backend.customer_totals
+    await totals.adjust(STORE_ID, {"c1": {"outstanding_debt": 500, "total_transactions": 1}}, create=True)
+    await totals.adjust(STORE_ID, {"c1": {"outstanding_debt": -200}}, create=True)
+    record = await totals.get(STORE_ID, "c1")
+    assert (record["outstanding_debt"], record["total_transactions"]) == (300, 1)
+
+
+@pytest.mark.asyncio
+async def test_replace_and_sequences(backend):
+    debts = backend.debts
+    await debts.add(STORE_ID, {"id": "old"})
+    await debts.replace(STORE_ID, [{"id": "d1", "status": "pending"}, {"id": "d2", "status": "paid"}])
+    assert [d["id"] for d in await debts.find(STORE_ID)] == ["d1", "d2"]
+    assert await debts.count(STORE_ID, status="paid") == 1
+
+    # Each reservation is followed by an add, as the services do
+    reserved = []
+    for _ in range(3):
+        sequence = await debts.reserve_sequence(STORE_ID)
+        reserved.append(sequence)
+        await debts.add(STORE_ID, {"id": f"debt_{sequence}"})
+    assert len(set(reserved)) == 3
+    assert min(reserved) >= 2
+
+
+@pytest.mark.asyncio
+async def test_user_directory(backend):
+    users = backend.users
+    user = {"id": "u1", "email": "Owner@Example.com", "password": "plain"}
+    assert await users.add(user)
+    assert not await users.add({"id": "u2", "email": "owner@example.com"})
+    assert (await users.get("OWNER@example.com"))["id"] == "u1"
+
+    updated = await users.update("owner@example.com", {"password_hash": "h"}, remove=("password",))
+    assert updated == {"id": "u1", "email": "Owner@Example.com", "password_hash": "h"}
+    assert await users.get("owner@example.com") == updated
+    assert await users.update("nobody@example.com", {"x": 1}) is None
+
+    first = await users.reserve_sequence()
+    await users.add({"id": "u3", "email": "third@example.com"})
+    assert await users.reserve_sequence() != first
+
+
+@pytest.mark.asyncio
+async def test_services_run_on_either_backend(backend, monkeypatch):
+    monkeypatch.setattr(business_logic, "STORAGE", backend)
+    await backend.products.add(STORE_ID, {"id": "p1", "sku": "W-1", "name": "Water", "price": 1000,
+                                          "quantity_in_stock": 10})
+    customer = await CustomerService.create_customer(STORE_ID, {"name": "C1", "phone": "1", "address": "HN"})
+    version = await CustomerService.version(STORE_ID)
+
+    unpaid = await OrderService.create_order(STORE_ID, customer["id"], [{"sku": "W-1", "quantity": 2}])
+    paid = await OrderService.create_order(STORE_ID, customer["id"], [{"product_id": "p1", "quantity": 3}],
+                                           payment_status="paid")
+    assert unpaid["id"] != paid["id"]
+    assert (await ProductService.get_product("p1", STORE_ID))["quantity_in_stock"] == 7
+    assert await CustomerService.version(STORE_ID) != version
+
+    updated = await OrderService.update_order(unpaid["id"], STORE_ID, {"payment_status": "paid"})
+    assert updated["payment_status"] == "paid"
+    assert (await ProductService.get_product("p1", STORE_ID))["quantity_in_stock"] == 5
+    loaded = await CustomerService.get_customer(customer["id"], STORE_ID)
+    assert (loaded["total_purchases"], loaded["outstanding_debt"], loaded["total_transactions"]) == (5000, 0, 2)
+
+    assert await OrderService.delete_order(paid["id"], STORE_ID)
+    assert await CustomerTotals.check_consistency(STORE_ID) == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_order_updates_move_totals_once(backend, monkeypatch):
+    monkeypatch.setattr(business_logic, "STORAGE", backend)
+    await backend.products.add(STORE_ID, {"id": "p1", "name": "Water", "price": 10, "quantity_in_stock": 10})
+    customer = await CustomerService.create_customer(STORE_ID, {"name": "C1", "phone": "1"})
+    order = await OrderService.create_order(STORE_ID, customer["id"], [{"product_id": "p1", "quantity": 2}])
+
+    await asyncio.gather(*(
+        OrderService.update_order(order["id"], STORE_ID, {"payment_status": "paid"}) for _ in range(8)
+    ))
+    totals = await CustomerTotals.get(STORE_ID, customer["id"])
+    assert (totals["outstanding_debt"], totals["total_purchases"], totals["total_transactions"]) == (0, 20, 1)
+    assert (await backend.products.get(STORE_ID, "p1"))["quantity_in_stock"] == 8
+    assert await CustomerTotals.check_consistency(STORE_ID) == []
+
+
+@pytest.mark.asyncio
+async def test_order_batch_is_one_transaction_and_replay_safe(backend, monkeypatch):
+    monkeypatch.setattr(business_logic, "STORAGE", backend)
+    await backend.products.add(STORE_ID, {"id": "p1", "name": "Water", "price": 10, "quantity_in_stock": 10})
+    batch = [
+        {"client_ref": f"pos-{i}", "customer_id": "c1", "payment_status": "paid" if i % 2 else "pending",
+         "items": [{"product_id": "p1", "quantity": 1}]}
+        for i in range(4)
+    ]
+    first = await OrderService.create_orders_batch(STORE_ID, batch)
+    replay = await OrderService.create_orders_batch(STORE_ID, batch)
+    assert (first["created"], replay["created"]) == (4, 0)
+    assert all(r["duplicate"] for r in replay["results"])
+    assert await backend.orders.count(STORE_ID) == 4
+    assert (await backend.products.get(STORE_ID, "p1"))["quantity_in_stock"] == 8
+    totals = await CustomerTotals.get(STORE_ID, "c1")
+    assert (totals["outstanding_debt"], totals["total_purchases"], totals["total_transactions"]) == (20, 20, 4)
+    assert await CustomerTotals.check_consistency(STORE_ID) == []
+
+
+@pytest.mark.asyncio
+async def test_password_reset_tokens_are_shared_and_single_use(backend, monkeypatch):
+    monkeypatch.setattr(business_logic, "STORAGE", backend)
+    await backend.users.add({"id": "u1", "email": "owner@example.com", "password_hash": "old"})
+    first = (await AuthService.request_password_reset("Owner@example.com"))["reset_token"]
+    second = (await AuthService.request_password_reset("owner@example.com"))["reset_token"]
+    assert await AuthService.reset_password(first, "New@12345")
+    assert (await backend.users.get("owner@example.com"))["password_hash"] != "old"
+    assert not await AuthService.reset_password(first, "Again@123")
+    # Resetting revoked the user's other pending tokens
+    assert not await AuthService.reset_password(second, "Again@123")
+    unknown = await AuthService.request_password_reset("nobody@example.com")
+    assert not await AuthService.reset_password(unknown["reset_token"], "Again@123")
+    assert await backend.tokens.find("reset") == []
+
+
+@pytest.mark.asyncio
+async def test_sweep_removes_only_expired_reset_tokens(backend, monkeypatch):
+    monkeypatch.setattr(business_logic, "STORAGE", backend)
+    await PasswordResets.issue({"id": "u1", "email": "one@example.com"})
+    await backend.tokens.add("reset", {"id": "old", "user_id": "u2", "email": "two@example.com",
+                                       "expires_at": time.time() - 1})
+    assert await PasswordResets.sweep() == 1
+    assert [record["user_id"] for record in await backend.tokens.find("reset")] == ["u1"]
+    assert len(await backend.tokens.find("reset", user_id="u1")) == 1
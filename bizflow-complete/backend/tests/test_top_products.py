@@ -0,0 +1,91 @@
+"""Tests for the best-seller counters and the top-k helpers"""
+import random
+from datetime import date
+
+import pytest
+from src.application import services
+from src.application.business_logic import (
+    OrderService, ProductSales, ReportService,
+    PRODUCT_SALES
+)
+from src.domain.entities import Order, OrderItem
+from src.infrastructure.topk import CountMinSketch, HeavyHitters, top_k
+
+STORE_ID = "store_top_products_test"
+
+
+PRODUCTS = [
+    {"id": pid, "name": pid.upper(), "price": price, "quantity_in_stock": 100}
+    for pid, price in (("p1", 1000), ("p2", 5000), ("p3", 200))
+]
+CUSTOMERS = [{"id": "c1", "name": "C1"}]
+
+pytestmark = pytest.mark.usefixtures("store")
+
+
+def test_heavy_hitters_find_skewed_keys():
+    rng = random.Random(3)
+    stream = [f"k{min(int(rng.paretovariate(1.2)), 5000)}" for _ in range(20000)]
+    exact = {}
+    for key in stream:
+        exact[key] = exact.get(key, 0) + 1
+    tracker = HeavyHitters(5, width=512)
+    for key in stream:
+        tracker.add(key)
+    found = [key for key, _ in tracker.result()]
+    assert found[:3] == [key for key, _ in top_k(exact.items(), 3)]
+    # Estimates only ever overcount
+    sketch = tracker.sketch
+    assert all(sketch.estimate(key) >= count for key, count in exact.items())
+    assert CountMinSketch().estimate("never seen") == 0
+
+
+def test_period_buckets_use_whole_months():
+    assert ProductSales.period_buckets(None, None) == ["all"]
+    assert ProductSales.period_buckets(date(2026, 1, 30), date(2026, 3, 2)) == [
+        "day:2026-01-30", "day:2026-01-31", "month:2026-02", "day:2026-03-01", "day:2026-03-02",
+    ]
+    assert ProductSales.period_buckets(date(2026, 2, 1), date(2026, 2, 28)) == ["month:2026-02"]
+    with pytest.raises(ValueError):
+        ProductSales.period_buckets(date(2026, 2, 2), date(2026, 2, 1))
+    with pytest.raises(ValueError):
+        ProductSales.period_buckets(None, date(2026, 2, 1))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("approximate", [False, True])
+async def test_top_products_follow_order_events(approximate):
+    today = date.today()
+    await OrderService.create_order(STORE_ID, "c1", [{"product_id": "p1", "quantity": 4, "unit": "cái"},
+                                                     {"product_id": "p2", "quantity": 1, "unit": "cái"}])
+    second = await OrderService.create_order(STORE_ID, "c1", [{"product_id": "p3", "quantity": 9, "unit": "cái"}])
+
+    top = await ReportService.get_top_products(STORE_ID, today, today, approximate=approximate)
+    assert [(p["product_id"], p["quantity"]) for p in top["products"]] == [("p3", 9), ("p1", 4), ("p2", 1)]
+    top = await ReportService.get_top_products(STORE_ID, by="revenue", limit=2, approximate=approximate)
+    assert [(p["product_id"], p["name"], p["revenue"]) for p in top["products"]] == [
+        ("p2", "P2", 5000), ("p1", "P1", 4000)
+    ]
+
+    await OrderService.update_order(second["id"], STORE_ID, {"status": "cancelled"})
+    top = await ReportService.get_top_products(STORE_ID, approximate=approximate)
+    assert [p["product_id"] for p in top["products"]] == ["p1", "p2"]
+
+    running = {record["id"]: record for record in PRODUCT_SALES[STORE_ID]}
+    await ProductSales.rebuild(STORE_ID)
+    for record in PRODUCT_SALES[STORE_ID]:
+        assert {key: running[record["id"]][key] for key in record} == record
+
+    with pytest.raises(ValueError):
+        await ReportService.get_top_products(STORE_ID, by="margin")
+
+
+@pytest.mark.asyncio
+async def test_top_sellers_accept_order_item_entities():
+    orders = [
+        Order(items=[OrderItem(product_id="a", product_name="A", quantity=2, subtotal=20),
+                     OrderItem(product_id="b", product_name="B", quantity=1, subtotal=50)]),
+        Order(items=[{"product_id": "a", "product_name": "A", "quantity": 1, "subtotal": 10}]),
+    ]
+    top = await services.ReportService().get_top_sellers(orders, limit=1)
+    assert top == [{"name": "B", "quantity": 1, "revenue": 50}]
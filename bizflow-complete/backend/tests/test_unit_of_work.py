@@ -0,0 +1,92 @@
+"""Tests for the unit-of-work transaction scope"""
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.application.use_cases.debt_use_cases import RecordDebtUseCase, PayDebtUseCase
+from src.infrastructure.models import Base, CustomerModel
+from src.infrastructure.repositories import CustomerRepository, DebtRepository
+from src.infrastructure.unit_of_work import UnitOfWork
+
+
+@pytest.fixture
+def commits():
+    """Connections committed on the engine, in order"""
+    return []
+
+
+@pytest_asyncio.fixture
+async def engine(commits):
+    """In-memory database with one customer; counts commits after setup"""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine) as session:
+        session.add(CustomerModel(id="c1", business_id="b1", name="C1", outstanding_debt=0))
+        await session.commit()
+    event.listen(engine.sync_engine, "commit", commits.append)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_record_and_pay_debt_commit_once(engine, commits):
+    """Each use case writes customer and debt in a single commit"""
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        async with UnitOfWork(session) as uow:
+            debt = await RecordDebtUseCase(uow.debts, uow.customers).execute("b1", "c1", None, 500)
+            await uow.commit()
+    assert len(commits) == 1
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        async with UnitOfWork(session) as uow:
+            paid = await PayDebtUseCase(uow.debts, uow.customers).execute(debt.id, 200)
+            await uow.commit()
+    assert len(commits) == 2
+    assert paid.remaining_debt == 300
+
+    async with AsyncSession(engine) as session:
+        customer = await CustomerRepository(session).get_by_id("c1")
+    assert customer.outstanding_debt == 300
+
+
+@pytest.mark.asyncio
+async def test_failure_rolls_back_every_write(engine, commits):
+    """An error before commit discards the customer update and the debt"""
+    with pytest.raises(RuntimeError):
+        async with AsyncSession(engine) as session:
+            async with UnitOfWork(session) as uow:
+                await RecordDebtUseCase(uow.debts, uow.customers).execute("b1", "c1", None, 500)
+                raise RuntimeError("payment gateway down")
+    assert commits == []
+
+    async with AsyncSession(engine) as session:
+        customer = await CustomerRepository(session).get_by_id("c1")
+        assert customer.outstanding_debt == 0
+        assert await DebtRepository(session).count_by_business("b1") == 0
+
+
+@pytest.mark.asyncio
+async def test_writes_are_not_read_back_inside_a_unit_of_work(engine):
+    """Flushed models are returned as they are: no refresh SELECT per write"""
+    statements = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, sql, params, context, many: statements.append(sql.split()[0]),
+    )
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        async with UnitOfWork(session) as uow:
+            debt = await RecordDebtUseCase(uow.debts, uow.customers).execute("b1", "c1", None, 500)
+            await uow.commit()
+    # Customer lookup, the merge's load, then the two writes
+    assert statements == ["SELECT", "SELECT", "UPDATE", "INSERT"]
+    assert debt.remaining_debt == 500 and debt.created_at is not None
+
+    statements.clear()
+    async with AsyncSession(engine) as session:
+        await RecordDebtUseCase(DebtRepository(session), CustomerRepository(session)).execute(
+            "b1", "c1", None, 100
+        )
+    # Standalone repositories commit each write and reload it afterwards
+    assert statements == ["SELECT", "SELECT", "UPDATE", "SELECT", "INSERT", "SELECT"]